@@ -0,0 +1,48 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Config of the harness benchmarks, the synthetic testers take no options
+# log_location is set to the work dir of every catalog size by run.py
+
+version = "1.0.0"
+
+user_password = None
+log_location = None
+
+# None/amd/nvidia
+HIP_PLATFORM = None
+Optimization_Level = None
+HIPCC_VERBOSE = None
+CUDA_PATH = None
+ROCM_PATH = None
+build_for_target = None
+includes_path = None
+link_libs = None
+link_libs_path = None
+
+run_tests = None
+
+# The other options of the testsuite executor take their defaults, see ../cfg.py
+# Nothing is fetched, cached or evicted while the harness is measured, and the
+# test catalog is off so that every run measures discovery
+test_catalog = False
+
+branch = None
+repos = dict()
@@ -0,0 +1,311 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import sys
+import os
+import argparse
+import contextlib
+import datetime
+import json
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+
+if __name__ == "__main__":
+    sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Benchmarks of the harness itself, no GPU or network is needed. For every
+# catalog size a package of synthetic testers in the style of examples/examples
+# is generated, TESTS_PER_TESTER no-op tests per tester, each test with a
+# classifier path of --depth levels (bench:d1_<0|1>:...:leaf<0-9>). Every size
+# is measured in its own process and work dir:
+#   discovery  tester index and imports, getTests of all testers
+#   selection  SelectionIndex build, -t patterns, a --query, select_tests
+#   executor   executeTests of all tests, selection/test loop/report phases
+#   memory     peak RSS after every stage, in kB
+# The results are written as json, --compare checks them against an older
+# result file and fails if a metric grew by more than --threshold times.
+
+BENCHMARK_VERSION = 1
+DEFAULT_SIZES = [10, 1000, 100000]
+DEFAULT_DEPTH = 8
+TESTS_PER_TESTER = 100
+DEFAULT_THRESHOLD = 1.25
+
+# Metrics below this many seconds are too noisy to compare
+MIN_COMPARED_SECONDS = 0.1
+
+BENCH_PACKAGE = "bench_testers"
+
+TESTER_TEMPLATE = """from hiptestsuite.TesterRepository import Tester
+from hiptestsuite.Test import TestData, TestResult, Test
+from hiptestsuite.test_classifier import TestClassifier
+
+from typing import List
+
+CLASSIFIER_PATH = {path}
+
+
+class Bench{index}(Tester):
+    def __init__(self):
+        Tester.__init__(self)
+
+    def getTests(self) -> List[Test]:
+        tests = []
+        for i in range({count}):
+            matched_with_names = {{"leaf" + str(i % 10): None}}
+            for name in reversed(CLASSIFIER_PATH):
+                matched_with_names = {{name: matched_with_names}}
+            classifier = TestClassifier()
+            classifier.add_matched_with_names(matched_with_names)
+            test = Test()
+            test.test_name = "bench{index}_" + str(i)
+            test.classifiers = [classifier]
+            test.tester = self
+            tests.append(test)
+        return tests
+
+    def test(self, test_data: TestData):
+        test_data.test_result = TestResult.PASS
+"""
+
+
+def get_classifier_path(tester_index, depth):
+    return ["bench"] + ["d" + str(level) + "_" + str((tester_index >> (level - 1)) % 2) for level in range(1, depth)]
+
+
+def write_package(workdir, size, depth):
+    package = os.path.join(workdir, BENCH_PACKAGE)
+    os.makedirs(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    testers = (size + TESTS_PER_TESTER - 1) // TESTS_PER_TESTER
+    for tester_index in range(testers):
+        count = min(TESTS_PER_TESTER, size - tester_index * TESTS_PER_TESTER)
+        with open(os.path.join(package, "t" + str(tester_index) + ".py"), "w") as f:
+            f.write(TESTER_TEMPLATE.format(path=repr(get_classifier_path(tester_index, depth)), index=tester_index, count=count))
+    return testers
+
+
+def get_peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def timed(fun):
+    start = time.time()
+    result = fun()
+    return result, round(time.time() - start, 4)
+
+
+# Runs in the process of one catalog size, cwd is its work dir
+def measure(size, depth):
+    import importlib
+    import cfg
+    from hiptestsuite.TesterRepository import TesterRepository, GetTests
+    from hiptestsuite.TestersExecutor import TestersExecutor
+    from hiptestsuite.test_selector import TestSelector, SelectionIndex
+    from hiptestsuite.test_query import TestQuery
+    from hiptestsuite.run_history import RunHistory
+    from hiptestsuite.config_defaults import set_config_defaults
+
+    set_config_defaults(cfg)
+    workdir = os.getcwd()
+    cfg.log_location = workdir
+    results = {"tests": size, "testers": write_package(workdir, size, depth)}
+    sys.path.insert(0, workdir)
+    bench_testers = importlib.import_module(BENCH_PACKAGE)
+    memory = results["memory"] = {"start": get_peak_rss()}
+
+    def load_testers():
+        tester_repository = TesterRepository()
+        tester_repository.clearTesterFrom()
+        tester_repository.addTesterFrom(pkgs=[bench_testers])
+        tester_repository.addAllTesters()
+        return tester_repository
+
+    discovery = results["discovery"] = dict()
+    tester_repository, discovery["testers_cold_index"] = timed(load_testers)
+    tester_repository, discovery["testers_warm_index"] = timed(load_testers)
+    get_tests = GetTests(tester_repository=tester_repository)
+    get_tests.config = cfg
+    tests, discovery["get_tests"] = timed(lambda: get_tests.get_tests(log_location=workdir, quick=False))
+    memory["discovery"] = get_peak_rss()
+
+    leaf_path = get_classifier_path(0, depth)
+    patterns = {
+        "name_regex": ["bench1_1.*"],
+        "classifier_prefix": [":".join(leaf_path[:3])],
+        "classifier_leaf": ["leaf3"],
+        "deep_path": [":".join(leaf_path + ["leaf5"])],
+        "several": ["bench2_.*", ":".join(leaf_path[:2]), "leaf7"]
+    }
+    selection = results["selection"] = dict()
+    selected = results["selected"] = dict()
+    index, selection["index"] = timed(lambda: SelectionIndex(tests))
+    for name, test_name_regexes in patterns.items():
+        selected_tests, selection[name] = timed(lambda: index.select(test_name_regexes))
+        selected[name] = len(selected_tests)
+    query = TestQuery(":".join(leaf_path[:2]) + " and not (leaf3 or never_run and bench3_.*)")
+    history = RunHistory()
+    selected_tests, selection["query"] = timed(lambda: query.select(tests, history))
+    selected["query"] = len(selected_tests)
+    test_selector = TestSelector(tester_repository=tester_repository)
+    test_selector.config = cfg
+    cfg.run_tests = patterns["several"]
+    selected_tests, selection["select_tests"] = timed(lambda: test_selector.select_tests(log_location=workdir, exclude_module_paths=[]))
+    selected["select_tests"] = len(selected_tests)
+    cfg.run_tests = None
+    memory["selection"] = get_peak_rss()
+
+    tester_executor = TestersExecutor()
+    tester_executor.config = cfg
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            _, total = timed(lambda: tester_executor.executeTests(tester_repository=tester_repository, exclude_module_paths=[]))
+    executor = results["executor"] = {"total": total}
+    for phase, duration in tester_executor.phase_durations.items():
+        executor[phase] = round(duration, 4)
+    executor["per_test"] = round(executor["tests"] / size, 6)
+    memory["executor"] = get_peak_rss()
+    return results
+
+
+def run_size(size, depth, keep):
+    workdir = tempfile.mkdtemp(prefix="hiptestsuite_bench_" + str(size) + "_")
+    try:
+        cmd = [sys.executable, os.path.abspath(__file__), "--measure", str(size), "--depth", str(depth)]
+        process = subprocess.run(cmd, cwd=workdir, stdout=subprocess.PIPE, universal_newlines=True)
+        if process.returncode != 0:
+            print("Benchmark of " + str(size) + " tests failed")
+            return None
+        return json.loads(process.stdout.splitlines()[-1])
+    finally:
+        if keep:
+            print("Work dir of " + str(size) + " tests: " + workdir)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+# Metric name -> value of the timings and memory of a result file
+def get_metrics(results):
+    metrics = dict()
+    for size, size_results in results["sizes"].items():
+        for group in ("discovery", "selection", "executor", "memory"):
+            for name, value in size_results.get(group, dict()).items():
+                metrics[size + "." + group + "." + name] = value
+    return metrics
+
+
+# Metrics which grew by more than threshold times
+def compare(results, baseline, threshold):
+    regressions = list()
+    metrics = get_metrics(results)
+    baseline_metrics = get_metrics(baseline)
+    for name in sorted(metrics, key=lambda name: (int(name.split(".")[0]), name)):
+        if name not in baseline_metrics:
+            continue
+        value = metrics[name]
+        old_value = baseline_metrics[name]
+        is_memory = ".memory." in name
+        if not is_memory and max(value, old_value) < MIN_COMPARED_SECONDS:
+            continue
+        ratio = value / old_value if old_value else float("inf")
+        regressed = ratio > threshold
+        print("{name} | {old} | {new} | {ratio:.2f}x{flag}".format(name=name, old=old_value, new=value, ratio=ratio,
+                                                                   flag=" REGRESSION" if regressed else ""))
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results):
+    print("Tests | Discovery | Selection index | select_tests | Executor per test | Report | Peak RSS")
+    for size, size_results in results["sizes"].items():
+        print("{tests} | {discovery:.3f}s | {index:.3f}s | {select:.3f}s | {per_test:.6f}s | {report:.3f}s | {rss} kB".format(
+            tests=size, discovery=size_results["discovery"]["testers_cold_index"] + size_results["discovery"]["get_tests"],
+            index=size_results["selection"]["index"], select=size_results["selection"]["select_tests"],
+            per_test=size_results["executor"]["per_test"], report=size_results["executor"]["report"],
+            rss=size_results["memory"]["executor"]))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, metavar='<n>', help="Numbers of synthetic tests to measure, default: 10 1000 100000")
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH, metavar='<n>', help="Depth of the classifier path of every test, default: 8")
+    parser.add_argument('--output', metavar='<json>', help="Result file, default: build/benchmarks/<timestamp>.json")
+    parser.add_argument('--compare', metavar='<json>', help="Compare with an older result file, exit with 1 on regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, metavar='<ratio>', help="A metric regresses when it grew by more than <ratio> times, default: 1.25")
+    parser.add_argument('--keep', default=False, action='store_true', help="Keep the work dirs with the generated testers and reports")
+    parser.add_argument('--measure', type=int, metavar='<n>', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.measure is not None:
+        # Only the results go to stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            results = measure(args.measure, args.depth)
+        print(json.dumps(results))
+        return
+
+    results = {
+        "version": BENCHMARK_VERSION,
+        "date": datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "depth": args.depth,
+        "tests_per_tester": TESTS_PER_TESTER,
+        "sizes": dict()
+    }
+    for size in args.sizes:
+        print("Measuring " + str(size) + " tests ...")
+        size_results = run_size(size, args.depth, args.keep)
+        if size_results is None:
+            sys.exit(1)
+        results["sizes"][str(size)] = size_results
+
+    output = args.output
+    if output is None:
+        output = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "build", "benchmarks", results["date"] + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+    print_results(results)
+    print("Results: " + os.path.normpath(output))
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("version") != BENCHMARK_VERSION or baseline.get("depth") != args.depth:
+            print("Warning: " + args.compare + " was measured with another benchmark version or depth")
+        print("Metric | Baseline | Current | Ratio")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(str(len(regressions)) + " metrics regressed by more than " + str(args.threshold) + "x")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -67,6 +67,67 @@ link_libs_path = None
 # e.g.4 run_tests = [ts1:tc1, ts1:tc2, tc3, ts2:tc4, ts3]
 run_tests = None
 
+# None/selection query, a boolean expression of run_tests patterns and run history
+# predicates, e.g. "samples and not stress", "conformance and failed_in_last(3)"
+# See src/hiptestsuite/test_query.py, with run_tests the query filters their tests
+test_query = None
+
+# None/path of the run history json, the results and durations of the last runs
+# of every test, None: build/run_history.json
+run_history = None
+
+# None/wall clock budget of the run, e.g. "45m", "2h" or seconds. The selected tests are
+# cut down to the most valuable ones by their durations and results in the run history
+time_budget = None
+
+# None/path of a tar bundle with prebuilt repos and third party installs
+# import_artifacts is unpacked before the run, export_artifacts is written after it
+import_artifacts = None
+export_artifacts = None
+
+# build_only: None/True/path of the build manifest to write, fetch and build without running
+# run_only: None/path of a build manifest, run the built tests without building
+build_only = None
+run_only = None
+
+# None/directory of the hipcc compiler cache, e.g. "build/compiler_cache"
+# compiler_cache_compiler is the real compiler behind the cache, None: <ROCM_PATH>/bin/hipcc
+compiler_cache = None
+compiler_cache_compiler = None
+
+# None/False/directory of the bare repo mirrors which checkouts are cloned from
+# None/False: clone every repo directly from its url, e.g. "~/.cache/hiptestsuite/repos"
+repo_cache = None
+
+# None/False/directory of the cache of third party tarballs (hypre, metis, boost)
+# None/False: download into the tree every time, e.g. "~/.cache/hiptestsuite/downloads"
+download_cache = None
+
+# 0/number of repos fetched in parallel ahead of the selected tests
+# 0: every test fetches its repos when it starts
+prefetch_repos = 0
+
+# None/path of the offline manifest json, which maps the cfg.repos keys to local repos
+# and the third party tarballs to local files with their sha256, see README.md
+# Any other network access fails at once
+offline_manifest = None
+
+# None/size ("200G", "500M" or bytes) of the repos, third party installs, build roots and
+# report dirs kept, the least recently used are removed above it before and during a run
+# storage_min_free: None/size of free disk space to keep, evicting the same way
+storage_quota = None
+storage_min_free = None
+
+# None/number of report/<timestamp> dirs kept as they are, the logs of older runs are
+# packed into report/<timestamp>/logs.zip at the end of a run, report.json stays readable
+report_retention = None
+
+# None/False/path of the catalog of the tests listed by expensive testers (HIP Catch2)
+# None: build/test_catalog.json, False: always discover the tests
+# refresh_test_catalog: discover again and overwrite the cached entries
+test_catalog = None
+refresh_test_catalog = False
+
 
 branch = None
 repos = {
@@ -21,15 +21,29 @@
 import sys
 import os
 import argparse
+import time
 
+start_time = time.time()
 if __name__ == "__main__":
     sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
 
 from hiptestsuite.TestersExecutor import TestersExecutor
 from hiptestsuite.list_tests import list_tests
+from hiptestsuite.common.hip_build_graph import prerequisites
+from hiptestsuite.common.hip_artifacts import export_artifacts, import_artifacts
+from hiptestsuite.common.hip_build_dirs import set_build_configuration
+from hiptestsuite.common.hip_get_packages import set_repo_cache
+from hiptestsuite.common.hip_offline import set_offline_manifest
+from hiptestsuite.common.hip_downloads import set_download_cache
+from hiptestsuite.common.hip_storage import parse_size
+from hiptestsuite.common.hip_reports import get_run_dir, extract_logs
+from hiptestsuite.tester_index import startup_profile
+from hiptestsuite.test_query import TestQuery, parse_duration
 import cfg
 
+startup_profile.add("run.py imports", time.time() - start_time)
+
 
 def parse_args():
     parser = argparse.ArgumentParser()
@@ -38,25 +52,129 @@ def parse_args():
         # required=True,
         # choices=TESTS_CHOICES,
         metavar='', help="Test name/Regex/Category/Category:<Test name/Regex/Category>*/List of those separated by space")
+    parser.add_argument('--query', metavar='<expr>', help="Select tests by a boolean expression of -t patterns and run history, e.g. \"samples and not stress\", \"examples:performance and duration<120s\", \"conformance and failed_in_last(3)\"")
+    parser.add_argument('--time-budget', metavar='<time>', help="Run the selected tests which fit in <time> (e.g. 45m), recently failing, changed and never run tests first, by their durations in the run history")
     parser.add_argument('-lst', '--list_tests', default=False, action='store_true', help="List all tests")
     parser.add_argument('-lstq', '--list_tests_quick', default=False, action='store_true', help="List all tests quickly, Warning: This may not list some tests which are time consuming to generate, and only category:* will be displayed for them, use -lst for listing all tests")
+    parser.add_argument('--format', default="table", choices=["table", "json", "jsonl"], help="Output of -lst/-lstq: table, json or jsonl (one test per line) with classifiers, tester module, required repos, run history and whether the tests came from the test catalog, default: table")
+    parser.add_argument('--clean-prerequisites', nargs='*', metavar='', help="Clean third party prerequisites (boost_1_72_0/gridtools/gtbench/hypre/metis/mfem/laghos/hip_catch2/gflags) and everything built on top of them, default: all")
+    parser.add_argument('--export-artifacts', metavar='<tar>', help="After the run, package cloned repos, built binaries and install trees into <tar>")
+    parser.add_argument('--import-artifacts', metavar='<tar>', help="Before the run, unpack a bundle written by --export-artifacts with the same platform/offload arch/compiler/repo commits")
+    parser.add_argument('--build-only', nargs='?', const=True, metavar='<manifest>', help="Fetch and build the selected tests without running them, the ready binaries are written to <manifest>, default: report/<timestamp>/build_manifest.json")
+    parser.add_argument('--compiler-cache', nargs='?', const="build/compiler_cache", metavar='<dir>', help="Cache hipcc outputs keyed by preprocessed sources, flags and compiler in <dir>, default: build/compiler_cache")
+    parser.add_argument('--prefetch-repos', type=int, metavar='<n>', help="Fetch the repos of the selected tests on <n> threads while the tests run, 0 disables prefetching, default: 0")
+    parser.add_argument('--offline', metavar='<manifest>', help="Take repos and third party tarballs only from the local copies listed in <manifest>, network access fails")
+    parser.add_argument('--storage-quota', metavar='<size>', help="Keep repos, third party installs, build roots and reports below <size> (e.g. 200G), least recently used ones are removed")
+    parser.add_argument('--storage-min-free', metavar='<size>', help="Remove least recently used repos, installs, build roots and reports while less than <size> disk space is free")
+    parser.add_argument('--report-retention', type=int, metavar='<n>', help="Keep the last <n> report dirs as they are, pack the logs of older runs into report/<timestamp>/logs.zip")
+    parser.add_argument('--extract-logs', nargs='+', metavar='', help="<run> [<test>*]: Extract the logs of the tests (default: all) of a packed run, <run> is its timestamp or report dir")
+    parser.add_argument('--profile-startup', default=False, action='store_true', help="Print the time taken by imports, the tester index and test discovery")
+    parser.add_argument('--refresh-test-catalog', default=False, action='store_true', help="Discover the tests again instead of taking them from build/test_catalog.json")
+    parser.add_argument('--run-only', metavar='<manifest>', help="Run the tests of a --build-only manifest without fetching or building, missing binaries are reported as ERROR")
 
     args = parser.parse_args()
 
     if args.platform:
         cfg.HIP_PLATFORM = args.platform
 
+    if args.profile_startup:
+        startup_profile.enabled = True
+
+    if args.refresh_test_catalog:
+        cfg.refresh_test_catalog = True
+
+    set_build_configuration(cfg)
+    set_repo_cache(cfg.repo_cache)
+    set_download_cache(cfg.download_cache)
+
+    if args.offline:
+        cfg.offline_manifest = args.offline
+    if not set_offline_manifest(cfg.offline_manifest, cfg):
+        return False
+
+    if args.extract_logs:
+        report_root = os.path.join(cfg.log_location if cfg.log_location else os.getcwd(), "report")
+        run_dir = get_run_dir(report_root, args.extract_logs[0])
+        extracted = extract_logs(run_dir, args.extract_logs[1:])
+        if extracted is None:
+            print("No packed logs in " + run_dir)
+        else:
+            print("Extracted " + str(len(extracted)) + " logs into " + run_dir)
+        return False
+
+    if args.clean_prerequisites is not None:
+        prerequisites.clean(args.clean_prerequisites if args.clean_prerequisites else None)
+        return False
+
     if args.list_tests:
-        list_tests(quick=False, cfg=cfg)
+        list_tests(quick=False, cfg=cfg, output_format=args.format)
         return False
 
     if args.list_tests_quick:
-        list_tests(quick=True, cfg=cfg)
+        list_tests(quick=True, cfg=cfg, output_format=args.format)
         return False
 
     if args.tests:
         cfg.run_tests = args.tests
 
+    if args.query:
+        cfg.test_query = args.query
+
+    if cfg.test_query:
+        try:
+            TestQuery(cfg.test_query)
+        except ValueError as error:
+            print(error)
+            return False
+
+    if args.time_budget:
+        cfg.time_budget = args.time_budget
+
+    if cfg.time_budget:
+        try:
+            parse_duration(str(cfg.time_budget))
+        except ValueError as error:
+            print(error)
+            return False
+
+    if args.export_artifacts:
+        cfg.export_artifacts = args.export_artifacts
+
+    if args.import_artifacts:
+        cfg.import_artifacts = args.import_artifacts
+
+    if args.build_only and args.run_only:
+        print("--build-only and --run-only can not be combined")
+        return False
+
+    if args.build_only:
+        cfg.build_only = args.build_only
+
+    if args.run_only:
+        cfg.run_only = args.run_only
+
+    if args.compiler_cache:
+        cfg.compiler_cache = args.compiler_cache
+
+    if args.prefetch_repos is not None:
+        cfg.prefetch_repos = args.prefetch_repos
+
+    if args.report_retention is not None:
+        cfg.report_retention = args.report_retention
+
+    if args.storage_quota:
+        cfg.storage_quota = args.storage_quota
+
+    if args.storage_min_free:
+        cfg.storage_min_free = args.storage_min_free
+
+    try:
+        parse_size(cfg.storage_quota)
+        parse_size(cfg.storage_min_free)
+    except ValueError as error:
+        print(error)
+        return False
+
     return True
 
 
@@ -65,9 +183,14 @@ def main():
     exclude_module_paths = ["hiptestsuite/thirdparty"]
 
     if parse_args():
+        if cfg.import_artifacts:
+            if not import_artifacts(cfg.import_artifacts, cfg):
+                sys.exit(1)
         tester_executor: TestersExecutor = TestersExecutor()
         tester_executor.config = cfg
         tester_executor.executeTests(exclude_module_paths=exclude_module_paths)
+        if cfg.export_artifacts:
+            export_artifacts(cfg.export_artifacts, cfg)
 
 
 if __name__ == "__main__":
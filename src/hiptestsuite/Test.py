@@ -133,6 +133,16 @@ class HIP_PLATFORM(Enum):
     amd = auto()
 
 
+# Each data class loads the platform, it is told once per process
+platform_messages = set()
+
+
+def print_platform_message(message: str):
+    if message not in platform_messages:
+        platform_messages.add(message)
+        print(message)
+
+
 class HIPCCCompileData(CompileData, ConfigProcessor):
     def __init__(self):
         CompileData.__init__(self)
@@ -157,16 +167,16 @@ class HIPCCCompileData(CompileData, ConfigProcessor):
 
     def loadConfig(self):
         if self.config.HIP_PLATFORM == "amd":
-            print("Platform selected: amd")
+            print_platform_message("Platform selected: amd")
             self.HIP_PLATFORM = HIP_PLATFORM.amd
         elif self.config.HIP_PLATFORM == "nvidia":
-            print("Platform selected: nvidia")
+            print_platform_message("Platform selected: nvidia")
             self.HIP_PLATFORM = HIP_PLATFORM.nvidia
         elif self.config.HIP_PLATFORM is None:
-            print("Platform selected: amd")
+            print_platform_message("Platform selected: amd")
             self.HIP_PLATFORM = HIP_PLATFORM.amd
         else:
-            print("Warning: Platform " + self.config.HIP_PLATFORM + " is not supported, defaulting to AMD")
+            print_platform_message("Warning: Platform " + self.config.HIP_PLATFORM + " is not supported, defaulting to AMD")
             self.HIP_PLATFORM = HIP_PLATFORM.amd
 
         if self.config.Optimization_Level == 0:
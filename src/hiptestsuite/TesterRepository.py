@@ -22,16 +22,21 @@ from hiptestsuite.Test import Test, TestData, GetTestsData, LogLocation, Quick
 from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.AMD import AMDObject
 from hiptestsuite.config_processor import ConfigProcessor
-from hiptestsuite.match_fun_args_call import match_fun_args_call
+from hiptestsuite.test_data_factory import test_data_factory
+from hiptestsuite.tester_index import TesterIndex, may_select, import_testers, startup_profile
+from hiptestsuite.test_catalog import TestCatalog
 import hiptestsuite
 
 from typing import List, Union
-import pkgutil
+import time
 import traceback
-import typing
 
 
 class Tester(AMDObject):
+    # True if getTests with quick may leave tests out, None: True unless
+    # getTests takes no get tests data, which is the only way to see quick
+    partial_quick_tests = None
+
     def __init__(self):
         AMDObject.__init__(self)
 
@@ -44,6 +49,8 @@ class Tester(AMDObject):
     def test(self, test_data: TestData):
         pass
 
+    # Classifiers of all the tests of this tester, None if they vary. Testers
+    # which cannot match the -t patterns are not asked for their tests
     def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
         return None
 
@@ -67,11 +74,29 @@ class TesterRepository(AMDObject):
         self.getTestersFrom.clear()
 
     def addAllTesters(self):
+        self.addTestersFor(test_name_regexes=None)
+
+    # Only the modules owning testers which may have tests matching
+    # test_name_regexes (None: all) are imported, see tester_index.py
+    def addTestersFor(self, test_name_regexes):
         if self.testers is None:
             self.testers = list()
-        tester_children = get_cls_children_from_pkgs(cls=Tester, pkgs=self.getTestersFrom)
+        start = time.time()
+        tester_index = TesterIndex(pkgs=self.getTestersFrom)
+        tester_index.load()
+        entries = tester_index.get_testers()
+        startup_profile.add("tester index", time.time() - start,\
+        str(tester_index.rescanned) + " of " + str(len(tester_index.modules)) + " modules scanned")
+        if test_name_regexes is not None:
+            entries = [entry for entry in entries if may_select(entry, test_name_regexes)]
+        start = time.time()
+        tester_children = import_testers(entries, Tester)
+        startup_profile.add("tester imports", time.time() - start,\
+        str(len(set(entry.module for entry in entries))) + " modules")
+        start = time.time()
         for tester_child in tester_children:
             self.testers.append(tester_child())
+        startup_profile.add("tester instantiation", time.time() - start, str(len(tester_children)) + " testers")
 
     def addTester(self, tester: Tester):
         if self.testers is None:
@@ -83,66 +108,56 @@ class GetTests(ConfigProcessor):
     def __init__(self, tester_repository: TesterRepository):
         ConfigProcessor.__init__(self)
         self.tester_repository = tester_repository
+        # Testers whose tests came from the test catalog in the last get_tests
+        self.cached_testers = set()
 
-    def get_tests(self, log_location=None, quick=None):
+    # testers: the testers to get the tests of, None: all of the repository
+    def get_tests(self, log_location=None, quick=None, testers=None):
         config = self.config
-        testers: List[Tester] = self.tester_repository.getTesters()
+        if testers is None:
+            testers: List[Tester] = self.tester_repository.getTesters()
         tests = list()
+        self.cached_testers = set()
+        start = time.time()
+        test_catalog = None
+        if config.test_catalog is not False:
+            test_catalog = TestCatalog(path=config.test_catalog, refresh=config.refresh_test_catalog)
 
         for tester in testers:
-            get_tests_t = typing.get_type_hints(tester.getTests)
-            get_tests_data_t = None
-            if get_tests_t:
-                if "get_tests_data" in get_tests_t:
-                    get_tests_data_t = get_tests_t["get_tests_data"]
+            catalog_key = None
+            if test_catalog is not None:
+                catalog_key = test_catalog.get_key(tester, config)
+                cached_tests = test_catalog.get_tests(tester, catalog_key)
+                if cached_tests is not None:
+                    tests.extend(cached_tests)
+                    self.cached_testers.add(tester)
+                    continue
 
-            if get_tests_data_t is not None:
-                get_tests_data = get_tests_data_t()
-            else:
-                get_tests_data = None
+            get_tests_data = test_data_factory.create(config, tester, "getTests", "get_tests_data")
 
             if isinstance(get_tests_data, LogLocation):
                 get_tests_data: LogLocation
                 get_tests_data.log_location = log_location
 
-            if isinstance(get_tests_data, ConfigProcessor):
-                get_tests_data.config = config
-                get_tests_data.loadConfig()
-
             if isinstance(get_tests_data, Quick):
                 get_tests_data: Quick
                 get_tests_data.quick = quick
 
             try:
-                tests_of_tester = match_fun_args_call(fun=tester.getTests, args={"get_tests_data": get_tests_data})
+                if get_tests_data is not None:
+                    tests_of_tester = tester.getTests(get_tests_data=get_tests_data)
+                else:
+                    tests_of_tester = tester.getTests()
                 tests.extend(tests_of_tester)
             except Exception as err:
                 print("{tester} failed to generate tests".format(tester=tester.__class__.__name__))
                 traceback.print_exc()
                 continue
+            # Quick discovery may leave tests out
+            if test_catalog is not None and not quick:
+                test_catalog.put_tests(tester, catalog_key, tests_of_tester)
+        if test_catalog is not None:
+            test_catalog.save()
+        startup_profile.add("quick test discovery" if quick else "test discovery", time.time() - start, str(len(tests)) + " tests")
         return tests
 
-
-def get_cls_children_from_pkgs(cls, pkgs: List) -> set:
-    import_all_scripts_from(pkgs=pkgs)
-    cls_children = get_cls_children(cls=cls)
-    return cls_children
-
-
-def get_cls_children(cls) -> set:
-    cls_children = set()
-
-    for subclass in cls.__subclasses__():
-        cls_children.add(subclass)
-        cls_children.union(get_cls_children(subclass))
-
-    return cls_children
-
-
-def import_all_scripts_from(pkgs: List):
-    for pkg in pkgs:
-        for importer, modname, ispkg in pkgutil.iter_modules(pkg.__path__):
-            if ispkg:
-                import_all_scripts_from([importer.find_module(modname).load_module(modname)])
-            else:
-                importer.find_module(modname).load_module(modname)
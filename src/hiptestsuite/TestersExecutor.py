@@ -20,15 +20,31 @@
 
 from hiptestsuite.TesterRepository import TesterRepository, Tester, Test
 from hiptestsuite.test_selector import TestSelector
+from hiptestsuite.test_query import TestQuery, parse_duration
+from hiptestsuite.run_history import RunHistory, get_tester_sha256
+from hiptestsuite.time_budget import TimeBudget, format_duration
+from hiptestsuite.tester_index import startup_profile
 from hiptestsuite.config_processor import ConfigProcessor
+from hiptestsuite.config_defaults import set_config_defaults
+from hiptestsuite.test_data_factory import test_data_factory
 from hiptestsuite.Test import TestResult
+from hiptestsuite.common.hip_execution_mode import execution_mode, ExecutionMode, BuildComplete, ArtifactMissing, check_artifacts
+from hiptestsuite.common.hip_artifacts import write_build_manifest, read_build_manifest, BUILD_MANIFEST_NAME
+from hiptestsuite.common.hip_compiler_cache import enable_compiler_cache, disable_compiler_cache, read_compiler_cache_stats
+from hiptestsuite.common.hip_build_dirs import set_build_configuration, get_build_root
+from hiptestsuite.common.hip_get_packages import set_repo_cache, HipPackages
+from hiptestsuite.common.hip_prefetch import RepoPrefetch, get_required_repos, PULL_REPO_NAMES
+from hiptestsuite.common.hip_offline import set_offline_manifest, NetworkAccessDisabled
+from hiptestsuite.common.hip_downloads import set_download_cache
+from hiptestsuite.common.hip_build_graph import prerequisites
+from hiptestsuite.common.hip_storage import StorageManager, mark_used, parse_size
+from hiptestsuite.common.hip_reports import compact_reports
 
 import os
 import traceback
 import logging
 import subprocess
 import sys
-import typing
 from typing import Union, List, Dict
 import json
 import re
@@ -39,10 +55,14 @@ import datetime
 class TestersExecutor(ConfigProcessor):
     def __init__(self):
         ConfigProcessor.__init__(self)
+        # Durations of the selection, test and report phases of the last run
+        self.phase_durations = dict()
 
     def executeTests(self, tester_repository: TesterRepository=None, exclude_module_paths=None):
         start_datetime = datetime.datetime.now()
         config = self.config
+        set_config_defaults(config)
+        test_data_factory.reset(config)
         log_location = config.log_location
         if log_location is None:
             log_location = os.getcwd()
@@ -68,58 +88,177 @@ class TestersExecutor(ConfigProcessor):
         selected_test_filter = config.run_tests
         if selected_test_filter:
             logger.info("Selected Test Filter: {selected_test_filter}".format(selected_test_filter=" ".join(selected_test_filter)))
+        test_query = None
+        if config.test_query:
+            try:
+                test_query = TestQuery(config.test_query)
+            except ValueError as error:
+                logger.error(str(error))
+                return
+            logger.info("Test Query: {test_query}".format(test_query=config.test_query))
+        run_history = RunHistory(path=config.run_history)
         logger.info("Execution Logs: {log_location}".format(log_location=log_location))
 
+        set_build_configuration(config)
+        set_repo_cache(config.repo_cache)
+        set_download_cache(config.download_cache)
+        logger.info("Build Root: {build_root}".format(build_root=get_build_root()))
+        if not set_offline_manifest(config.offline_manifest, config):
+            logger.error("Offline manifest {manifest} can not be used".format(manifest=config.offline_manifest))
+            return
+        if config.offline_manifest:
+            logger.info("Offline Manifest: {manifest}".format(manifest=config.offline_manifest))
+
+        execution_mode.mode = ExecutionMode.BUILD_AND_RUN
+        built_tests = None
+        if config.run_only:
+            built_tests = read_build_manifest(config.run_only, config)
+            if built_tests is None:
+                logger.error("Run only mode needs a build manifest written by --build-only")
+                return
+            execution_mode.mode = ExecutionMode.RUN_ONLY
+            logger.info("Run Only: {manifest}".format(manifest=config.run_only))
+        elif config.build_only:
+            execution_mode.mode = ExecutionMode.BUILD_ONLY
+            logger.info("Build Only")
+
+        compiler_cache_stats_file = None
+        if config.compiler_cache:
+            compiler = config.compiler_cache_compiler
+            if compiler is None:
+                compiler = os.path.join(config.ROCM_PATH if config.ROCM_PATH else "/opt/rocm", "bin/hipcc")
+            compiler_cache_stats_file = os.path.join(timestamped_log_location, "compiler_cache.log")
+            enable_compiler_cache(config.compiler_cache, compiler, compiler_cache_stats_file)
+            logger.info("Compiler Cache: {cache_dir}".format(cache_dir=config.compiler_cache))
+
         if tester_repository is None:
             tester_repository: TesterRepository = TesterRepository()
-            tester_repository.addAllTesters()
-
+            if type(selected_test_filter) == str:
+                tester_repository.addTestersFor([selected_test_filter])
+            elif selected_test_filter:
+                tester_repository.addTestersFor(selected_test_filter)
+            else:
+                tester_repository.addTestersFor(test_query.get_patterns() if test_query is not None else None)
+
+        phase_start = time.time()
         test_selector: TestSelector = TestSelector(tester_repository=tester_repository)
         test_selector.config = config
-        tests: List[Test] = test_selector.select_tests(log_location=timestamped_log_location, exclude_module_paths=exclude_module_paths)
+        tests: List[Test] = test_selector.select_tests(log_location=timestamped_log_location, exclude_module_paths=exclude_module_paths,
+                                                       test_query=test_query, run_history=run_history)
         tests: List[Test] = sorted(tests, key=lambda x: x.test_name)
+        startup_profile.report()
+        if built_tests is not None and not selected_test_filter and test_query is None:
+            # Without a filter, run what the manifest has built
+            tests = [test for test in tests if test.test_name.lower() in built_tests]
+
+        time_budget = None
+        if config.time_budget:
+            time_budget = TimeBudget(parse_duration(str(config.time_budget)), run_history)
+            tests = time_budget.select(tests)
+            logger.info("Time Budget: {budget}, {count} tests estimated to take {estimate}, {dropped} dropped".format(
+                budget=format_duration(time_budget.budget), count=len(tests),
+                estimate=format_duration(time_budget.estimated_duration), dropped=len(time_budget.dropped)))
+            for test_name, reason in sorted(time_budget.dropped.items()):
+                logger.info("Dropped {test_name}: {reason}".format(test_name=test_name, reason=reason))
+        self.phase_durations["selection"] = time.time() - phase_start
+
+        # Fetch the repos of the selected tests ahead of them, run only mode never fetches
+        repo_prefetch = None
+        if config.prefetch_repos and execution_mode.mode != ExecutionMode.RUN_ONLY:
+            repo_prefetch = RepoPrefetch(config.repos, os.path.join(timestamped_log_location, "prefetch"), max_workers=config.prefetch_repos)
+            prefetched_repos = repo_prefetch.start(get_required_repos(tests))
+            if prefetched_repos:
+                logger.info("Prefetching Repos: {repos}".format(repos=" ".join(prefetched_repos)))
+
+        storage = StorageManager(parse_size(config.storage_quota), parse_size(config.storage_min_free),\
+        HipPackages().get_repo_paths(), prerequisites, root_log_location)
+        if storage.is_enabled():
+            storage.start_run(timestamped_log_location)
+            # Trees of this run are marked used before anything is evicted for it
+            mark_used("build", os.path.basename(get_build_root()))
+            mark_used("report", os.path.basename(timestamped_log_location))
+            for repo in get_required_repos(tests):
+                if repo in PULL_REPO_NAMES:
+                    mark_used("repo", PULL_REPO_NAMES[repo])
+            storage.enforce()
+
         tests_status = dict()
+        tests_artifacts = dict()
         tests_logs = dict()
         tests_relative_logs = dict()
+        tests_duration = dict()
 
-        for test in tests:
+        phase_start = time.time()
+        for index, test in enumerate(tests):
             print("Started Test: {test_name}".format(test_name=test.test_name.lower()))
 
-            test_t = typing.get_type_hints(test.tester.test)
-            test_data_t = None
-            if test_t:
-                test_data_t = test_t["test_data"]
-
-            test_data = test_data_t()
-
-            if isinstance(test_data, ConfigProcessor):
-                test_data: ConfigProcessor
-                test_data.config = config
-                test_data.loadConfig()
+            test_data = test_data_factory.create(config, test.tester, "test", "test_data")
             test_data.test = test
             test_data.log_location = os.path.join(timestamped_log_location, test.test_name.lower() + ".log.d")
             os.makedirs(test_data.log_location, exist_ok=True)
 
+            test_start = time.time()
             try:
+                if built_tests is not None:
+                    if test.test_name.lower() not in built_tests:
+                        raise ArtifactMissing("Not built in " + config.run_only)
+                    check_artifacts(built_tests[test.test_name.lower()])
                 test.tester.test(test_data=test_data)
+            except BuildComplete as built:
+                test_data.test_result = TestResult.PASS
+                tests_artifacts[test.test_name.lower()] = built.artifacts
+            except (ArtifactMissing, NetworkAccessDisabled) as error:
+                test_data.test_result = TestResult.ERROR
+                logger.error("{test_name}: {error}".format(test_name=test.test_name.lower(), error=error))
             except Exception as error:
                 test_data.test_result = TestResult.ERROR
                 traceback.print_exc()
 
             tests_status[test] = test_data.test_result
+            tests_duration[test] = time.time() - test_start
             tests_logs[test] = test_data.log_location
             tests_relative_logs[test] = os.path.join(relative_timestamped_log_location, test.test_name.lower() + ".log.d")
             print("Completed Test: {test_name} with result {result}".format(test_name=test.test_name.lower(), result=test_data.test_result.name))
-
-        for test in tests:
-            try:
-                test.tester.clean()
-            except Exception as error:
-                traceback.print_exc()
-
+            # Measuring walks the trees, storage is enforced once the tests of a tester are done
+            if index + 1 == len(tests) or tests[index + 1].tester is not test.tester:
+                storage.enforce()
+
+        self.phase_durations["tests"] = time.time() - phase_start
+        prefetch_status = None
+        if repo_prefetch is not None:
+            prefetch_status = repo_prefetch.wait()
+
+        # Built binaries are kept for a later run only invocation
+        if execution_mode.mode == ExecutionMode.BUILD_AND_RUN:
+            for test in tests:
+                try:
+                    test.tester.clean()
+                except Exception as error:
+                    traceback.print_exc()
+
+        if execution_mode.mode == ExecutionMode.BUILD_ONLY:
+            build_manifest = config.build_only
+            if build_manifest is True:
+                build_manifest = os.path.join(timestamped_log_location, BUILD_MANIFEST_NAME)
+            write_build_manifest(build_manifest, config, tests_artifacts)
+            logger.info("Build Manifest: {manifest}".format(manifest=build_manifest))
+
+        # Build only durations say nothing about the test runs
+        if execution_mode.mode != ExecutionMode.BUILD_ONLY and tests_status:
+            run_history.add_run(start_datetime.strftime("%Y_%m_%d_%H_%M_%S"),
+                                {test.test_name: [test_status.name, tests_duration[test], get_tester_sha256(test.tester)]
+                                 for test, test_status in tests_status.items()})
+
+        storage.finish_run()
         end_datetime = datetime.datetime.now()
 
+        compiler_cache_stats = None
+        if compiler_cache_stats_file:
+            disable_compiler_cache()
+            compiler_cache_stats = read_compiler_cache_stats(compiler_cache_stats_file)
+
         # ### Reporting
+        phase_start = time.time()
         try:
             opt_rocm_version: Union[None, str] = get_opt_rocm_version()
         except Exception as error:
@@ -212,6 +351,11 @@ class TestersExecutor(ConfigProcessor):
             logger.info("CUDA RT Version" + " | " + cuda_rt_version if cuda_rt_version else "Can't get CUDA RT Version")
             logger.info("CUDA GPUs" + " | " + ", ".join(cuda_gpus) if cuda_gpus else "Can't get CUDA GPUs")
 
+        if compiler_cache_stats:
+            logger.info("Compiler Cache: {hits} hits, {misses} misses, {uncacheable} uncacheable, hit rate {hit_rate}".format(
+                hits=compiler_cache_stats["hits"], misses=compiler_cache_stats["misses"], uncacheable=compiler_cache_stats["uncacheable"],
+                hit_rate=str(compiler_cache_stats["hit_rate"]) + "%" if compiler_cache_stats["hit_rate"] is not None else "n/a"))
+
         logger.info("Note, All log locations are relative to {log_location}".format(log_location=log_location))
 
         # ### json
@@ -221,6 +365,7 @@ class TestersExecutor(ConfigProcessor):
             test_root = tests_root[test.test_name.lower()] = dict()
             test_root["status"] = test_status.name
             test_root["log_location"] = tests_logs[test]
+            test_root["duration"] = round(tests_duration[test], 2)
 
         json_root["num_total"] = len(tests_status)
         json_root["num_passed"] = len(passed_tests)
@@ -236,10 +381,28 @@ class TestersExecutor(ConfigProcessor):
         json_root["start_datetime"] = start_datetime.strftime("%Y_%m_%d_%H_%M_%S")
         json_root["end_datetime"] = end_datetime.strftime("%Y_%m_%d_%H_%M_%S")
         json_root["selected_test_filter"] = selected_test_filter
+        json_root["test_query"] = test_query.query if test_query is not None else None
+        json_root["time_budget"] = None
+        if time_budget is not None:
+            json_root["time_budget"] = {"budget": time_budget.budget, "estimated_duration": round(time_budget.estimated_duration, 2),
+                                        "selected": time_budget.selected, "dropped": time_budget.dropped}
+        json_root["execution_mode"] = execution_mode.mode.name
+        json_root["build_root"] = get_build_root()
+        json_root["compiler_cache"] = compiler_cache_stats
+        json_root["prefetched_repos"] = prefetch_status
+        json_root["offline_manifest"] = config.offline_manifest
+        json_root["evicted_storage"] = storage.evicted if storage.is_enabled() else None
 
         with open(os.path.join(timestamped_log_location, 'report.json'), 'w+', encoding='utf-8') as f:
             json.dump(json_root, f, ensure_ascii=False, indent=4)
 
+        if config.report_retention is not None:
+            compacted = compact_reports(root_log_location, config.report_retention)
+            if compacted:
+                logger.info("Packed the logs of {count} older runs".format(count=len(compacted)))
+
+        self.phase_durations["report"] = time.time() - phase_start
+
         print("")
         print("Test Complete: Log file directory is " + relative_timestamped_log_location)
 
@@ -21,6 +21,7 @@
 import os
 import tempfile 
 from hiptestsuite.common.hip_shell import *
+from hiptestsuite.common.hip_compiler_cache import get_hipcc
 from hiptestsuite.applications.cuda_grep.cuda_grep_parser_common import CudaGrepParser
 
 class BuildRunAmd():
@@ -45,7 +46,7 @@ class BuildRunAmd():
             cmd_hipify = "find . -type f \( -iname \*.h -o -iname \*.cpp -o -iname \*.cu -o -iname \*.cuh \) | sed 's|^./||'\
             | xargs -t -I % sh -c '/opt/rocm/bin/hipify-perl % > hip_%; rm %; mv hip_% %;';"
             cmd_modify = "sed -i 's/#include <driver_functions.h>//g' putil.cu; touch hipified;"
-        cmd_build = "/opt/rocm/bin/hipcc -O3 -m64 pnfa.cu putil.cu nfa.cpp nfautil.cpp regex.cpp -o " + self.binary + ";"
+        cmd_build = get_hipcc() + " -O3 -m64 pnfa.cu putil.cu nfa.cpp nfautil.cpp regex.cpp -o " + self.binary + ";"
         cmdexc = cmdcd + cmd_hipify + cmd_modify + cmd_build
         execshellcmd(cmdexc, self.logFile, None)
         return True
@@ -25,12 +25,17 @@ from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.applications.cuda_memtest.cuda_memtest_build_amd import BuildRunAmd
 from hiptestsuite.applications.cuda_memtest.cuda_memtest_build_nvidia import BuildRunNvidia
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import run_build
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
 from hiptestsuite.common.hip_shell import execshellcmd
 
 import os
 import re
 # Common class to clone, set up, build and run test
 class PrepareTest():
+    # cfg.repos keys pulled by this test, prefetched by TestersExecutor
+    required_repos = ["cuda_memtest"]
+
     def __init__(self, cwd, binary):
         self.cwdAbs = cwd
         self.binary = binary
@@ -69,7 +74,9 @@ class PrepareTest():
         else:
             print("Invalid Platform")
             return False
-        buildstatus = self.prepareobj.buildtest()
+        with exclusive_lock(self.thistestpath):
+            buildstatus = run_build(self.prepareobj.buildtest,\
+            [os.path.join(self.thistestpath, self.binary)])
         if buildstatus == False:
             return False
         # Check if test binary is created
@@ -80,11 +87,13 @@ class PrepareTest():
 
     def clean(self):
         if self.prepareobj != None:
-            self.prepareobj.clean()
+            with exclusive_lock(self.thistestpath):
+                self.prepareobj.clean()
 
     def runtest(self, testnum):
         if self.prepareobj != None:
-            self.prepareobj.runtest(testnum)
+            with shared_lock(self.thistestpath):
+                self.prepareobj.runtest(testnum)
 
     def parse_result(self):
         if self.prepareobj != None:
@@ -116,12 +125,15 @@ class cudamemtest0(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -160,12 +172,15 @@ class cudamemtest1(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -204,12 +219,15 @@ class cudamemtest2(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -248,12 +266,15 @@ class cudamemtest3(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -292,12 +313,15 @@ class cudamemtest4(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -337,12 +361,15 @@ class cudamemtest5(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -382,12 +409,15 @@ class cudamemtest6(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -429,12 +459,15 @@ class cudamemtest7(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -474,12 +507,15 @@ class cudamemtest8(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -519,12 +555,15 @@ class cudamemtest9(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -566,12 +605,15 @@ class cudamemtest10(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = STRESS()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = STRESS()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -21,6 +21,7 @@
 import os
 import tempfile
 from hiptestsuite.common.hip_shell import *
+from hiptestsuite.common.hip_compiler_cache import get_hipcc
 from hiptestsuite.applications.cuda_memtest.cuda_memtest_parser_common import CudaMemtestParser
 
 class BuildRunNvidia():
@@ -51,7 +52,7 @@ class BuildRunNvidia():
         if not os.path.isfile(os.path.join(self.thistestpath, "hipified")):
             cmd_hipify = "ls cuda_memtest.* misc.* tests.cu | xargs -t -I % sh -c '/opt/rocm/bin/hipify-perl % > hip_%; rm %; mv hip_% %;';"
             cmd_modify = "cp ../cuda_memtest.cu .;"
-        cmd_build = "/opt/rocm/bin/hipcc -DENABLE_NVML=0 cuda_memtest.cu misc.cpp tests.cu -o " + self.binary + ";"
+        cmd_build = get_hipcc() + " -DENABLE_NVML=0 cuda_memtest.cu misc.cpp tests.cu -o " + self.binary + ";"
         cmdexc = cmdcd + cmd_hipify + cmd_modify + cmd_build
         execshellcmd(cmdexc, self.logFile, env)
         return True
@@ -25,18 +25,25 @@ from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.applications.hip_examples.hip_examples_build_amd import BuildRunAmd
 from hiptestsuite.applications.hip_examples.hip_examples_build_nvidia import BuildRunNvidia
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import run_build, is_run_only, ArtifactMissing
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
+from hiptestsuite.common.hip_build_dirs import get_build_dir, populate_build_dir
 from hiptestsuite.common.hip_shell import *
 
 import os
 
 # Common class to clone, set up, build and run test
 class PrepareTest():
+    # cfg.repos keys pulled by this test, prefetched by TestersExecutor
+    required_repos = ["hip_examples"]
+
     def __init__(self, path, cwd):
         self.cwdAbs = cwd
         self.appPath = os.path.join(self.cwdAbs,\
         "src/hiptestsuite/applications/hip_examples/")
         self.examplepath = os.path.join(self.appPath, "HIP-Examples/")
-        self.thistestpath = os.path.join(self.examplepath, path)
+        self.sourcepath = os.path.join(self.examplepath, path)
+        self.thistestpath = self.sourcepath
         self.prepareobj = None
         self.apprepo = "" # Default
         self.appbranch = ""
@@ -103,6 +110,11 @@ class PrepareTest():
         return ret
 
     def buildtest(self, logFile, platform, testid):
+        # Build out of tree in the build root of this configuration, the whole
+        # repo (HIP-Examples, GPU-STREAM or mixbench) is copied for relative paths
+        reponame = os.path.relpath(os.path.normpath(self.sourcepath), self.appPath).split(os.sep)[0]
+        populate_build_dir(os.path.join(self.appPath, reponame))
+        self.thistestpath = get_build_dir(self.sourcepath)
         if platform == HIP_PLATFORM.nvidia:
             self.prepareobj = BuildRunNvidia(self.thistestpath)
         elif platform == HIP_PLATFORM.amd:
@@ -110,16 +122,22 @@ class PrepareTest():
         else:
             print("Invalid Platform")
             return False
-        return self.prepareobj.buildtest(logFile, testid)
+        if is_run_only() and testid in self.prepareobj.runbymake:
+            raise ArtifactMissing(testid + " is executed by its build and has no prebuilt binary to run")
+        with exclusive_lock(self.thistestpath):
+            return run_build(lambda: self.prepareobj.buildtest(logFile, testid),\
+            [self.thistestpath + binary for binary in self.prepareobj.binarydic[testid]])
 
     def clean(self, testid):
         if self.prepareobj != None:
-            self.prepareobj.clean(testid)
+            with exclusive_lock(self.thistestpath):
+                self.prepareobj.clean(testid)
 
     def runtest(self, logFile, testid):
         status = False
         if self.prepareobj != None:
-            status = self.prepareobj.runtest(logFile, testid)
+            with shared_lock(self.thistestpath):
+                status = self.prepareobj.runtest(logFile, testid)
         return status
 
 
@@ -165,12 +183,15 @@ class VectorAdd(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "vectorAdd")
 
@@ -211,12 +232,15 @@ class GpuBurn(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = STRESS()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = STRESS()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "gpu-burn")
 
@@ -257,12 +281,15 @@ class StridedAccess(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "strided-access")
 
@@ -302,12 +329,15 @@ class Rtm8(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rtm8")
 
@@ -346,12 +376,15 @@ class Reduction(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "reduction")
 
@@ -391,12 +424,15 @@ class Mini_nbody(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "mini-nbody")
 
@@ -436,12 +472,15 @@ class Add4(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "add4")
 
@@ -481,12 +520,15 @@ class Cuda_stream(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "cuda-stream")
 
@@ -526,12 +568,15 @@ class Bfs(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.bfs")
 
@@ -572,12 +617,15 @@ class Cfd(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.cfd")
 
@@ -620,12 +668,15 @@ class Dwt2d(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.nvidia:
             PrepareTest.clean(self, "rodinia_3.dwt2d")
@@ -671,12 +722,15 @@ class Gaussian(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.gaussian")
 
@@ -717,12 +771,15 @@ class Heartwall(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.heartwall")
 
@@ -763,12 +820,15 @@ class Hotspot(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.hotspot")
 
@@ -809,12 +869,15 @@ class Hybridsort(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.hybridsort")
 
@@ -855,12 +918,15 @@ class Kmeans(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.kmeans")
 
@@ -901,12 +967,15 @@ class LavaMD(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.lavaMD")
 
@@ -947,12 +1016,15 @@ class Lud(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.lud")
 
@@ -993,12 +1065,15 @@ class Myocyte(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.myocyte")
 
@@ -1039,12 +1114,15 @@ class Nn(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.nn")
 
@@ -1085,12 +1163,15 @@ class Nw(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.nw")
 
@@ -1133,12 +1214,15 @@ class Particlefilter(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.amd:
             PrepareTest.clean(self, "rodinia_3.particlefilter")
@@ -1184,12 +1268,15 @@ class pathfinder(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.pathfinder")
 
@@ -1230,12 +1317,15 @@ class Srad(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.srad")
 
@@ -1276,12 +1366,15 @@ class Streamcluster(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "rodinia_3.streamcluster")
 
@@ -1324,12 +1417,15 @@ class Backprop(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.amd:
             PrepareTest.clean(self, "rodinia_3.backprop")
@@ -1375,12 +1471,15 @@ class BinomialOption(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.BinomialOption")
 
@@ -1421,12 +1520,15 @@ class BitonicSort(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.BitonicSort")
 
@@ -1467,12 +1569,15 @@ class Dct(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.dct")
 
@@ -1513,12 +1618,15 @@ class DwtHaar1D(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.dwtHaar1D")
 
@@ -1559,12 +1667,15 @@ class FastWalshTransform(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.FastWalshTransform")
 
@@ -1605,12 +1716,15 @@ class FloydWarshall(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.FloydWarshall")
 
@@ -1651,12 +1765,15 @@ class HelloWorld(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.HelloWorld")
 
@@ -1697,12 +1814,15 @@ class Histogram(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.Histogram")
 
@@ -1743,12 +1863,15 @@ class MatrixMultiplication(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.MatrixMultiplication")
 
@@ -1789,12 +1912,15 @@ class PrefixSum(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.PrefixSum")
 
@@ -1835,12 +1961,15 @@ class RecursiveGaussian(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.RecursiveGaussian")
 
@@ -1881,12 +2010,15 @@ class SimpleConvolution(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = MINIAPP()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = MINIAPP()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "HIP-Examples-Applications.SimpleConvolution")
 
@@ -1919,6 +2051,8 @@ class SimpleConvolution(Tester, PrepareTest):
 
 # Test GPU-STREAM Double
 class GpuStreamDouble(Tester, PrepareTest):
+    required_repos = ["gpu_stream"]
+
     def __init__(self):
         Tester.__init__(self)
         self.cwd = os.getcwd()
@@ -1927,12 +2061,15 @@ class GpuStreamDouble(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self, "GPU-STREAM-DOUBLE")
 
@@ -1966,6 +2103,8 @@ class GpuStreamDouble(Tester, PrepareTest):
 # Test mixbench-hip-alt
 # This test is skipped for nvidia
 class MixBenchAlt(Tester, PrepareTest):
+    required_repos = ["mixbench"]
+
     def __init__(self):
         Tester.__init__(self)
         self.cwd = os.getcwd()
@@ -1975,12 +2114,15 @@ class MixBenchAlt(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.nvidia:
             PrepareTest.clean(self, "mixbench-hip-alt")
@@ -2019,6 +2161,8 @@ class MixBenchAlt(Tester, PrepareTest):
 # Test mixbench-hip-ro
 # This test is skipped for nvidia
 class MixBenchRO(Tester, PrepareTest):
+    required_repos = ["mixbench"]
+
     def __init__(self):
         Tester.__init__(self)
         self.cwd = os.getcwd()
@@ -2028,12 +2172,15 @@ class MixBenchRO(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = PERFORMANCE()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = PERFORMANCE()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.nvidia:
             PrepareTest.clean(self, "mixbench-hip-ro")
@@ -78,6 +78,10 @@ class BuildRunCommon():
                      "mixbench-hip-alt":["mixbench-hip-alt", "mixbench-hip-ro"],\
                      "mixbench-hip-ro":["mixbench-hip-alt", "mixbench-hip-ro"]
                      }
+        # Test cases which are executed by their make
+        self.runbymake = ["vectorAdd", "mini-nbody", "openmp-helloworld"]
+        self.runbymake += [testid for testid in self.binarydic\
+                           if testid.startswith("HIP-Examples-Applications.")]
 
     def buildtest(self, logFile, testid, env = None):
         # Prepare the shell command to execute
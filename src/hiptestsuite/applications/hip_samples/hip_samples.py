@@ -25,17 +25,24 @@ from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.applications.hip_samples.hip_samples_build_amd import BuildRunAmd
 from hiptestsuite.applications.hip_samples.hip_samples_build_nvidia import BuildRunNvidia
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import run_build
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
+from hiptestsuite.common.hip_build_dirs import get_build_dir, populate_build_dir
 from hiptestsuite.common.hip_shell import *
 import tempfile
 import os
 import re
 # Common class to clone, set up, build and run test
 class PrepareTest():
+    # cfg.repos keys pulled by this test, prefetched by TestersExecutor
+    required_repos = ["hip"]
+
     def __init__(self, path, binary, cwd):
         self.cwdAbs = cwd
         self.conformancePath = os.path.join(self.cwdAbs, "src/hiptestsuite/conformance/")
         self.hippath = os.path.join(self.conformancePath, "HIP/")
-        self.thistestpath = os.path.join(self.hippath, path)
+        self.sourcepath = os.path.join(self.hippath, path)
+        self.thistestpath = self.sourcepath
         self.binary = binary
         self.testExecOutput = None
         self.hiprepo = "" # Default
@@ -63,6 +70,9 @@ class PrepareTest():
 
     def buildtest(self, logFile, platform, target=None):
         isBinaryPresent = True
+        # Build out of tree in the build root of this configuration
+        populate_build_dir(os.path.join(self.hippath, "samples"))
+        self.thistestpath = get_build_dir(self.sourcepath)
         if platform == HIP_PLATFORM.nvidia:
             self.prepareobj = BuildRunNvidia(self.thistestpath, logFile)
         elif platform == HIP_PLATFORM.amd:
@@ -70,7 +80,9 @@ class PrepareTest():
         else:
             print("Invalid Platform")
             return False
-        self.prepareobj.buildtest(target)
+        with exclusive_lock(self.thistestpath):
+            run_build(lambda: self.prepareobj.buildtest(target),\
+            [os.path.join(self.thistestpath, self.binary)])
 
         if not os.path.isfile(\
         os.path.join(self.thistestpath, self.binary)):
@@ -79,18 +91,20 @@ class PrepareTest():
 
     def clean(self):
         if self.prepareobj != None:
-            self.prepareobj.clean()
+            with exclusive_lock(self.thistestpath):
+                self.prepareobj.clean()
 
     def runtest(self, logFile):
-        cmdexc = "cd " + self.thistestpath + ";" + "./" + self.binary
-        if os.environ.get('AMD_LOG_LEVEL') is None:
-            self.testExecOutput = execshellcmd(cmdexc, logFile, None)
-        else:
-            runlogdump = tempfile.TemporaryFile("w+")
-            envtoset = os.environ.copy()
-            execshellcmd_largedump(cmdexc, logFile, runlogdump, envtoset)
-            runlogdump.seek(0)
-            self.testExecOutput = runlogdump.read()
+        with shared_lock(self.thistestpath):
+            cmdexc = "cd " + self.thistestpath + ";" + "./" + self.binary
+            if os.environ.get('AMD_LOG_LEVEL') is None:
+                self.testExecOutput = execshellcmd(cmdexc, logFile, None)
+            else:
+                runlogdump = tempfile.TemporaryFile("w+")
+                envtoset = os.environ.copy()
+                execshellcmd_largedump(cmdexc, logFile, runlogdump, envtoset)
+                runlogdump.seek(0)
+                self.testExecOutput = runlogdump.read()
 
 # Common class to parse the result of test execution
 class LogParser():
@@ -186,12 +200,15 @@ class BitExtract(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = INTRO()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = INTRO()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -231,12 +248,15 @@ class ModuleApiDefaultDriver(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = INTRO()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = INTRO()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -279,12 +299,15 @@ class ModuleApiLaunchKernelHcc(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = INTRO()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = INTRO()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.nvidia:
             PrepareTest.clean(self)
@@ -329,12 +352,15 @@ class ModuleApiRunKernel(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = INTRO()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = INTRO()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -375,12 +401,15 @@ class ModuleApiGlobal(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = INTRO()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = INTRO()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -420,12 +449,15 @@ class Square(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        intro = INTRO()
-        intro.add_matched_with_names()
-        test.classifiers = [intro]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        intro = INTRO()
+        intro.add_matched_with_names()
+        return [intro]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -466,12 +498,15 @@ class MatrixTranspose(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -515,12 +550,15 @@ class InlineAsm(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.nvidia:
             PrepareTest.clean(self)
@@ -568,12 +606,15 @@ class SquareAsm(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.nvidia:
             PrepareTest.clean(self)
@@ -619,12 +660,15 @@ class Texture2dDrv(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -664,12 +708,15 @@ class Unroll(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -709,12 +756,15 @@ class Shfl(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -754,12 +804,15 @@ class SharedMemory(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -802,12 +855,15 @@ class Square_Ir(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         if self.platform != HIP_PLATFORM.nvidia:
             PrepareTest.clean(self)
@@ -852,12 +908,15 @@ class Dshfl(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -897,12 +956,15 @@ class HipEvent(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -943,12 +1005,15 @@ class Dynamic_Shared(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -988,12 +1053,15 @@ class Peer2peer(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -1033,12 +1101,15 @@ class Stream(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -1078,12 +1149,15 @@ class Occupancy(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        cookbook = COOKBOOK()
-        cookbook.add_matched_with_names()
-        test.classifiers = [cookbook]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        cookbook = COOKBOOK()
+        cookbook.add_matched_with_names()
+        return [cookbook]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -1123,12 +1197,15 @@ class HipBusBandwidth(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        utils = UTILS()
-        utils.add_matched_with_names()
-        test.classifiers = [utils]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        utils = UTILS()
+        utils.add_matched_with_names()
+        return [utils]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -1168,12 +1245,15 @@ class HipCommander(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        utils = UTILS()
-        utils.add_matched_with_names()
-        test.classifiers = [utils]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        utils = UTILS()
+        utils.add_matched_with_names()
+        return [utils]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -1213,12 +1293,15 @@ class HipDispatchLatency(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        utils = UTILS()
-        utils.add_matched_with_names()
-        test.classifiers = [utils]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        utils = UTILS()
+        utils.add_matched_with_names()
+        return [utils]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -1258,12 +1341,15 @@ class HipInfo(Tester, PrepareTest, LogParser):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        utils = UTILS()
-        utils.add_matched_with_names()
-        test.classifiers = [utils]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        utils = UTILS()
+        utils.add_matched_with_names()
+        return [utils]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -21,6 +21,9 @@
 import os
 import tempfile
 from hiptestsuite.common.hip_shell import *
+from hiptestsuite.common.hip_build_dirs import get_build_dir
+from hiptestsuite.common.hip_patches import apply_patches
+from hiptestsuite.common.hip_get_packages import read_git_head
 from hiptestsuite.applications.hip_samples.hip_samples_build_common import BuildRunCommon
 
 class BuildRunNvidia(BuildRunCommon):
@@ -37,11 +40,11 @@ class BuildRunNvidia(BuildRunCommon):
         return envtoset
 
     def applypatch(self): # To be deleted
-        if not os.path.isfile(\
-        os.path.join(self.hippath, "patched")):
-            cmd = "cd " + self.hippath + ";"
-            cmd += "patch -p0 < ../../applications/hip_samples/Samples_Patch_4.2.x; touch patched;"
-            execshellcmd(cmd, self.logfile, None)
+        # Samples are patched in the build dir, the HIP clone stays untouched
+        # The copied samples come from the HIP commit checked out in the clone
+        return apply_patches(self.logfile, get_build_dir(self.hippath),\
+        [os.path.join(self.hippath, "../../applications/hip_samples/Samples_Patch_4.2.x")],\
+        strip=0, base=read_git_head(self.hippath))
 
     def buildtest(self, target):
         # In this function put the build steps for test cases
@@ -53,6 +56,7 @@ class BuildRunNvidia(BuildRunCommon):
         # Apply Patch. This is temporary and will be removed once Hip Samples changes
         # are available in HIP public repository.
         envtoset = self.getenvironmentvariables()
-        self.applypatch()
+        if not self.applypatch():
+            return False
         ret = BuildRunCommon.buildtest(self, target, envtoset)
         return ret
@@ -25,12 +25,18 @@ from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.applications.hpc_apps.gridtools.gridtools_build_amd import BuildRunAmd
 from hiptestsuite.applications.hpc_apps.gridtools.gridtools_build_nvidia import BuildRunNvidia
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import run_build, is_run_only
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
 from hiptestsuite.common.hip_shell import execshellcmd
+from hiptestsuite.common.hip_downloads import fetch_file
 
 import os
 import re
 # Common class to clone, set up, build and run test
 class PrepareTest():
+    # cfg.repos keys pulled by this test, prefetched by TestersExecutor
+    required_repos = ["gridtools", "gtbench"]
+
     def __init__(self, cwd):
         self.cwdAbs = cwd
         self.app_path = os.path.join(self.cwdAbs,\
@@ -68,6 +74,13 @@ class PrepareTest():
             self.gtbenchcommitId = test_data.repos["gtbench"].commit_id
         return validrepconfig
 
+    # boost_1_72_0.tar.bz2 is copied in manually or fetched through the download cache
+    def get_boost_package(self):
+        boost_package = os.path.join(self.thistestpath, "boost_1_72_0.tar.bz2")
+        if os.path.isfile(boost_package):
+            return True
+        return fetch_file(None, "boost_1_72_0.tar.bz2", boost_package)
+
     def downloadtest(self, logFile, test_data: HIPTestData):
         ret = True
         ret = ret & HipPackages().pull_repo(logFile, self.gridtoolsrepo,\
@@ -85,16 +98,23 @@ class PrepareTest():
         else:
             print("Invalid Platform")
             return False
-        buildstatus = self.prepareobj.buildtest()
+        # Builds are serialized on the app dir, the repos are only kept from being re-cloned
+        with exclusive_lock(self.thistestpath),\
+        shared_lock(os.path.join(self.thistestpath, "GridTools/gridtools")),\
+        shared_lock(os.path.join(self.thistestpath, "GridTools/gtbench")):
+            buildstatus = run_build(self.prepareobj.buildtest,\
+            [os.path.join(self.thistestpath, "GridTools/gtbench/build")])
         return buildstatus
 
     def clean(self):
         if self.prepareobj != None:
-            self.prepareobj.clean()
+            with exclusive_lock(self.thistestpath):
+                self.prepareobj.clean()
 
     def runtest(self, testnum):
         if self.prepareobj != None:
-            self.prepareobj.runtest(testnum)
+            with shared_lock(self.thistestpath):
+                self.prepareobj.runtest(testnum)
 
     def parse_result(self, testnum):
         if self.prepareobj != None:
@@ -125,21 +145,23 @@ class GRIDTOOLSCONVG(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = PERFORMANCE()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = PERFORMANCE()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
     def test(self, test_data: HIPTestData):
         print("=============== Gridtool Convergence Test ===============")
         # Check if Boost package exists
-        if not os.path.isfile(\
-        os.path.join(self.thistestpath, "boost_1_72_0.tar.bz2")):
-            print("Boost Package boost_1_72_0.tar.bz2 not available under src/hiptestsuite/applications/hpc_apps/gridtools/.")
+        if not is_run_only() and not self.get_boost_package():
+            print("Boost Package boost_1_72_0.tar.bz2 not available under src/hiptestsuite/applications/hpc_apps/gridtools/ and its download failed.")
             print("Please download and copy Boost package in src/hiptestsuite/applications/hpc_apps/gridtools folder.")
             test_data.test_result = TestResult.ERROR
             return
@@ -184,21 +206,23 @@ class GRIDTOOLSPERF(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = PERFORMANCE()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = PERFORMANCE()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
     def test(self, test_data: HIPTestData):
         print("=============== Gridtool Perf Test ===============")
         # Check if Boost package exists
-        if not os.path.isfile(\
-        os.path.join(self.thistestpath, "boost_1_72_0.tar.bz2")):
-            print("Boost Package boost_1_72_0.tar.bz2 not available under src/hiptestsuite/applications/hpc_apps/gridtools/.")
+        if not is_run_only() and not self.get_boost_package():
+            print("Boost Package boost_1_72_0.tar.bz2 not available under src/hiptestsuite/applications/hpc_apps/gridtools/ and its download failed.")
             print("Please download and copy Boost package in src/hiptestsuite/applications/hpc_apps/gridtools folder.")
             test_data.test_result = TestResult.ERROR
             return
@@ -21,6 +21,8 @@
 import os
 import tempfile
 from hiptestsuite.common.hip_shell import *
+from hiptestsuite.common.hip_build_graph import prerequisites
+from hiptestsuite.common.hip_patches import apply_patches
 from hiptestsuite.applications.hpc_apps.gridtools.gridtools_parser_common import GridtoolsParser
 
 class BuildRunNvidia():
@@ -45,51 +47,54 @@ class BuildRunNvidia():
         return env
 
     def buildtest(self):
-        if not os.path.exists(os.path.join(self.thistestpath, "boost_1_72_0")):
-            print("Building and Installing Boost..")
-            cmdexc = self.setenv()
-            cmdexc += "cd $GT_TREE_DIR;"
-            cmdexc += "tar -xvjf ../boost_1_72_0.tar.bz2;cd $BOOST_TREE_DIR;"
-            cmdexc += "./bootstrap.sh --prefix=$BOOST_INSTALL_DIR --with-python=python3;"
-            cmdexc += "./b2 install -j8 threading=multi link=shared;"
-            runlogdump = tempfile.TemporaryFile("w+")
-            execshellcmd_largedump(cmdexc, self.logFile, runlogdump, None)
-            runlogdump.close()
-        else:
-            print("Boost already installed..")
-        # Build Gridtools
-        if not os.path.exists(os.path.join(self.thistestpath, "GridTools/gridtools/build")):
-            print("Building and Installing GridTools..")
-            cmdexc = self.setenv()
-            cmdexc += "export CXX=/opt/rocm/bin/hipcc;"
-            cmdexc += "cd $GT_TREE_DIR;cd $GRIDTOOLS_TREE_DIR;git apply ../../gridtools.patch;mkdir -p $GRIDTOOLS_BUILD_DIR;cd $GRIDTOOLS_BUILD_DIR;"
-            cmdexc += "CXX=/opt/rocm/bin/hipcc cmake .. -DBUILD_TESTING=OFF -DBoost_INCLUDE_DIR=$BOOST_INSTALL_DIR/include " +\
-            "-DGT_CUDA_COMPILATION_TYPE=$GT_CUDA_COMPILATION_TYPE -DGT_CUDA_ARCH=" + self.cuda_target + " " +\
-            "-DGT_ENABLE_BACKEND_CUDA=ON -DGT_ENABLE_BACKEND_MC=OFF -DGT_ENABLE_BACKEND_X86=OFF -DGT_ENABLE_BACKEND_NAIVE=OFF " +\
-            "-DGT_USE_MPI=OFF -DCMAKE_BUILD_TYPE=Release -DCMAKE_INSTALL_PREFIX=$GRIDTOOLS_INSTALL_DIR;"
-            cmdexc += "make -j;"
-            cmdexc += "make install;"
-            runlogdump = tempfile.TemporaryFile("w+")
-            execshellcmd_largedump(cmdexc, self.logFile, runlogdump, None)
-            runlogdump.close()
-        else:
-            print("GridTools already built..")
+        # Boost, GridTools and Gtbench are built in order through the prerequisites graph
+        return prerequisites.build(["gtbench"], self, fingerprint=self.cuda_target)
 
-        # Build Gtbench
-        if not os.path.exists(os.path.join(self.thistestpath, "GridTools/gtbench/build")):
-            print("Building and Installing Gtbench..")
-            cmdexc = self.setenv()
-            cmdexc += "export CXX=/opt/rocm/bin/hipcc;"
-            cmdexc += "cd $GT_TREE_DIR;cd $GTBENCH_TREE_DIR;git apply ../../gtbench.patch;mkdir -p $GTBENCH_BUILD_DIR;cd $GTBENCH_BUILD_DIR;"
-            cmdexc += "CXX=/opt/rocm/bin/hipcc cmake .. -DGridTools_DIR=$GRIDTOOLS_INSTALL_DIR/lib/cmake -DGTBENCH_BACKEND=cuda " +\
-            "-DGTBENCH_RUNTIME=single_node -DCMAKE_CXX_FLAGS=--expt-relaxed-constexpr -DBoost_INCLUDE_DIR=$BOOST_INSTALL_DIR/include;"
-            cmdexc += "make CFLAGS=--expt-relaxed-constexpr CXXFLAGS=--expt-relaxed-constexpr -j8;"
-            runlogdump = tempfile.TemporaryFile("w+")
-            execshellcmd_largedump(cmdexc, self.logFile, runlogdump, None)
-            runlogdump.close()
-        else:
-            print("Gtbench already built..")
- 
+    def build_boost(self):
+        print("Building and Installing Boost..")
+        cmdexc = self.setenv()
+        cmdexc += "cd $GT_TREE_DIR;"
+        cmdexc += "tar -xvjf ../boost_1_72_0.tar.bz2;cd $BOOST_TREE_DIR;"
+        cmdexc += "./bootstrap.sh --prefix=$BOOST_INSTALL_DIR --with-python=python3;"
+        cmdexc += "./b2 install -j8 threading=multi link=shared;"
+        runlogdump = tempfile.TemporaryFile("w+")
+        execshellcmd_largedump(cmdexc, self.logFile, runlogdump, None)
+        runlogdump.close()
+        return True
+
+    def build_gridtools(self):
+        print("Building and Installing GridTools..")
+        if not apply_patches(self.logFile, os.path.join(self.thistestpath, "GridTools/gridtools"),\
+        [os.path.join(self.thistestpath, "gridtools.patch")]):
+            return False
+        cmdexc = self.setenv()
+        cmdexc += "export CXX=/opt/rocm/bin/hipcc;"
+        cmdexc += "cd $GT_TREE_DIR;cd $GRIDTOOLS_TREE_DIR;mkdir -p $GRIDTOOLS_BUILD_DIR;cd $GRIDTOOLS_BUILD_DIR;"
+        cmdexc += "CXX=/opt/rocm/bin/hipcc cmake .. -DBUILD_TESTING=OFF -DBoost_INCLUDE_DIR=$BOOST_INSTALL_DIR/include " +\
+        "-DGT_CUDA_COMPILATION_TYPE=$GT_CUDA_COMPILATION_TYPE -DGT_CUDA_ARCH=" + self.cuda_target + " " +\
+        "-DGT_ENABLE_BACKEND_CUDA=ON -DGT_ENABLE_BACKEND_MC=OFF -DGT_ENABLE_BACKEND_X86=OFF -DGT_ENABLE_BACKEND_NAIVE=OFF " +\
+        "-DGT_USE_MPI=OFF -DCMAKE_BUILD_TYPE=Release -DCMAKE_INSTALL_PREFIX=$GRIDTOOLS_INSTALL_DIR;"
+        cmdexc += "make -j;"
+        cmdexc += "make install;"
+        runlogdump = tempfile.TemporaryFile("w+")
+        execshellcmd_largedump(cmdexc, self.logFile, runlogdump, None)
+        runlogdump.close()
+        return True
+
+    def build_gtbench(self):
+        print("Building and Installing Gtbench..")
+        if not apply_patches(self.logFile, os.path.join(self.thistestpath, "GridTools/gtbench"),\
+        [os.path.join(self.thistestpath, "gtbench.patch")]):
+            return False
+        cmdexc = self.setenv()
+        cmdexc += "export CXX=/opt/rocm/bin/hipcc;"
+        cmdexc += "cd $GT_TREE_DIR;cd $GTBENCH_TREE_DIR;mkdir -p $GTBENCH_BUILD_DIR;cd $GTBENCH_BUILD_DIR;"
+        cmdexc += "CXX=/opt/rocm/bin/hipcc cmake .. -DGridTools_DIR=$GRIDTOOLS_INSTALL_DIR/lib/cmake -DGTBENCH_BACKEND=cuda " +\
+        "-DGTBENCH_RUNTIME=single_node -DCMAKE_CXX_FLAGS=--expt-relaxed-constexpr -DBoost_INCLUDE_DIR=$BOOST_INSTALL_DIR/include;"
+        cmdexc += "make CFLAGS=--expt-relaxed-constexpr CXXFLAGS=--expt-relaxed-constexpr -j8;"
+        runlogdump = tempfile.TemporaryFile("w+")
+        execshellcmd_largedump(cmdexc, self.logFile, runlogdump, None)
+        runlogdump.close()
         return True
 
     def runtest(self, testnum):
@@ -25,12 +25,17 @@ from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.applications.hpc_apps.laghos.laghos_build_amd import BuildRunAmd
 from hiptestsuite.applications.hpc_apps.laghos.laghos_build_nvidia import BuildRunNvidia
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import run_build
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
 from hiptestsuite.common.hip_shell import execshellcmd
 
 import os
 import re
 # Common class to clone, set up, build and run test
 class PrepareTest():
+    # cfg.repos keys pulled by this test, prefetched by TestersExecutor
+    required_repos = ["mfem", "Laghos"]
+
     def __init__(self, cwd):
         self.cwdAbs = cwd
         self.app_path = os.path.join(self.cwdAbs,\
@@ -83,7 +88,12 @@ class PrepareTest():
         else:
             print("Invalid Platform")
             return False
-        buildstatus = self.prepareobj.buildtest()
+        # Builds are serialized on the app dir, the repos are only kept from being re-cloned
+        with exclusive_lock(self.thistestpath),\
+        shared_lock(os.path.join(self.thistestpath, "mfem")),\
+        shared_lock(os.path.join(self.thistestpath, "Laghos")):
+            buildstatus = run_build(self.prepareobj.buildtest,\
+            [os.path.join(self.thistestpath, "Laghos/laghos")])
         if buildstatus == False:
             return False
 
@@ -91,11 +101,13 @@ class PrepareTest():
 
     def clean(self):
         if self.prepareobj != None:
-            self.prepareobj.clean()
+            with exclusive_lock(self.thistestpath):
+                self.prepareobj.clean()
 
     def runtest(self, testnum):
         if self.prepareobj != None:
-            self.prepareobj.runtest(testnum)
+            with shared_lock(self.thistestpath):
+                self.prepareobj.runtest(testnum)
 
     def parse_result(self, testnum):
         if self.prepareobj != None:
@@ -126,12 +138,15 @@ class LAGHOS_CUBE01_HEX(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = PERFORMANCE()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = PERFORMANCE()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -170,12 +185,15 @@ class LAGHOS_CUBE_12_HEX(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = PERFORMANCE()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = PERFORMANCE()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
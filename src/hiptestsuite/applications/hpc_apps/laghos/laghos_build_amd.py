@@ -22,6 +22,8 @@ import os
 import re
 import tempfile
 from hiptestsuite.common.hip_shell import *
+from hiptestsuite.common.hip_build_graph import prerequisites
+from hiptestsuite.common.hip_downloads import fetch_file
 from hiptestsuite.applications.hpc_apps.laghos.laghos_parser_common import LaghosParser
 
 class BuildRunAmd():
@@ -49,10 +51,12 @@ class BuildRunAmd():
             print("Openmpi backend is not installed under /usr/local/. Exiting Test!")
             return False
 
+        if not fetch_file(self.logFile, "hypre-2.16.0.tar.gz", os.path.join(self.thistestpath, "hypre-2.16.0.tar.gz")):
+            print("Hypre download failed")
+            return False
         cmd = self.set_env()
         cmd += "cd " + self.thistestpath + ";"
-        cmd += "wget https://github.com/hypre-space/hypre/archive/v2.16.0.tar.gz;"
-        cmd += "mv v2.16.0.tar.gz hypre-2.16.0.tar.gz;tar -zxvf hypre-2.16.0.tar.gz;rm hypre-2.16.0.tar.gz;"
+        cmd += "tar -zxvf hypre-2.16.0.tar.gz;rm hypre-2.16.0.tar.gz;"
         cmd += "cd hypre-2.16.0/src/;"
         cmd += "./configure --disable-fortran --enable-bigint --with-MPI --with-MPI-include=${MPI_PATH}/include --with-MPI-lib-dirs=${MPI_PATH}/lib;"
         cmd += "make -j; cd ../..; ln -s hypre-2.16.0 hypre;"
@@ -69,9 +73,11 @@ class BuildRunAmd():
             print("Metis already built")
             return True
         print("Metis build in progress ..")
+        if not fetch_file(self.logFile, "metis-4.0.3.tar.gz", os.path.join(self.thistestpath, "metis-4.0.3.tar.gz")):
+            print("Metis download failed")
+            return False
         cmd = self.set_env()
         cmd += "cd " + self.thistestpath + ";"
-        cmd += "wget http://glaros.dtc.umn.edu/gkhome/fetch/sw/metis/OLD/metis-4.0.3.tar.gz;"
         cmd += "tar -zxvf metis-4.0.3.tar.gz;rm metis-4.0.3.tar.gz;"
         cmd += "cd metis-4.0.3;make -j;cd ..;"
         cmd += "ln -s metis-4.0.3 metis-4.0;"
@@ -90,6 +96,8 @@ class BuildRunAmd():
         print("Mfem build in progress ..")
         cmd = self.set_env()
         cmd += "cd " + self.thistestpath + "; cd mfem;"
+        # Objects of a build for another target are not reused
+        cmd += "make clean;"
         cmd += "make config;"
         cmd += "make phip -j CXXFLAGS=\"-O3 -std=c++11 --gpu-max-threads-per-block=256\" \
         MFEM_TPLFLAGS=\"-I./../hypre/src/hypre/include -I${MPI_PATH}/include\" MFEM_EXT_LIBS=\"-L./../hypre/src/hypre/lib \
@@ -109,11 +117,11 @@ class BuildRunAmd():
         print("Laghos build in progress ..")
         cmd = self.set_env()
         cmd += "cd " + self.thistestpath + "; cd Laghos;"
-        cmd += "make -j;"
+        cmd += "make clean;make -j;"
         runlogdump = tempfile.TemporaryFile("w+")
         execshellcmd_largedump(cmd, self.logFile, runlogdump, None)
         runlogdump.close()
-        if not os.path.exists(os.path.join(self.thistestpath, "mfem/libmfem.a")):
+        if not os.path.exists(os.path.join(self.thistestpath, "Laghos/laghos")):
             print("Laghos Build Failed")
             return False
         return True
@@ -130,16 +138,9 @@ class BuildRunAmd():
             print("Openmpi not installed. Exiting test!")
             return False
 
-        if not self.configure_build_hypre():
-            print("Hypre configuration and build failed ..")
-            return False
-        if not self.configure_build_metis():
-            print("Metis configuration and build failed ..")
-            return False
-        if not self.configure_build_mfem():
-            print("Mfem configuration and build failed ..")
-            return False
-        if not self.configure_build_laghos():
+        # hypre and metis are built concurrently, then mfem and Laghos, all
+        # of them again when the GPU architecture changes
+        if not prerequisites.build(["laghos"], self, fingerprint=get_gpuarch(self.logFile)):
             print("Laghos configuration and build failed ..")
             return False
 
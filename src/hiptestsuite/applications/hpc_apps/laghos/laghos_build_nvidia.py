@@ -22,6 +22,9 @@ import os
 import re
 import tempfile
 from hiptestsuite.common.hip_shell import *
+from hiptestsuite.common.hip_build_graph import prerequisites
+from hiptestsuite.common.hip_downloads import fetch_file
+from hiptestsuite.common.hip_patches import apply_patches
 from hiptestsuite.applications.hpc_apps.laghos.laghos_parser_common import LaghosParser
 
 class BuildRunNvidia():
@@ -45,10 +48,12 @@ class BuildRunNvidia():
             print("Hypre already built")
             return True
         print("Hypre build in progress ..")
+        if not fetch_file(self.logFile, "hypre-2.16.0.tar.gz", os.path.join(self.thistestpath, "hypre-2.16.0.tar.gz")):
+            print("Hypre download failed")
+            return False
         cmd = self.set_env()
         cmd += "cd " + self.thistestpath + ";"
-        cmd += "wget https://github.com/hypre-space/hypre/archive/v2.16.0.tar.gz;"
-        cmd += "mv v2.16.0.tar.gz hypre-2.16.0.tar.gz;tar -zxvf hypre-2.16.0.tar.gz;rm hypre-2.16.0.tar.gz;"
+        cmd += "tar -zxvf hypre-2.16.0.tar.gz;rm hypre-2.16.0.tar.gz;"
         cmd += "cd hypre-2.16.0/src/;"
         cmd += "./configure --disable-fortran --enable-bigint --with-MPI --with-MPI-include=${MPI_PATH}/include --with-MPI-lib-dirs=${MPI_PATH}/lib;"
         cmd += "make -j; cd ../..; ln -s hypre-2.16.0 hypre;"
@@ -65,9 +70,11 @@ class BuildRunNvidia():
             print("Metis already built")
             return True
         print("Metis build in progress ..")
+        if not fetch_file(self.logFile, "metis-4.0.3.tar.gz", os.path.join(self.thistestpath, "metis-4.0.3.tar.gz")):
+            print("Metis download failed")
+            return False
         cmd = self.set_env()
         cmd += "cd " + self.thistestpath + ";"
-        cmd += "wget http://glaros.dtc.umn.edu/gkhome/fetch/sw/metis/OLD/metis-4.0.3.tar.gz;"
         cmd += "tar -zxvf metis-4.0.3.tar.gz;rm metis-4.0.3.tar.gz;"
         cmd += "cd metis-4.0.3;make -j;cd ..;"
         cmd += "ln -s metis-4.0.3 metis-4.0;"
@@ -84,10 +91,13 @@ class BuildRunNvidia():
             print("Mfem already built")
             return True
         print("Mfem build in progress ..")
+        if not apply_patches(self.logFile, os.path.join(self.thistestpath, "mfem"),\
+        [os.path.join(self.thistestpath, "hip_on_nvcc.patch")]):
+            return False
         cmd = self.set_env()
         cmd += "cd " + self.thistestpath + "; cd mfem;"
-        if not os.path.isfile(os.path.join(self.thistestpath, "mfem/patched")):
-            cmd += "git apply ../hip_on_nvcc.patch; touch patched;"
+        # Objects of a build for another target are not reused
+        cmd += "make clean;"
         cmd += "make  phip CXXFLAGS=\"-std=c++11 -x=cu --extended-lambda -arch=" + self.cuda_target + " -O3 -g -I/opt/rocm/include\" MFEM_TPLFLAGS=\"-I./../hypre/src/hypre/include -I${MPI_PATH}/include\" MFEM_EXT_LIBS=\"-L./../hypre/src/hypre/lib -lHYPRE -L./../metis-4.0 -lmetis  -lrt -L${MPI_PATH}/lib -lmpi\" -j;"
         runlogdump = tempfile.TemporaryFile("w+")
         execshellcmd_largedump(cmd, self.logFile, runlogdump, None)
@@ -102,15 +112,16 @@ class BuildRunNvidia():
             print("Laghos already built")
             return True
         print("Laghos build in progress ..")
+        if not apply_patches(self.logFile, os.path.join(self.thistestpath, "Laghos"),\
+        [os.path.join(self.thistestpath, "laghos-multinode.patch")]):
+            return False
         cmd = self.set_env()
         cmd += "cd " + self.thistestpath + "; cd Laghos;"
-        if not os.path.isfile(os.path.join(self.thistestpath, "Laghos/patched")):
-            cmd += "git apply ../laghos-multinode.patch; touch patched;"
-        cmd += "make -j;"
+        cmd += "make clean;make -j;"
         runlogdump = tempfile.TemporaryFile("w+")
         execshellcmd_largedump(cmd, self.logFile, runlogdump, None)
         runlogdump.close()
-        if not os.path.exists(os.path.join(self.thistestpath, "mfem/libmfem.a")):
+        if not os.path.exists(os.path.join(self.thistestpath, "Laghos/laghos")):
             print("Laghos Build Failed")
             return False
         return True
@@ -131,16 +142,9 @@ class BuildRunNvidia():
             print("Rocm backend is not installed under /opt/. Exiting Test!")
             return False
 
-        if not self.configure_build_hypre():
-            print("Hypre configuration and build failed ..")
-            return False
-        if not self.configure_build_metis():
-            print("Metis configuration and build failed ..")
-            return False
-        if not self.configure_build_mfem():
-            print("Mfem configuration and build failed ..")
-            return False
-        if not self.configure_build_laghos():
+        # hypre and metis are built concurrently, then mfem and Laghos, all
+        # of them again when the cuda target changes
+        if not prerequisites.build(["laghos"], self, fingerprint=self.cuda_target):
             print("Laghos configuration and build failed ..")
             return False
 
@@ -25,12 +25,17 @@ from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.applications.hpc_apps.quicksilver.quicksilver_build_amd import BuildRunAmd
 from hiptestsuite.applications.hpc_apps.quicksilver.quicksilver_build_nvidia import BuildRunNvidia
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import run_build
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
 from hiptestsuite.common.hip_shell import execshellcmd
 
 import os
 import re
 # Common class to clone, set up, build and run test
 class PrepareTest():
+    # cfg.repos keys pulled by this test, prefetched by TestersExecutor
+    required_repos = ["quicksilver"]
+
     def __init__(self, cwd, binary):
         self.cwdAbs = cwd
         self.binary = binary
@@ -71,7 +76,9 @@ class PrepareTest():
             print("Invalid Platform")
             return False
 
-        buildstatus = self.prepareobj.buildtest()
+        with exclusive_lock(self.thistestpath):
+            buildstatus = run_build(self.prepareobj.buildtest,\
+            [os.path.join(self.thistestpath, "src", self.binary)])
         if buildstatus == False:
             return False
         # Check if test binary is created
@@ -83,11 +90,13 @@ class PrepareTest():
 
     def clean(self):
         if self.prepareobj != None:
-            self.prepareobj.clean()
+            with exclusive_lock(self.thistestpath):
+                self.prepareobj.clean()
 
     def runtest(self):
         if self.prepareobj != None:
-            self.prepareobj.runtest()
+            with shared_lock(self.thistestpath):
+                self.prepareobj.runtest()
 
     def parse_result(self):
         if self.prepareobj != None:
@@ -119,12 +128,15 @@ class QUICKSILVERTEST(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = PERFORMANCE()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = PERFORMANCE()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         PrepareTest.clean(self)
 
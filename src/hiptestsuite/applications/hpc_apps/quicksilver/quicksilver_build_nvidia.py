@@ -21,6 +21,7 @@
 import tempfile
 import os
 from hiptestsuite.common.hip_shell import execshellcmd_largedump, execshellcmd
+from hiptestsuite.common.hip_patches import apply_patches
 from hiptestsuite.applications.hpc_apps.quicksilver.quicksilver_parser_common import QuicksilverParser
 
 class BuildRunNvidia():
@@ -48,11 +49,11 @@ class BuildRunNvidia():
         env = "export ROCM_PATH=/opt/rocm;export MPIPATH=/usr/local/openmpi;export CUDA_PATH=/usr/local/cuda;export HIP_PLATFORM=nvidia;"
         testpath = os.path.join(self.thistestpath, "src/")
         cmdcd = "cd " + testpath + ";"
-        cmd_modify = ""
-        if not os.path.isfile(os.path.join(testpath, "patched")):
-            cmd_modify = "patch -p0 < ../../qs_diff_patch_nvidia; touch patched;"
+        if not apply_patches(self.logFile, testpath,\
+        [os.path.join(self.thistestpath, "../qs_diff_patch_nvidia")], strip=0):
+            return False
         cmd_build = "CUDA_ARCH=" + self.cuda_arch + " make -j;"
-        cmdexc = env + cmdcd + cmd_modify + cmd_build
+        cmdexc = env + cmdcd + cmd_build
         runlogdump = tempfile.TemporaryFile("w+")
         execshellcmd_largedump(cmdexc, self.logFile, runlogdump, None)
         runlogdump.close()
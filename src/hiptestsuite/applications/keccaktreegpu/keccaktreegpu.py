@@ -25,6 +25,8 @@ from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.applications.keccaktreegpu.keccaktreegpu_build_amd import BuildRunAmd
 from hiptestsuite.applications.keccaktreegpu.keccaktreegpu_build_nvidia import BuildRunNvidia
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import run_build
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
 from hiptestsuite.common.hip_shell import execshellcmd
 
 import os
@@ -48,7 +50,9 @@ class PrepareTest():
         else:
             print("Invalid Platform")
             return False
-        self.prepareobj.buildtest()
+        with exclusive_lock(self.thistestpath):
+            run_build(self.prepareobj.buildtest,\
+            [os.path.join(self.thistestpath, self.binary)])
 
         if not os.path.isfile(\
         os.path.join(self.thistestpath, self.binary)):
@@ -57,11 +61,13 @@ class PrepareTest():
 
     def clean(self):
         if self.prepareobj != None:
-            self.prepareobj.clean()
+            with exclusive_lock(self.thistestpath):
+                self.prepareobj.clean()
 
     def runtest(self):
         if self.prepareobj != None:
-            self.prepareobj.runtest()
+            with shared_lock(self.thistestpath):
+                self.prepareobj.runtest()
 
     def parse_result(self):
         if self.prepareobj != None:
@@ -93,12 +99,15 @@ class keccaktreetest(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        perf = PERFORMANCE()
-        perf.add_matched_with_names()
-        test.classifiers = [perf]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        perf = PERFORMANCE()
+        perf.add_matched_with_names()
+        return [perf]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -25,12 +25,17 @@ from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.applications.mgbench.mgbench_build_amd import BuildRunAmd
 from hiptestsuite.applications.mgbench.mgbench_build_nvidia import BuildRunNvidia
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import run_build
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
 from hiptestsuite.common.hip_shell import execshellcmd
 
 import os
 import re
 # Common class to clone, set up, build and run test
 class PrepareTest():
+    # cfg.repos keys pulled by this test, prefetched by TestersExecutor
+    required_repos = ["mgbench"]
+
     def __init__(self, cwd, testpath, mgtestfile, binary):
         self.cwdAbs = cwd
         self.mgtestfile = mgtestfile
@@ -70,7 +75,9 @@ class PrepareTest():
         else:
             print("Invalid Platform")
             return False
-        buildstatus = self.prepareobj.buildtest()
+        with exclusive_lock(self.thistestpath):
+            buildstatus = run_build(self.prepareobj.buildtest,\
+            [os.path.join(self.thistestpath, self.binary)])
         if buildstatus == False:
             return False
         # Check if test binary is created
@@ -81,11 +88,13 @@ class PrepareTest():
 
     def clean(self):
         if self.prepareobj != None:
-            self.prepareobj.clean()
+            with exclusive_lock(self.thistestpath):
+                self.prepareobj.clean()
 
     def runtest(self):
         if self.prepareobj != None:
-            self.prepareobj.runtest()
+            with shared_lock(self.thistestpath):
+                self.prepareobj.runtest()
 
     def parse_result(self, test):
         if self.prepareobj != None:
@@ -117,12 +126,15 @@ class mgbench_fullduplex(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        perf = PERFORMANCE()
-        perf.add_matched_with_names()
-        test.classifiers = [perf]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        perf = PERFORMANCE()
+        perf.add_matched_with_names()
+        return [perf]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -162,12 +174,15 @@ class mgbench_halfduplex(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        perf = PERFORMANCE()
-        perf.add_matched_with_names()
-        test.classifiers = [perf]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        perf = PERFORMANCE()
+        perf.add_matched_with_names()
+        return [perf]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -207,12 +222,15 @@ class mgbench_uva(Tester, PrepareTest):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        perf = PERFORMANCE()
-        perf.add_matched_with_names()
-        test.classifiers = [perf]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        perf = PERFORMANCE()
+        perf.add_matched_with_names()
+        return [perf]
+
     def clean(self):
         PrepareTest.clean(self)
 
@@ -21,6 +21,8 @@
 import os
 import tempfile
 from hiptestsuite.common.hip_shell import *
+from hiptestsuite.common.hip_compiler_cache import get_hipcc
+from hiptestsuite.common.hip_build_graph import prerequisites
 from hiptestsuite.applications.mgbench.mgbench_parser_common import MgbenchParser
 
 class BuildRunAmd():
@@ -40,25 +42,28 @@ class BuildRunAmd():
             print("ROCm not installed. Exiting!")
             return False
         print("Building mgbench..")
-        depfolder = os.path.join(self.app_root, "deps/gflags/")
-        cmdcd = "cd " + depfolder + ";"
-        cmdbuild = "cmake .; make clean; make;"
-        cmdexcdep = cmdcd + cmdbuild
-        execshellcmd(cmdexcdep, self.logFile, None)
-        if not os.path.isfile(depfolder + "lib/libgflags.a"):
+        if not prerequisites.build(["gflags"], self):
             print("Dependency (gflags) build failed")
             return False
         # Build Test
         mgtestfile_hipified = "hip_" + self.mgtestfile
         cmdcd = "cd " + self.thistestpath + ";"
         cmd_hipify = "/opt/rocm/bin/hipify-perl " + self.mgtestfile + ">> " + mgtestfile_hipified + ";"
-        cmd_build = "/opt/rocm/bin/hipcc " + mgtestfile_hipified +\
+        cmd_build = get_hipcc() + " " + mgtestfile_hipified +\
         " -lgflags -L../../deps/gflags/lib/ -I ../../deps/gflags/include/ -o " + self.binary + ";"
         cmd_clean = "rm -f " + mgtestfile_hipified + ";"
         cmdexc = cmdcd + cmd_hipify + cmd_build + cmd_clean
         execshellcmd(cmdexc, self.logFile, None)
         return True
 
+    def build_gflags(self):
+        depfolder = os.path.join(self.app_root, "deps/gflags/")
+        cmdcd = "cd " + depfolder + ";"
+        cmdbuild = "cmake .; make clean; make;"
+        cmdexcdep = cmdcd + cmdbuild
+        execshellcmd(cmdexcdep, self.logFile, None)
+        return os.path.isfile(depfolder + "lib/libgflags.a")
+
     def runtest(self):
         print("Running mgbench..")
         cmdexc = "cd " + self.thistestpath + ";" + "./" + self.binary + ";"
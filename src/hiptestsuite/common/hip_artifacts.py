@@ -0,0 +1,191 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_build_graph import prerequisites
+from hiptestsuite.common.hip_build_dirs import get_build_root
+from hiptestsuite.common.hip_shell import execshellcmd
+
+import json
+import os
+import tarfile
+
+MANIFEST_NAME = "artifacts.json"
+
+def get_compiler_version(config):
+    rocm_path = config.ROCM_PATH if config.ROCM_PATH else "/opt/rocm"
+    hipcc = os.path.join(rocm_path, "bin/hipcc")
+    if not os.path.isfile(hipcc):
+        return None
+    version = execshellcmd(hipcc + " --version", None, None).strip()
+    return version if version else None
+
+
+# Prebuilt artifacts are only reusable on nodes with the same key
+def get_artifact_key(config):
+    platform = config.HIP_PLATFORM if config.HIP_PLATFORM else "amd"
+    if platform == "nvidia":
+        offload_arch = config.build_for_cuda_target
+    else:
+        offload_arch = config.build_for_gfx_target
+    repos = dict()
+    for repo_key, repo_detail in config.repos.items():
+        repos[repo_key] = repo_detail.get("commit_id")
+    key = dict()
+    key["platform"] = platform
+    key["offload_arch"] = offload_arch
+    key["compiler_version"] = get_compiler_version(config)
+    key["repos"] = repos
+    return key
+
+
+# Paths relative to the testsuite root which make up the built state
+def get_artifact_paths():
+    root = os.getcwd()
+    paths = list()
+    for repo_path in HipPackages().get_repo_paths().values():
+        if os.path.isdir(repo_path):
+            paths.append(os.path.relpath(repo_path, root))
+    if os.path.isdir(os.path.join(root, get_build_root())):
+        paths.append(get_build_root())
+    for node in prerequisites.nodes.values():
+        for clean_path in node.clean_paths:
+            clean_path = os.path.relpath(prerequisites.abspath(clean_path), root)
+            if os.path.lexists(os.path.join(root, clean_path)) and\
+            not any(clean_path.startswith(path + "/") for path in paths):
+                paths.append(clean_path)
+    if os.path.isdir(prerequisites.stamp_dir()):
+        paths.append(os.path.relpath(prerequisites.stamp_dir(), root))
+    return paths
+
+
+def tar_mode(tar_path, mode):
+    if tar_path.endswith(".gz") or tar_path.endswith(".tgz"):
+        return mode + ":gz"
+    if tar_path.endswith(".bz2"):
+        return mode + ":bz2"
+    if tar_path.endswith(".xz"):
+        return mode + ":xz"
+    return mode
+
+
+def export_artifacts(tar_path, config):
+    key = get_artifact_key(config)
+    paths = get_artifact_paths()
+    manifest = dict()
+    manifest["key"] = key
+    manifest["paths"] = paths
+    manifest_file = os.path.join(prerequisites.root(), "build", MANIFEST_NAME)
+    os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f, indent=4)
+    print("Exporting artifacts to " + tar_path)
+    with tarfile.open(tar_path, tar_mode(tar_path, "w")) as tar:
+        tar.add(manifest_file, arcname=MANIFEST_NAME)
+        for path in paths:
+            print("Adding " + path)
+            tar.add(os.path.join(prerequisites.root(), path), arcname=path)
+    os.remove(manifest_file)
+    return True
+
+
+# Bundle paths must stay below the testsuite root, including where links point to
+def is_safe_path(path):
+    path = os.path.normpath(path)
+    return not os.path.isabs(path) and path != ".." and not path.startswith("../")
+
+
+def is_safe_member(member):
+    if not is_safe_path(member.name):
+        return False
+    if member.issym():
+        return is_safe_path(os.path.join(os.path.dirname(member.name), member.linkname))
+    if member.islnk():
+        # Hard link names are relative to the root of the bundle
+        return is_safe_path(member.linkname)
+    return member.isfile() or member.isdir()
+
+
+def import_artifacts(tar_path, config):
+    if not os.path.isfile(tar_path):
+        print("Artifact bundle " + tar_path + " not found")
+        return False
+    with tarfile.open(tar_path, tar_mode(tar_path, "r")) as tar:
+        try:
+            manifest = json.load(tar.extractfile(MANIFEST_NAME))
+        except KeyError:
+            print("Artifact bundle " + tar_path + " has no " + MANIFEST_NAME)
+            return False
+        key = get_artifact_key(config)
+        mismatches = [k for k in key if manifest["key"].get(k) != key[k]]
+        if mismatches:
+            print("Artifact bundle " + tar_path + " was built for a different " + ", ".join(mismatches))
+            for mismatch in mismatches:
+                print("  " + mismatch + ": bundle " + str(manifest["key"].get(mismatch)) + ", local " + str(key[mismatch]))
+            return False
+        members = list()
+        for member in tar.getmembers():
+            if member.name == MANIFEST_NAME:
+                continue
+            if not is_safe_member(member):
+                print("Skipping unsafe artifact path " + member.name)
+                continue
+            members.append(member)
+        print("Importing artifacts from " + tar_path)
+        if hasattr(tarfile, "data_filter"):
+            # Also drops setuid bits and the like where Python supports it
+            tar.extractall(path=prerequisites.root(), members=members, filter="data")
+        else:
+            tar.extractall(path=prerequisites.root(), members=members)
+    return True
+
+
+BUILD_MANIFEST_NAME = "build_manifest.json"
+
+# Manifest of the tests built in build only mode and the artifacts they run
+def write_build_manifest(manifest_path, config, tests):
+    root = prerequisites.root()
+    manifest = dict()
+    manifest["key"] = get_artifact_key(config)
+    manifest["tests"] = dict()
+    for test_name, artifacts in tests.items():
+        manifest["tests"][test_name] = [os.path.relpath(artifact, root) for artifact in artifacts]
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=4)
+    return True
+
+
+# Returns {test name: [absolute artifact paths]} or None
+def read_build_manifest(manifest_path, config):
+    if not os.path.isfile(manifest_path):
+        print("Build manifest " + manifest_path + " not found")
+        return None
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    key = get_artifact_key(config)
+    for k in key:
+        if manifest["key"].get(k) != key[k]:
+            print("Warning: Build manifest was written for " + k + " " + str(manifest["key"].get(k)) + ", local " + str(key[k]))
+    root = prerequisites.root()
+    tests = dict()
+    for test_name, artifacts in manifest["tests"].items():
+        tests[test_name] = [os.path.join(root, artifact) for artifact in artifacts]
+    return tests
@@ -0,0 +1,144 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.common.hip_locks import shared_lock
+
+import hashlib
+import json
+import os
+import shutil
+
+# Out of tree builds: every build configuration (platform, offload arch and
+# compile flags) gets its own build root under build/out/<key>. Build dirs
+# mirror the source paths below the testsuite root, sources are copied in
+# and the cloned repos are never written to by a build.
+
+BUILD_OUT_DIR = "build/out"
+
+
+# Run scoped build configuration, set from cfg by run.py/TestersExecutor
+class BuildConfiguration():
+    def __init__(self):
+        self.key = None
+        # (key, source dir) populated in this run
+        self.populated = set()
+
+
+build_configuration = BuildConfiguration()
+
+
+def get_build_key(config):
+    platform = config.HIP_PLATFORM if config.HIP_PLATFORM else "amd"
+    if platform == "nvidia":
+        offload_arch = config.build_for_cuda_target
+    else:
+        offload_arch = config.build_for_gfx_target
+    flags = dict()
+    flags["Optimization_Level"] = config.Optimization_Level
+    flags["includes_path"] = config.includes_path
+    flags["link_libs"] = config.link_libs
+    flags["link_libs_path"] = config.link_libs_path
+    flags_hash = hashlib.sha256(json.dumps(flags, sort_keys=True).encode()).hexdigest()
+    return platform + "-" + (offload_arch if offload_arch else "native") + "-" + flags_hash[:8]
+
+
+def set_build_configuration(config):
+    build_configuration.key = get_build_key(config)
+
+
+# Build root of the current configuration, relative to the testsuite root
+def get_build_root():
+    key = build_configuration.key if build_configuration.key else "default"
+    return os.path.join(BUILD_OUT_DIR, key)
+
+
+# Build dir of source_dir (absolute, below the testsuite root) in the current configuration
+def get_build_dir(source_dir):
+    root = os.getcwd()
+    build_dir = os.path.join(root, get_build_root(), os.path.relpath(source_dir, root))
+    if source_dir.endswith("/"):
+        build_dir += "/"
+    return build_dir
+
+
+# Files of the build dir copied from the source by the last populate_build_dir
+POPULATED_FILES = ".hiptestsuite_populated.json"
+
+
+def read_populated_files(build_dir):
+    populated_file = os.path.join(build_dir, POPULATED_FILES)
+    if not os.path.isfile(populated_file):
+        return set()
+    try:
+        with open(populated_file, "r") as f:
+            return set(json.load(f))
+    except ValueError:
+        return set()
+
+
+def write_populated_files(build_dir, files):
+    populated_file = os.path.join(build_dir, POPULATED_FILES)
+    with open(populated_file + "." + str(os.getpid()), "w") as f:
+        json.dump(sorted(files), f)
+    os.replace(populated_file + "." + str(os.getpid()), populated_file)
+
+
+# Copy source_dir into its build dir, files changed in the source since the
+# last copy are refreshed and files removed from the source are removed, build
+# outputs and locally patched files are kept
+def populate_build_dir(source_dir):
+    build_dir = get_build_dir(source_dir)
+    populated_key = (build_configuration.key, os.path.normpath(source_dir))
+    if populated_key in build_configuration.populated or not os.path.isdir(source_dir):
+        return build_dir
+    # The repo must not be re-cloned by another run.py process while it is copied
+    with shared_lock(source_dir):
+        copied = set()
+        for dirpath, dirnames, filenames in os.walk(source_dir):
+            dirnames[:] = [dirname for dirname in dirnames if dirname != ".git"]
+            target_dir = os.path.join(build_dir, os.path.relpath(dirpath, source_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            for filename in filenames:
+                src = os.path.join(dirpath, filename)
+                dst = os.path.join(target_dir, filename)
+                copied.add(os.path.normpath(os.path.relpath(dst, build_dir)))
+                if os.path.islink(src):
+                    if os.path.islink(dst) and os.readlink(dst) == os.readlink(src):
+                        continue
+                    if os.path.lexists(dst):
+                        os.remove(dst)
+                    os.symlink(os.readlink(src), dst)
+                elif not os.path.exists(dst) or os.stat(src).st_mtime > os.stat(dst).st_mtime:
+                    shutil.copy2(src, dst)
+        # Like rsync --delete, but build outputs were never copied and are kept
+        for removed in sorted(read_populated_files(build_dir) - copied):
+            path = os.path.join(build_dir, removed)
+            if os.path.lexists(path) and (os.path.islink(path) or not os.path.isdir(path)):
+                os.remove(path)
+            parent = os.path.dirname(removed)
+            while parent and not os.path.isdir(os.path.join(source_dir, parent)):
+                try:
+                    os.rmdir(os.path.join(build_dir, parent))
+                except OSError:
+                    break
+                parent = os.path.dirname(parent)
+        write_populated_files(build_dir, copied)
+    build_configuration.populated.add(populated_key)
+    return build_dir
@@ -0,0 +1,289 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.common.hip_get_packages import read_git_head
+from hiptestsuite.common.hip_build_dirs import build_configuration, get_build_root
+from hiptestsuite.common.hip_locks import exclusive_lock
+from hiptestsuite.common.hip_storage import mark_used
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import hashlib
+import os
+import shutil
+import threading
+
+# Build products shared between testers, e.g. Boost or hypre.
+# build:       name of the builder method producing this node, it returns True/False
+# deps:        nodes which must be built before this one
+# outputs:     paths (relative to testsuite root) which exist once the node is built
+# input_files: patches/tarballs whose change requires a rebuild
+# input_repos: git checkouts whose HEAD change requires a rebuild
+# clean_paths: paths removed when the node is cleaned or rebuilt
+# Paths starting with {build_root} are built per build configuration
+class BuildNode():
+    def __init__(self, name, build, deps=None, outputs=None, input_files=None, input_repos=None, clean_paths=None):
+        self.name = name
+        self.build = build
+        self.deps = deps if deps else []
+        self.outputs = outputs if outputs else []
+        self.input_files = input_files if input_files else []
+        self.input_repos = input_repos if input_repos else []
+        self.clean_paths = clean_paths if clean_paths else []
+
+
+class BuildGraph():
+    def __init__(self, max_workers=4):
+        self.nodes = dict()
+        self.max_workers = max_workers
+        # Node name -> input digest of the nodes built or validated in this run
+        self.built = dict()
+        self.lock = threading.Lock()
+
+    def root(self):
+        return os.getcwd()
+
+    def abspath(self, path):
+        return os.path.join(self.root(), path.format(build_root=get_build_root()))
+
+    def stamp_dir(self):
+        return os.path.join(self.root(), "build/stamps")
+
+    def is_keyed(self, node: BuildNode):
+        return any("{build_root}" in path for path in node.outputs + node.clean_paths)
+
+    def stamp_file(self, name):
+        if name in self.nodes and self.is_keyed(self.nodes[name]) and build_configuration.key:
+            return os.path.join(self.stamp_dir(), name + "." + build_configuration.key + ".stamp")
+        return os.path.join(self.stamp_dir(), name + ".stamp")
+
+    def add_node(self, node: BuildNode):
+        self.nodes[node.name] = node
+
+    # All nodes needed for targets, dependencies first
+    def closure(self, targets):
+        order = []
+        visiting = set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name not in self.nodes:
+                raise KeyError("Unknown build node " + name)
+            if name in visiting:
+                raise ValueError("Dependency cycle at build node " + name)
+            visiting.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            visiting.remove(name)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def is_output_present(self, node: BuildNode):
+        for output in node.outputs:
+            if not os.path.exists(self.abspath(output)):
+                return False
+        return True
+
+    def input_digest(self, node: BuildNode, builder, fingerprint, dep_digests):
+        digest = hashlib.sha256()
+        digest.update(node.name.encode())
+        digest.update(builder.__class__.__module__.encode())
+        digest.update(builder.__class__.__name__.encode())
+        if fingerprint is not None:
+            digest.update(str(fingerprint).encode())
+        for dep in node.deps:
+            digest.update(dep_digests[dep].encode())
+        for input_file in node.input_files:
+            path = self.abspath(input_file)
+            if os.path.isfile(path):
+                # Size and mtime are enough here, hashing Boost tarball on every build is not cheap
+                st = os.stat(path)
+                digest.update((input_file + str(st.st_size) + str(int(st.st_mtime))).encode())
+        for input_repo in node.input_repos:
+            head = read_git_head(self.abspath(input_repo))
+            digest.update((input_repo + str(head)).encode())
+        return digest.hexdigest()
+
+    def read_stamp(self, name):
+        stamp_file = self.stamp_file(name)
+        if not os.path.isfile(stamp_file):
+            return None
+        with open(stamp_file, "r") as f:
+            return f.read().strip()
+
+    def write_stamp(self, name, digest):
+        os.makedirs(self.stamp_dir(), exist_ok=True)
+        with open(self.stamp_file(name), "w") as f:
+            f.write(digest)
+
+    def clean_node(self, node: BuildNode):
+        for clean_path in node.clean_paths:
+            path = self.abspath(clean_path)
+            if os.path.islink(path) or os.path.isfile(path):
+                os.remove(path)
+            elif os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+        if os.path.isfile(self.stamp_file(node.name)):
+            os.remove(self.stamp_file(node.name))
+        with self.lock:
+            self.built.pop(node.name, None)
+
+    def build_node(self, name, builder, fingerprint, dep_digests):
+        node = self.nodes[name]
+        digest = self.input_digest(node, builder, fingerprint, dep_digests)
+        with self.lock:
+            if self.built.get(name) == digest:
+                return digest
+        # Another run.py process may be building the same node
+        with exclusive_lock(self.stamp_file(name)):
+            return self.update_node(node, builder, digest)
+
+    def update_node(self, node: BuildNode, builder, digest):
+        name = node.name
+        stamp = self.read_stamp(name)
+        if self.is_output_present(node):
+            # Trees built before stamps existed are adopted as they are
+            if stamp is None or stamp == digest:
+                print(name + " is up to date")
+                self.write_stamp(name, digest)
+                mark_used("prerequisite", name)
+                with self.lock:
+                    self.built[name] = digest
+                return digest
+            print(name + " inputs changed, rebuilding")
+            self.clean_node(node)
+        print("Building " + name + " ..")
+        build = getattr(builder, node.build)
+        if not build() or not self.is_output_present(node):
+            print(name + " build failed")
+            return None
+        self.write_stamp(name, digest)
+        mark_used("prerequisite", name)
+        with self.lock:
+            self.built[name] = digest
+        return digest
+
+    # Build targets and their dependencies, independent nodes are built concurrently
+    # builder provides the build methods named by the nodes
+    def build(self, targets, builder, fingerprint=None):
+        pending = self.closure(targets)
+        digests = dict()
+        failed = set()
+        running = dict()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = self.nodes[name].deps
+                    if any(dep in failed for dep in deps):
+                        print("Skipping " + name + " as its dependencies failed to build")
+                        failed.add(name)
+                        pending.remove(name)
+                    elif all(dep in digests for dep in deps):
+                        running[pool.submit(self.build_node, name, builder, fingerprint, dict(digests))] = name
+                        pending.remove(name)
+                if not running:
+                    continue
+                done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        digest = future.result()
+                    except Exception as err:
+                        print(name + " build raised " + str(err))
+                        digest = None
+                    if digest is None:
+                        failed.add(name)
+                    else:
+                        digests[name] = digest
+        return not failed
+
+    # Nodes depending on any of names, including names
+    def dependents(self, names):
+        result = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for node in self.nodes.values():
+                if node.name not in result and any(dep in result for dep in node.deps):
+                    result.add(node.name)
+                    changed = True
+        return result
+
+    # Clean targets (default all nodes) together with everything built on top of them
+    def clean(self, targets=None):
+        if targets is None:
+            targets = list(self.nodes.keys())
+        names = self.dependents(targets)
+        for name in reversed(self.closure(sorted(names))):
+            if name in names:
+                print("Cleaning " + name)
+                self.clean_node(self.nodes[name])
+
+
+GRIDTOOLS_PATH = "src/hiptestsuite/applications/hpc_apps/gridtools/"
+LAGHOS_PATH = "src/hiptestsuite/applications/hpc_apps/laghos/"
+CONFORMANCE_PATH = "src/hiptestsuite/conformance/"
+MGBENCH_PATH = "src/hiptestsuite/applications/mgbench/"
+
+# Third party prerequisites of the testers
+prerequisites = BuildGraph()
+prerequisites.add_node(BuildNode("boost_1_72_0", build="build_boost",
+    outputs=[GRIDTOOLS_PATH + "boost_1_72_0"],
+    input_files=[GRIDTOOLS_PATH + "boost_1_72_0.tar.bz2"],
+    clean_paths=[GRIDTOOLS_PATH + "boost_1_72_0", GRIDTOOLS_PATH + "GridTools/boost_1_72_0"]))
+prerequisites.add_node(BuildNode("gridtools", build="build_gridtools", deps=["boost_1_72_0"],
+    outputs=[GRIDTOOLS_PATH + "GridTools/gridtools/build"],
+    input_files=[GRIDTOOLS_PATH + "gridtools.patch"],
+    input_repos=[GRIDTOOLS_PATH + "GridTools/gridtools"],
+    clean_paths=[GRIDTOOLS_PATH + "GridTools/gridtools/build", GRIDTOOLS_PATH + "gridtools"]))
+prerequisites.add_node(BuildNode("gtbench", build="build_gtbench", deps=["gridtools"],
+    outputs=[GRIDTOOLS_PATH + "GridTools/gtbench/build"],
+    input_files=[GRIDTOOLS_PATH + "gtbench.patch"],
+    input_repos=[GRIDTOOLS_PATH + "GridTools/gtbench"],
+    clean_paths=[GRIDTOOLS_PATH + "GridTools/gtbench/build"]))
+prerequisites.add_node(BuildNode("hypre", build="configure_build_hypre",
+    outputs=[LAGHOS_PATH + "hypre/src/lib/libHYPRE.a"],
+    clean_paths=[LAGHOS_PATH + "hypre", LAGHOS_PATH + "hypre-2.16.0"]))
+prerequisites.add_node(BuildNode("metis", build="configure_build_metis",
+    outputs=[LAGHOS_PATH + "metis-4.0/libmetis.a"],
+    clean_paths=[LAGHOS_PATH + "metis-4.0", LAGHOS_PATH + "metis-4.0.3"]))
+prerequisites.add_node(BuildNode("mfem", build="configure_build_mfem", deps=["hypre", "metis"],
+    outputs=[LAGHOS_PATH + "mfem/libmfem.a"],
+    input_files=[LAGHOS_PATH + "hip_on_nvcc.patch"],
+    input_repos=[LAGHOS_PATH + "mfem"],
+    clean_paths=[LAGHOS_PATH + "mfem/libmfem.a"]))
+prerequisites.add_node(BuildNode("laghos", build="configure_build_laghos", deps=["mfem"],
+    outputs=[LAGHOS_PATH + "Laghos/laghos"],
+    input_files=[LAGHOS_PATH + "laghos-multinode.patch"],
+    input_repos=[LAGHOS_PATH + "Laghos"],
+    clean_paths=[LAGHOS_PATH + "Laghos/laghos"]))
+prerequisites.add_node(BuildNode("hip_catch2", build="build_catch2",
+    outputs=["{build_root}/" + CONFORMANCE_PATH + "HIP/build/hipTestMain/ABMTests",
+             "{build_root}/" + CONFORMANCE_PATH + "HIP/build/hipTestMain/MultiProcTests",
+             "{build_root}/" + CONFORMANCE_PATH + "HIP/build/hipTestMain/UnitTests"],
+    input_repos=[CONFORMANCE_PATH + "HIP"],
+    clean_paths=["{build_root}/" + CONFORMANCE_PATH + "HIP/build"]))
+prerequisites.add_node(BuildNode("gflags", build="build_gflags",
+    outputs=[MGBENCH_PATH + "mgbench/deps/gflags/lib/libgflags.a"],
+    input_repos=[MGBENCH_PATH + "mgbench"],
+    clean_paths=[MGBENCH_PATH + "mgbench/deps/gflags/lib"]))
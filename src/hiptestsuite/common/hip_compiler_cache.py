@@ -0,0 +1,294 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Compiler launcher cache for hipcc
+# The suite puts a hipcc shim in front of the real compiler (HIPCC, make HIPCC
+# override and PATH). The shim runs this file, which hashes the preprocessed
+# sources, the flags and the compiler identity and returns the cached output
+# file of an identical earlier invocation. Compiles (-c) are cached as they are,
+# compile-and-link invocations (hipcc a.cpp b.cpp -o app) are split into a
+# cached compile per source and a link of the objects which always runs the real
+# compiler, as do links of objects. Only the standard library is used here as
+# this file also runs standalone.
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+CACHE_DIR_ENV = "HIPTESTSUITE_COMPILER_CACHE_DIR"
+COMPILER_ENV = "HIPTESTSUITE_COMPILER_CACHE_COMPILER"
+STATS_ENV = "HIPTESTSUITE_COMPILER_CACHE_STATS"
+
+SOURCE_EXTENSIONS = [".c", ".cc", ".cp", ".cpp", ".cxx", ".c++", ".cu", ".hip"]
+# Options producing output which is not cached along with the -o file
+UNCACHEABLE_OPTIONS = ["-E", "-M", "-MM", "-MD", "-MMD", "-MF", "-save-temps", "--version", "-v", "-"]
+# Link options, left out of the compiles split off a compile-and-link invocation
+LINK_OPTION_PREFIXES = ("-l", "-L", "-Wl")
+# Inputs which are passed to the link only
+OBJECT_EXTENSIONS = [".o", ".obj", ".a", ".so"]
+
+saved_env = None
+
+
+def get_shim_dir(cache_dir):
+    return os.path.join(cache_dir, "bin")
+
+
+# Path of the hipcc to use in build commands
+def get_hipcc():
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return os.path.join(get_shim_dir(cache_dir), "hipcc")
+    return "/opt/rocm/bin/hipcc"
+
+
+def enable_compiler_cache(cache_dir, compiler, stats_file):
+    global saved_env
+    cache_dir = os.path.abspath(cache_dir)
+    shim_dir = get_shim_dir(cache_dir)
+    os.makedirs(shim_dir, exist_ok=True)
+    shim = os.path.join(shim_dir, "hipcc")
+    with open(shim, "w") as f:
+        f.write("#!/bin/sh\n")
+        f.write("exec \"" + sys.executable + "\" \"" + os.path.abspath(__file__) + "\" \"$@\"\n")
+    os.chmod(shim, 0o755)
+    if saved_env is None:
+        saved_env = dict()
+        for name in [CACHE_DIR_ENV, COMPILER_ENV, STATS_ENV, "HIPCC", "MAKEFLAGS", "PATH"]:
+            saved_env[name] = os.environ.get(name)
+    os.environ[CACHE_DIR_ENV] = cache_dir
+    os.environ[COMPILER_ENV] = os.path.abspath(compiler)
+    os.environ[STATS_ENV] = os.path.abspath(stats_file)
+    os.environ["HIPCC"] = shim
+    # Command line variables in MAKEFLAGS override HIPCC=$(HIP_PATH)/bin/hipcc in Makefiles
+    makeflags = os.environ.get("MAKEFLAGS")
+    os.environ["MAKEFLAGS"] = (makeflags + " " if makeflags else "") + "HIPCC=" + shim
+    os.environ["PATH"] = shim_dir + os.pathsep + os.environ.get("PATH", "")
+    open(stats_file, "a").close()
+
+
+def disable_compiler_cache():
+    global saved_env
+    if saved_env is None:
+        return
+    for name, value in saved_env.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    saved_env = None
+
+
+# Returns {"hits", "misses", "uncacheable", "hit_rate"} of a run
+def read_compiler_cache_stats(stats_file):
+    stats = {"hits": 0, "misses": 0, "uncacheable": 0}
+    if not os.path.isfile(stats_file):
+        return None
+    with open(stats_file, "r") as f:
+        for line in f:
+            outcome = line.strip()
+            if outcome == "hit":
+                stats["hits"] += 1
+            elif outcome == "miss":
+                stats["misses"] += 1
+            elif outcome == "uncacheable":
+                stats["uncacheable"] += 1
+    cacheable = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(100.0 * stats["hits"] / cacheable, 1) if cacheable else None
+    return stats
+
+
+def record(outcome):
+    stats_file = os.environ.get(STATS_ENV)
+    if stats_file:
+        # Single small O_APPEND writes do not interleave across parallel compiles
+        fd = os.open(stats_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        os.write(fd, (outcome + "\n").encode())
+        os.close(fd)
+
+
+def passthrough(compiler, args):
+    record("uncacheable")
+    return subprocess.call([compiler] + args)
+
+
+def hash_file(path, hasher):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+
+
+# Compiler path, size, mtime and --version output, memoized in the cache
+def compiler_identity(cache_dir, compiler):
+    st = os.stat(compiler)
+    stamp = hashlib.sha256((os.path.realpath(compiler) + str(st.st_size) + str(st.st_mtime_ns)).encode()).hexdigest()
+    identity_file = os.path.join(cache_dir, "compilers", stamp)
+    if os.path.isfile(identity_file):
+        with open(identity_file, "r") as f:
+            return f.read()
+    proc = subprocess.run([compiler, "--version"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    identity = stamp + "\n" + proc.stdout.decode("utf-8", errors="ignore")
+    os.makedirs(os.path.dirname(identity_file), exist_ok=True)
+    with open(identity_file + ".tmp" + str(os.getpid()), "w") as f:
+        f.write(identity)
+    os.replace(identity_file + ".tmp" + str(os.getpid()), identity_file)
+    return identity
+
+
+def is_source(path):
+    return os.path.splitext(path)[1].lower() in SOURCE_EXTENSIONS
+
+
+# Cache key of a compile of inputs with flags, None if a source does not preprocess
+def compile_key(cache_dir, compiler, flags, inputs):
+    key = hashlib.sha256()
+    key.update(compiler_identity(cache_dir, compiler).encode())
+    key.update("\0".join(flags).encode())
+    preprocess_flags = [flag for flag in flags if flag != "-c"]
+    for path in inputs:
+        key.update(b"\0input\0")
+        if is_source(path):
+            proc = subprocess.run([compiler] + preprocess_flags + ["-E", path],
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            if proc.returncode != 0:
+                return None
+            key.update(proc.stdout)
+        else:
+            # Headers given as values of options
+            hash_file(path, key)
+    return key.hexdigest()
+
+
+# Copies the cached output of an identical compile to output, or runs command
+# and stores its output
+def cached_compile(cache_dir, digest, command, output):
+    entry = os.path.join(cache_dir, "objects", digest[:2], digest)
+
+    if os.path.isfile(os.path.join(entry, "output")):
+        shutil.copy2(os.path.join(entry, "output"), output)
+        with open(os.path.join(entry, "stdout"), "rb") as f:
+            sys.stdout.buffer.write(f.read())
+        with open(os.path.join(entry, "stderr"), "rb") as f:
+            sys.stderr.buffer.write(f.read())
+        record("hit")
+        return 0
+
+    record("miss")
+    proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    sys.stdout.buffer.write(proc.stdout)
+    sys.stderr.buffer.write(proc.stderr)
+    if proc.returncode != 0 or not os.path.isfile(output):
+        return proc.returncode
+    os.makedirs(os.path.dirname(entry), exist_ok=True)
+    tmp_entry = tempfile.mkdtemp(dir=os.path.dirname(entry))
+    shutil.copy2(output, os.path.join(tmp_entry, "output"))
+    with open(os.path.join(tmp_entry, "stdout"), "wb") as f:
+        f.write(proc.stdout)
+    with open(os.path.join(tmp_entry, "stderr"), "wb") as f:
+        f.write(proc.stderr)
+    try:
+        os.rename(tmp_entry, entry)
+    except OSError:
+        # A parallel compile stored the same entry first
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+    return 0
+
+
+# Compiles every source of a compile-and-link invocation through the cache and
+# links the objects in place of the sources
+def compile_and_link(cache_dir, compiler, args, positions):
+    sources = [i for i in positions["inputs"] if is_source(args[i])]
+    headers = [args[i] for i in positions["inputs"] if not is_source(args[i])
+               and os.path.splitext(args[i])[1].lower() not in OBJECT_EXTENSIONS]
+    # The compile of a source gets every argument but the output, the other
+    # inputs passed to the link and the link options
+    skipped = set(positions["output"]) | set(positions["link"]) |\
+        set(i for i in positions["inputs"] if args[i] not in headers)
+    compile_args = [arg for i, arg in enumerate(args) if i not in skipped]
+    flags = [arg for arg in compile_args if arg not in headers] + ["-c"]
+    os.makedirs(cache_dir, exist_ok=True)
+    objects_dir = tempfile.mkdtemp(prefix="link", dir=cache_dir)
+    try:
+        link_args = list(args)
+        for number, i in enumerate(sources):
+            digest = compile_key(cache_dir, compiler, flags, [args[i]] + headers)
+            if digest is None:
+                return passthrough(compiler, args)
+            obj = os.path.join(objects_dir, str(number) + ".o")
+            returncode = cached_compile(cache_dir, digest, [compiler] + compile_args + ["-c", args[i], "-o", obj], obj)
+            if returncode != 0:
+                return returncode
+            link_args[i] = obj
+        return subprocess.call([compiler] + link_args)
+    finally:
+        shutil.rmtree(objects_dir, ignore_errors=True)
+
+
+def main(args):
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    compiler = os.environ.get(COMPILER_ENV, "/opt/rocm/bin/hipcc")
+    if not cache_dir:
+        return subprocess.call([compiler] + args)
+
+    output = None
+    flags = list()
+    inputs = list()
+    # Indices in args of the -o option, the input files and the link options
+    positions = {"output": [], "inputs": [], "link": []}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "-o" and i + 1 < len(args):
+            output = args[i + 1]
+            positions["output"] += [i, i + 1]
+            i += 2
+            continue
+        if arg.startswith("-o") and len(arg) > 2:
+            output = arg[2:]
+            positions["output"].append(i)
+        elif arg in UNCACHEABLE_OPTIONS:
+            return passthrough(compiler, args)
+        elif not arg.startswith("-") and os.path.isfile(arg):
+            inputs.append(arg)
+            positions["inputs"].append(i)
+        else:
+            if arg.startswith(LINK_OPTION_PREFIXES):
+                positions["link"].append(i)
+            flags.append(arg)
+        i += 1
+    if output is None or not inputs:
+        return passthrough(compiler, args)
+    if "-c" not in flags:
+        if not any(is_source(path) for path in inputs):
+            # Link of objects
+            return passthrough(compiler, args)
+        return compile_and_link(cache_dir, compiler, args, positions)
+
+    digest = compile_key(cache_dir, compiler, flags, inputs)
+    if digest is None:
+        return passthrough(compiler, args)
+    return cached_compile(cache_dir, digest, [compiler] + args, output)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
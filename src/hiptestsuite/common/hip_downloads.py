@@ -0,0 +1,135 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.common.hip_shell import execshellcmd
+from hiptestsuite.common.hip_offline import is_offline, get_offline_file, file_sha256
+from hiptestsuite.common.hip_locks import file_lock
+
+import os
+import shutil
+
+# Third party files downloaded by the testers, name -> url and sha256 of the content
+THIRD_PARTY_FILES = {
+    "hypre-2.16.0.tar.gz": {
+        "url": "https://github.com/hypre-space/hypre/archive/v2.16.0.tar.gz",
+        "sha256": "33f8a27041e697343b820d0426e74694670f955e21bbf3fcb07ee95b22c59e7e",
+    },
+    "metis-4.0.3.tar.gz": {
+        "url": "http://glaros.dtc.umn.edu/gkhome/fetch/sw/metis/OLD/metis-4.0.3.tar.gz",
+        "sha256": "5efa35de80703c1b2c4d0de080fafbcf4e0d363a21149a1ad2f96e0144841a55",
+    },
+    "boost_1_72_0.tar.bz2": {
+        "url": "https://archives.boost.io/release/1.72.0/source/boost_1_72_0.tar.bz2",
+        "sha256": "59c9b274bc451cf91a9ba1dd2c7fdcaf5d60b1b3aa83f2c9fa143417cc660722",
+    },
+}
+
+
+# Run scoped settings of the download cache, set from cfg by run.py/TestersExecutor
+# cache_dir None: download into the tree every time
+# Layout: objects/<sha256> holds a verified download, partial/<sha256>.part is an
+# interrupted one, written under the lock partial/<sha256>.part.lock
+class DownloadCache():
+    def __init__(self):
+        self.cache_dir = None
+
+
+download_cache = DownloadCache()
+
+
+# cache_dir None/False: no cache
+def set_download_cache(cache_dir):
+    if cache_dir:
+        download_cache.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    else:
+        download_cache.cache_dir = None
+
+
+def is_cached(cached_file, sha256):
+    return os.path.isfile(cached_file) and file_sha256(cached_file) == sha256
+
+
+# Download url to path, resuming a partial path with resume
+# Returns True if the downloaded content matches sha256, otherwise path is removed
+def download(logFile, url, path, sha256, resume=False):
+    cmd = "wget " + ("-c " if resume else "") + "-O " + path + " " + url + " && echo Download complete"
+    output = execshellcmd(cmd, logFile, None)
+    if not output.strip().endswith("Download complete"):
+        # Kept for resuming
+        return False
+    digest = file_sha256(path)
+    if digest != sha256:
+        print("Download of " + url + " does not match its sha256 " + sha256 + ", got " + digest)
+        os.remove(path)
+        return False
+    return True
+
+
+# Cached copy of url, downloaded if it is not cached or fails its sha256
+# An interrupted download is resumed. Returns None if the download fails
+def get_cached_file(logFile, url, sha256):
+    objects_dir = os.path.join(download_cache.cache_dir, "objects")
+    partial_dir = os.path.join(download_cache.cache_dir, "partial")
+    cached_file = os.path.join(objects_dir, sha256)
+    if is_cached(cached_file, sha256):
+        print("Using cached " + url)
+        return cached_file
+    os.makedirs(objects_dir, exist_ok=True)
+    os.makedirs(partial_dir, exist_ok=True)
+    partial_file = os.path.join(partial_dir, sha256 + ".part")
+    # One process downloads, the others wait and use its download
+    with file_lock(partial_file):
+        if is_cached(cached_file, sha256):
+            print("Using cached " + url)
+            return cached_file
+        if os.path.isfile(cached_file):
+            print("Cached " + url + " does not match its sha256, downloading it again")
+            os.remove(cached_file)
+        if os.path.isfile(partial_file):
+            print("Resuming download of " + url)
+        else:
+            print("Downloading " + url)
+        if not download(logFile, url, partial_file, sha256, resume=True):
+            return None
+        os.replace(partial_file, cached_file)
+    return cached_file
+
+
+# Put the third party file name at dest, from the offline manifest in offline mode
+# and through the download cache otherwise
+# Returns True/False, raises NetworkAccessDisabled if offline mode can not provide it
+def fetch_file(logFile, name, dest):
+    if is_offline():
+        print("Copying " + name + " from the offline manifest")
+        shutil.copyfile(get_offline_file(name), dest)
+        return True
+    url = THIRD_PARTY_FILES[name]["url"]
+    sha256 = THIRD_PARTY_FILES[name]["sha256"]
+    if download_cache.cache_dir:
+        cached_file = get_cached_file(logFile, url, sha256)
+        if cached_file is None:
+            return False
+        shutil.copyfile(cached_file, dest)
+        return True
+    print("Downloading " + name)
+    if not download(logFile, url, dest + ".part", sha256):
+        return False
+    os.replace(dest + ".part", dest)
+    return True
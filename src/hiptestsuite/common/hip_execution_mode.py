@@ -0,0 +1,88 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from enum import Enum, auto
+import os
+
+
+class ExecutionMode(Enum):
+    BUILD_AND_RUN = auto()
+    # Fetch and build only, ready binaries are written to a manifest
+    BUILD_ONLY = auto()
+    # Execute and parse against the binaries of a manifest, never build
+    RUN_ONLY = auto()
+
+
+# Raised by a test in build only mode once its artifacts are built
+class BuildComplete(Exception):
+    def __init__(self, artifacts):
+        Exception.__init__(self, "Build complete")
+        self.artifacts = artifacts
+
+
+# Raised in run only mode when an artifact needed by the test is not present
+class ArtifactMissing(Exception):
+    def __init__(self, message):
+        Exception.__init__(self, message)
+
+
+# Run scoped execution mode, set by TestersExecutor
+class ExecutionModeState():
+    def __init__(self):
+        self.mode = ExecutionMode.BUILD_AND_RUN
+
+
+execution_mode = ExecutionModeState()
+
+
+def is_build_only():
+    return execution_mode.mode == ExecutionMode.BUILD_ONLY
+
+
+def is_run_only():
+    return execution_mode.mode == ExecutionMode.RUN_ONLY
+
+
+def check_artifacts(artifacts):
+    missing = [artifact for artifact in artifacts if not os.path.exists(artifact)]
+    if missing:
+        raise ArtifactMissing("Missing artifacts: " + ", ".join(missing))
+    return True
+
+
+# Ends the test after its build in build only mode
+def stop_if_build_only(artifacts):
+    if is_build_only():
+        check_artifacts(artifacts)
+        raise BuildComplete(artifacts)
+
+
+# Calls build() according to the execution mode
+# artifacts are the paths which the test needs at run time
+def run_build(build, artifacts):
+    if is_run_only():
+        return check_artifacts(artifacts)
+    status = build()
+    if status != False and is_build_only():
+        for artifact in artifacts:
+            if not os.path.exists(artifact):
+                return False
+        raise BuildComplete(artifacts)
+    return status
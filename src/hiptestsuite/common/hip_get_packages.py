@@ -19,8 +19,181 @@
 # THE SOFTWARE.
 
 from hiptestsuite.common.hip_shell import execshellcmd
+from hiptestsuite.common.hip_execution_mode import is_run_only, ArtifactMissing
+from hiptestsuite.common.hip_offline import resolve_repo_url
+from hiptestsuite.common.hip_locks import shared_lock, exclusive_lock
 
+import hashlib
 import os
+import threading
+
+# git dir and common dir (shared by worktrees) of a checkout, None if there is none
+def get_git_dirs(repo_path):
+    git_dir = os.path.join(repo_path, ".git")
+    if os.path.isfile(git_dir):
+        # Worktrees and submodules keep a "gitdir: <path>" pointer file
+        with open(git_dir, "r") as f:
+            content = f.read().strip()
+        if not content.startswith("gitdir:"):
+            return None
+        git_dir = os.path.join(repo_path, content[len("gitdir:"):].strip())
+    if not os.path.isfile(os.path.join(git_dir, "HEAD")):
+        return None
+    common_dir = git_dir
+    if os.path.isfile(os.path.join(git_dir, "commondir")):
+        with open(os.path.join(git_dir, "commondir"), "r") as f:
+            common_dir = os.path.join(git_dir, f.read().strip())
+    return git_dir, common_dir
+
+
+# Read the commit id pointed to by HEAD directly from the .git directory
+# Returns None if it can not be resolved without invoking git
+def read_git_head(repo_path):
+    git_dirs = get_git_dirs(repo_path)
+    if git_dirs is None:
+        return None
+    git_dir, common_dir = git_dirs
+    with open(os.path.join(git_dir, "HEAD"), "r") as f:
+        head = f.read().strip()
+    if not head.startswith("ref:"):
+        return head
+    ref = head[len("ref:"):].strip()
+    for refs_dir in [git_dir, common_dir]:
+        ref_file = os.path.join(refs_dir, ref)
+        if os.path.isfile(ref_file):
+            with open(ref_file, "r") as f:
+                return f.read().strip()
+    packed_refs = os.path.join(common_dir, "packed-refs")
+    if os.path.isfile(packed_refs):
+        with open(packed_refs, "r") as f:
+            for line in f:
+                fields = line.strip().split(" ")
+                if len(fields) == 2 and fields[1] == ref:
+                    return fields[0]
+    return None
+
+
+# Local branch names of a checkout read from the .git directory
+# Returns None if they can not be listed without invoking git
+def read_git_branches(repo_path):
+    git_dirs = get_git_dirs(repo_path)
+    if git_dirs is None:
+        return None
+    git_dir, common_dir = git_dirs
+    branches = set()
+    heads_dir = os.path.join(common_dir, "refs/heads")
+    for root, dirs, files in os.walk(heads_dir):
+        for name in files:
+            branches.add(os.path.relpath(os.path.join(root, name), heads_dir))
+    packed_refs = os.path.join(common_dir, "packed-refs")
+    if os.path.isfile(packed_refs):
+        with open(packed_refs, "r") as f:
+            for line in f:
+                fields = line.strip().split(" ")
+                if len(fields) == 2 and fields[1].startswith("refs/heads/"):
+                    branches.add(fields[1][len("refs/heads/"):])
+    return sorted(branches)
+
+
+# Prefetch threads and tests may pull the same repo at the same time,
+# pull_repo holds the lock of reponame while it verifies or updates the checkout
+# and update_mirror the lock of the mirror path
+repo_locks = dict()
+repo_locks_guard = threading.Lock()
+
+
+def get_repo_lock(reponame):
+    with repo_locks_guard:
+        if reponame not in repo_locks:
+            repo_locks[reponame] = threading.Lock()
+        return repo_locks[reponame]
+
+
+# Run scoped registry of the checkouts verified against the config, the tests
+# sharing a repo check it once. reponame -> (repo, branch, commitId, HEAD)
+# A checkout whose HEAD has moved since it was verified is checked again
+class RepoStates():
+    def __init__(self):
+        self.verified = dict()
+        self.lock = threading.Lock()
+
+    def is_verified(self, reponame, repo, branch, commitId, repo_path):
+        with self.lock:
+            state = self.verified.get(reponame)
+        if state is None or state[:3] != (repo, branch, commitId):
+            return False
+        return read_git_head(repo_path) == state[3]
+
+    def set_verified(self, reponame, repo, branch, commitId, repo_path):
+        head = read_git_head(repo_path)
+        with self.lock:
+            if head is None:
+                self.verified.pop(reponame, None)
+            else:
+                self.verified[reponame] = (repo, branch, commitId, head)
+
+    def invalidate(self, reponame):
+        with self.lock:
+            self.verified.pop(reponame, None)
+
+
+repo_states = RepoStates()
+
+
+# Run scoped settings of the bare mirror cache, set from cfg by run.py/TestersExecutor
+# cache_dir None: clone directly from the repo url
+class RepoCache():
+    def __init__(self):
+        self.cache_dir = None
+
+
+repo_cache = RepoCache()
+
+
+# cache_dir None/False: no cache
+def set_repo_cache(cache_dir):
+    if cache_dir:
+        repo_cache.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    else:
+        repo_cache.cache_dir = None
+
+
+# One bare mirror per repo url
+def get_mirror_path(url):
+    name = os.path.basename(url.rstrip("/"))
+    if name.endswith(".git"):
+        name = name[:-len(".git")]
+    return os.path.join(repo_cache.cache_dir, name + "-" + hashlib.sha1(url.encode()).hexdigest()[:12] + ".git")
+
+
+def git_has_commit(git_path, commitId):
+    cmd = "cd " + git_path + ";"
+    cmd += "git cat-file -t " + commitId + " 2>/dev/null"
+    return execshellcmd(cmd, None, None).strip() == "commit"
+
+
+# Fetch only commitId at depth 1, servers may refuse fetching a commit id
+def git_fetch_commit(logFile, git_path, url, commitId):
+    print("Fetching commit " + commitId + " of " + url)
+    cmd = "cd " + git_path + ";"
+    cmd += "git fetch --depth 1 origin " + commitId + ";"
+    execshellcmd(cmd, logFile, None)
+    return git_has_commit(git_path, commitId)
+
+
+# Checkouts borrow the objects of the mirror through alternates, a ref keeps the pinned
+# commit reachable so git gc in the mirror does not prune it
+def git_pin_commit(logFile, git_path, commitId):
+    cmd = "cd " + git_path + ";"
+    cmd += "git update-ref refs/hiptestsuite/pins/" + commitId + " " + commitId + ";"
+    execshellcmd(cmd, logFile, None)
+
+
+def git_has_branch(git_path, branch):
+    cmd = "cd " + git_path + ";"
+    cmd += "git rev-parse --verify --quiet refs/heads/" + branch
+    return execshellcmd(cmd, None, None).strip() != ""
+
 
 # Common class to clone/pull dependent Packages
 class HipPackages():
@@ -63,109 +236,216 @@ class HipPackages():
         self.mfemapppath = os.path.join(self.mfemrootpath, "mfem/")
         self.laghosrootpath = os.path.join(self.cwdAbs, "src/hiptestsuite/applications/hpc_apps/laghos/")
         self.laghosapppath = os.path.join(self.laghosrootpath, "Laghos/")
+        # reponame -> (repo_location, repo_dir)
+        self.repo_locations = {
+            "gpu-stream": (self.appPath, "GPU-STREAM"),
+            "mixbench": (self.appPath, "mixbench"),
+            "hip_examples": (self.appPath, "HIP-Examples"),
+            "HIP": (self.conformancePath, "HIP"),
+            "hipamd": (self.conformancePath, "HIPAMD"),
+            "rocclr": (self.conformancePath, "ROCclr"),
+            "opencl": (self.conformancePath, "ROCm-OpenCL-Runtime"),
+            "mgbench": (self.mgbenchrootpath, "mgbench"),
+            "cudagrep": (self.cudagreprootpath, "CUDA-grep"),
+            "cudamemtest": (self.cudamemrootpath, "cuda_memtest"),
+            "quicksilver": (self.qsrootpath, "Quicksilver"),
+            "gridtools": (self.gridtoolsrootpath, "gridtools"),
+            "gtbench": (self.gtbenchrootpath, "gtbench"),
+            "kokkos": (self.kokkosrootpath, "kokkos"),
+            "mfem": (self.mfemrootpath, "mfem"),
+            "Laghos": (self.laghosrootpath, "Laghos"),
+        }
+
+    # Paths of all the repos which can be cloned by pull_repo
+    def get_repo_paths(self):
+        repo_paths = dict()
+        for reponame, (repo_location, repo_dir) in self.repo_locations.items():
+            repo_paths[reponame] = os.path.join(repo_location, repo_dir)
+        return repo_paths
+
+    # Create or incrementally fetch the bare mirror of url
+    # Returns the mirror path, None if the mirror can not provide branch/commitId
+    def update_mirror(self, logFile, url, branch, commitId):
+        # Repos with the same url share the mirror
+        with get_repo_lock(get_mirror_path(url)):
+            return self.fetch_mirror(logFile, url, branch, commitId)
+
+    def fetch_mirror(self, logFile, url, branch, commitId):
+        mirror = get_mirror_path(url)
+        if not os.path.isdir(mirror):
+            print("Mirroring " + url + " to " + mirror)
+            os.makedirs(repo_cache.cache_dir, exist_ok=True)
+            if commitId != "":
+                # Pinned commits are fetched one by one below
+                cmd = "git init -q --bare " + mirror + ";"
+                cmd += "cd " + mirror + ";"
+                cmd += "git remote add origin " + url + ";"
+            else:
+                cmd = "git clone --bare " + url + " " + mirror + ";"
+                cmd += "cd " + mirror + ";"
+            cmd += "git config remote.origin.fetch \"+refs/heads/*:refs/heads/*\";"
+            execshellcmd(cmd, logFile, None)
+            if not os.path.isdir(mirror):
+                return None
+        elif commitId == "":
+            print("Fetching " + url + " into " + mirror)
+            cmd = "cd " + mirror + ";"
+            cmd += "git fetch --prune --tags origin;"
+            execshellcmd(cmd, logFile, None)
+        if commitId != "":
+            if (not git_has_commit(mirror, commitId)) and\
+            (not git_fetch_commit(logFile, mirror, url, commitId)):
+                print("Fetching commit " + commitId + " refused, fetching full history of " + url)
+                cmd = "cd " + mirror + ";"
+                if os.path.isfile(os.path.join(mirror, "shallow")):
+                    cmd += "git fetch --unshallow --tags origin;"
+                else:
+                    cmd += "git fetch --tags origin;"
+                execshellcmd(cmd, logFile, None)
+                if not git_has_commit(mirror, commitId):
+                    return None
+            git_pin_commit(logFile, mirror, commitId)
+        elif (branch != "") and (not git_has_branch(mirror, branch)):
+            return None
+        return mirror
 
     def pull_repo(self, logFile, repo, branch, commitId, reponame):
-        repo_root_path = ""
-        repo_location = ""
-        repo_dir = ""
-        if  reponame == "gpu-stream":
-            repo_root_path = self.gpustrmpath
-            repo_location = self.appPath
-            repo_dir = "GPU-STREAM"
-        elif reponame == "mixbench":
-            repo_root_path = self.mixbenchpath
-            repo_location = self.appPath
-            repo_dir = "mixbench"
-        elif reponame == "hip_examples":
-            repo_root_path = self.examplepath
-            repo_location = self.appPath
-            repo_dir = "HIP-Examples"
-        elif reponame == "HIP":
-            repo_root_path = self.hippath
-            repo_location = self.conformancePath
-            repo_dir = "HIP"
-        elif reponame == "hipamd":
-            repo_root_path = self.hipamdpath
-            repo_location = self.conformancePath
-            repo_dir = "HIPAMD"
-        elif reponame == "rocclr":
-            repo_root_path = self.rocclrpath
-            repo_location = self.conformancePath
-            repo_dir = "ROCclr"
-        elif reponame == "opencl":
-            repo_root_path = self.openclpath
-            repo_location = self.conformancePath
-            repo_dir = "ROCm-OpenCL-Runtime"
-        elif reponame == "mgbench":
-            repo_root_path = self.mgbenchapppath
-            repo_location = self.mgbenchrootpath
-            repo_dir = "mgbench"
-        elif reponame == "cudagrep":
-            repo_root_path = self.cudagrepapppath
-            repo_location = self.cudagreprootpath
-            repo_dir = "CUDA-grep"
-        elif reponame == "cudamemtest":
-            repo_root_path = self.cudamemapppath
-            repo_location = self.cudamemrootpath
-            repo_dir = "cuda_memtest"
-        elif reponame == "quicksilver":
-            repo_root_path = self.qsapppath
-            repo_location = self.qsrootpath
-            repo_dir = "Quicksilver"
-        elif reponame == "gridtools":
-            repo_root_path = self.gridtoolsapppath
-            repo_location = self.gridtoolsrootpath
-            repo_dir = "gridtools"
-        elif reponame == "gtbench":
-            repo_root_path = self.gtbenchapppath
-            repo_location = self.gtbenchrootpath
-            repo_dir = "gtbench"
-        elif reponame == "kokkos":
-            repo_root_path = self.kokkosapppath
-            repo_location = self.kokkosrootpath
-            repo_dir = "kokkos"
-        elif reponame == "mfem":
-            repo_root_path = self.mfemapppath
-            repo_location = self.mfemrootpath
-            repo_dir = "mfem"
-        elif reponame == "Laghos":
-            repo_root_path = self.laghosapppath
-            repo_location = self.laghosrootpath
-            repo_dir = "Laghos"
-
-        if  os.path.isdir(repo_root_path) and os.path.isdir(repo_root_path + "/.git"):
-            print(reponame + " already exist")
-            # Check if branch and commitId of local repo matches with input branch and commitId
-            # if not then update local repo
-            cmd = "cd " + os.path.join(repo_location, repo_dir) + ";"
-            cmd += "git branch"
-            currentbranch = execshellcmd(cmd, logFile, None)
-            currentbranch = currentbranch.replace("* ", "")
-            cmd = "cd " + os.path.join(repo_location, repo_dir) + ";"
-            cmd += "git rev-parse HEAD"
-            currentcommitid = execshellcmd(cmd, logFile, None)
-            # Check if the local repo is upto date with input configuration
-            if ((branch == "") or (branch in currentbranch)) and\
-            ((commitId == "") or (commitId in currentcommitid)):
-                print("This repo is up to date with config")
+        with get_repo_lock(reponame):
+            if reponame not in self.repo_locations:
+                print(reponame + " is not a known repo")
+                return False
+            # Other run.py processes may verify the repo at the same time,
+            # the lock is made exclusive only if the repo is replaced
+            with shared_lock(os.path.join(*self.repo_locations[reponame])):
+                return self.update_repo(logFile, repo, branch, commitId, reponame)
+
+    def update_repo(self, logFile, repo, branch, commitId, reponame):
+        repo_location, repo_dir = self.repo_locations[reponame]
+        repo_root_path = os.path.join(repo_location, repo_dir + "/")
+
+        # Run only mode never fetches, the repo must come with the prebuilt binaries
+        if is_run_only():
+            if not os.path.isdir(repo_root_path):
+                raise ArtifactMissing(reponame + " repo not present at " + repo_root_path)
+            return True
+
+        # Offline mode clones from the local repo of the manifest
+        repo = resolve_repo_url(repo)
+
+        if self.is_up_to_date(logFile, repo, branch, commitId, reponame):
+            return True
+
+        repo_states.invalidate(reponame)
+        # Nobody may build or run from the repo while it is replaced
+        with exclusive_lock(os.path.join(repo_location, repo_dir)):
+            # The shared lock is dropped while it is made exclusive, another
+            # run.py process may have replaced the repo in between
+            if self.is_up_to_date(logFile, repo, branch, commitId, reponame):
                 return True
-        else:
+            return self.clone_repo(logFile, repo, branch, commitId, reponame)
+
+    # True if the checkout of reponame matches repo, branch and commitId
+    def is_up_to_date(self, logFile, repo, branch, commitId, reponame):
+        repo_location, repo_dir = self.repo_locations[reponame]
+        repo_root_path = os.path.join(repo_location, repo_dir + "/")
+        if not (os.path.isdir(repo_root_path) and os.path.isdir(repo_root_path + "/.git")):
             print(reponame + " does not exist")
+            return False
+        # Already verified in this run
+        if repo_states.is_verified(reponame, repo, branch, commitId, repo_root_path):
+            return True
+        print(reponame + " already exist")
+        # Check if branch and commitId of local repo matches with input branch and commitId
+        # if not then update local repo
+        # HEAD and the local branches are read from .git, git is only run if that fails
+        currentbranch = None
+        if branch != "":
+            currentbranch = read_git_branches(repo_root_path)
+            if (currentbranch is None) or (branch not in currentbranch):
+                # e.g. a checkout of a tag is listed as "(HEAD detached at <tag>)"
+                cmd = "cd " + os.path.join(repo_location, repo_dir) + ";"
+                cmd += "git branch"
+                currentbranch = execshellcmd(cmd, logFile, None)
+                currentbranch = currentbranch.replace("* ", "")
+        currentcommitid = None
+        if commitId != "":
+            currentcommitid = read_git_head(repo_root_path)
+            if currentcommitid is None:
+                cmd = "cd " + os.path.join(repo_location, repo_dir) + ";"
+                cmd += "git rev-parse HEAD"
+                currentcommitid = execshellcmd(cmd, logFile, None)
+        # Check if the local repo is upto date with input configuration
+        if ((branch == "") or (branch in currentbranch)) and\
+        ((commitId == "") or (commitId in currentcommitid)):
+            print("This repo is up to date with config")
+            repo_states.set_verified(reponame, repo, branch, commitId, repo_root_path)
+            return True
+        return False
+
+    def clone_repo(self, logFile, repo, branch, commitId, reponame):
+        repo_location, repo_dir = self.repo_locations[reponame]
+        repo_root_path = os.path.join(repo_location, repo_dir + "/")
 
         # Update the repo
         print("Updating: " + reponame)
         cmdcd = "cd " + repo_location + ";"
         cmdcd += "rm -Rf " + repo_dir + "/;"
         cmdPull = ""
-        print("Cloning " + reponame + " to " + repo_location)
-        if branch == "": #No branch name provided. Clone from main branch.
+        # repo may carry the clone directory after the url
+        url = repo.split()[0]
+        mirror = None
+        if repo_cache.cache_dir:
+            mirror = self.update_mirror(logFile, url, branch, commitId)
+        if commitId != "":
+            # Only the pinned commit is checked out, from the mirror or fetched at depth 1
+            print("Checking out " + reponame + " at " + commitId + " to " + repo_location)
+            cmdPull = "git init -q " + repo_dir + ";"
+            cmdPull += "cd " + repo_dir + ";"
+            cmdPull += "git remote add origin " + url + ";"
+            if mirror:
+                # Objects are shared with the mirror, nothing is downloaded here
+                cmdPull += "echo " + os.path.join(mirror, "objects") + " > .git/objects/info/alternates;"
+                if os.path.isfile(os.path.join(mirror, "shallow")):
+                    cmdPull += "cp " + os.path.join(mirror, "shallow") + " .git/shallow;"
+        elif mirror:
+            # Objects are shared with the mirror, nothing is downloaded here
+            print("Cloning " + reponame + " to " + repo_location + " from " + mirror)
+            if branch == "":
+                cmdPull = "git clone --shared " + mirror + " " + repo_dir + ";"
+            else:
+                print("From branch: " + branch)
+                cmdPull = "git clone --shared -b " + branch + " " + mirror + " " + repo_dir + ";"
+            cmdPull += "cd " + repo_dir + ";git remote set-url origin " + url + ";"
+        elif branch == "": #No branch name provided. Clone from main branch.
+            print("Cloning " + reponame + " to " + repo_location)
             cmdPull = "git clone " + repo
         else:
+            print("Cloning " + reponame + " to " + repo_location)
             print("From branch: " + branch)
             cmdPull = "git clone -b " + branch + " " + repo
         cmdexc = cmdcd + cmdPull
         # Clone the latest version from repo
         execshellcmd(cmdexc, logFile, None)
+        if mirror and commitId == "":
+            # The checked out branch head may leave the mirror on its next fetch --prune
+            headcommitid = read_git_head(repo_root_path)
+            if headcommitid:
+                git_pin_commit(logFile, mirror, headcommitid)
+        if commitId != "":
+            if mirror or git_fetch_commit(logFile, repo_root_path, url, commitId):
+                cmdexc = "cd " + repo_root_path + ";"
+                if branch != "":
+                    cmdexc += "git checkout -q -b " + branch + " " + commitId + ";"
+                else:
+                    cmdexc += "git checkout -q " + commitId + ";"
+                execshellcmd(cmdexc, logFile, None)
+            else:
+                # Fall back to a full clone when the server refuses the commit fetch
+                print("Fetching commit " + commitId + " refused, cloning " + reponame + " to " + repo_location)
+                cmdPull = "git clone " + url + " " + repo_dir + ";"
+                if branch != "":
+                    cmdPull = "git clone -b " + branch + " " + url + " " + repo_dir + ";"
+                execshellcmd(cmdcd + cmdPull, logFile, None)
         isRepoPresent = os.path.isdir(repo_root_path)
         if not isRepoPresent:
             return False
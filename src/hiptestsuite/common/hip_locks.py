@@ -0,0 +1,125 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import fcntl
+import hashlib
+import os
+import threading
+
+# Advisory locks between run.py processes sharing a testsuite checkout.
+# Repos and build dirs are locked exclusively while they are cloned, built or
+# cleaned, and shared while tests read or run from them. A path inside a
+# repo is locked as the whole repo, so e.g. a build in mgbench/ waits for a
+# re-clone of mgbench and vice versa.
+
+LOCK_DIR = "build/locks"
+
+
+# Locks held by the current thread, lock file -> [fd, exclusive, count]
+# A thread may take a lock it already holds, flock itself is per open file
+class HeldLocks(threading.local):
+    def __init__(self):
+        self.locks = dict()
+
+
+held_locks = HeldLocks()
+
+
+# Repo containing path, or path itself outside of the repos. The repos are the
+# ones configured in HipPackages, whether they are cloned yet or not, so the
+# lock of a path is the same before and after its repo is cloned
+def get_lock_root(path):
+    # hip_get_packages locks its repos through this module
+    from hiptestsuite.common.hip_get_packages import HipPackages
+    path = os.path.abspath(path)
+    for repo_path in HipPackages().get_repo_paths().values():
+        repo_path = os.path.abspath(repo_path)
+        if path == repo_path or path.startswith(repo_path + os.sep):
+            return repo_path
+    return path
+
+
+def get_lock_file(path):
+    lock_root = get_lock_root(path)
+    name = os.path.basename(lock_root) + "-" + hashlib.sha1(lock_root.encode()).hexdigest()[:12] + ".lock"
+    return os.path.join(os.getcwd(), LOCK_DIR, name)
+
+
+class TreeLock():
+    # lock_file None: the lock of the repo or build dir under build/locks
+    def __init__(self, path, exclusive, lock_file=None):
+        self.path = path
+        self.exclusive = exclusive
+        self.lock_file = lock_file
+        self.upgraded = False
+
+    def flock(self, fd, exclusive):
+        operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print("Waiting for the " + ("exclusive" if exclusive else "shared") + " lock of " + get_lock_root(self.path))
+            fcntl.flock(fd, operation)
+
+    def __enter__(self):
+        if self.lock_file is None:
+            self.lock_file = get_lock_file(self.path)
+        held = held_locks.locks.get(self.lock_file)
+        if held is not None:
+            if self.exclusive and not held[1]:
+                # Upgrading is not atomic, the shared lock is dropped first
+                self.flock(held[0], True)
+                held[1] = True
+                self.upgraded = True
+            held[2] += 1
+            return self
+        os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o666)
+        self.flock(fd, self.exclusive)
+        held_locks.locks[self.lock_file] = [fd, self.exclusive, 1]
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        held = held_locks.locks[self.lock_file]
+        held[2] -= 1
+        if held[2] == 0:
+            del held_locks.locks[self.lock_file]
+            fcntl.flock(held[0], fcntl.LOCK_UN)
+            os.close(held[0])
+        elif self.upgraded:
+            fcntl.flock(held[0], fcntl.LOCK_SH)
+            held[1] = False
+        return False
+
+
+# Held while path is read or run from
+def shared_lock(path):
+    return TreeLock(path, False)
+
+
+# Held while path is cloned, built or cleaned
+def exclusive_lock(path):
+    return TreeLock(path, True)
+
+
+# Held while a file shared by several checkouts (the download cache) is written,
+# the lock file is next to it as build/locks is per checkout
+def file_lock(path):
+    return TreeLock(path, True, lock_file=path + ".lock")
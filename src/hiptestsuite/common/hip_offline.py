@@ -0,0 +1,155 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import hashlib
+import json
+import os
+
+# Any proxied http(s) access goes to the discard port and is refused at once
+OFFLINE_PROXY = "http://127.0.0.1:9"
+PROXY_VARIABLES = ["http_proxy", "https_proxy", "ftp_proxy", "all_proxy",
+                   "HTTP_PROXY", "HTTPS_PROXY", "FTP_PROXY", "ALL_PROXY"]
+
+
+# Raised in offline mode instead of reaching the network
+class NetworkAccessDisabled(Exception):
+    def __init__(self, message):
+        Exception.__init__(self, message)
+
+
+# Run scoped offline manifest, set from cfg by run.py/TestersExecutor
+# The manifest maps cfg.repos keys to local repos and third party files to
+# local copies with their sha256:
+# {
+#     "repos": {"hip": "file:///mirrors/HIP.git", "mfem": "/mirrors/mfem.git", ...},
+#     "files": {"hypre-2.16.0.tar.gz": {"path": "/mirrors/hypre-2.16.0.tar.gz", "sha256": "..."}, ...}
+# }
+class OfflineManifest():
+    def __init__(self):
+        self.path = None
+        # cfg.repos repo_url -> local repo
+        self.repo_urls = dict()
+        # file name -> {"path": ..., "sha256": ...}
+        self.files = dict()
+        self.saved_env = None
+
+
+offline_manifest = OfflineManifest()
+
+
+def is_offline():
+    return offline_manifest.path is not None
+
+
+def to_local_path(location, manifest_dir):
+    if location.startswith("file://"):
+        return location[len("file://"):]
+    return os.path.join(manifest_dir, os.path.expanduser(location))
+
+
+# path None: online. Returns False if the manifest can not be used
+def set_offline_manifest(path, config):
+    disable_offline_mode()
+    if path is None:
+        return True
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as error:
+        print("Can not read offline manifest " + path + ": " + str(error))
+        return False
+    manifest_dir = os.path.dirname(os.path.abspath(path))
+    repo_urls = dict()
+    for key, location in manifest.get("repos", dict()).items():
+        if key not in config.repos:
+            print("Offline manifest " + path + ": " + key + " is not a repo of cfg.repos")
+            return False
+        if config.repos[key]["repo_url"] is None:
+            continue
+        local_path = to_local_path(location, manifest_dir)
+        if not os.path.exists(local_path):
+            print("Offline manifest " + path + ": " + key + " repo " + location + " does not exist")
+            return False
+        repo_urls[config.repos[key]["repo_url"].split()[0]] = local_path
+    files = dict()
+    for name, entry in manifest.get("files", dict()).items():
+        if "path" not in entry or "sha256" not in entry:
+            print("Offline manifest " + path + ": " + name + " needs a path and a sha256")
+            return False
+        files[name] = {"path": to_local_path(entry["path"], manifest_dir), "sha256": entry["sha256"].lower()}
+    offline_manifest.path = os.path.abspath(path)
+    offline_manifest.repo_urls = repo_urls
+    offline_manifest.files = files
+    # git refuses every transport but local repos, http tools are sent to a closed port
+    offline_manifest.saved_env = dict((name, os.environ.get(name)) for name in ["GIT_ALLOW_PROTOCOL", "no_proxy", "NO_PROXY"] + PROXY_VARIABLES)
+    os.environ["GIT_ALLOW_PROTOCOL"] = "file"
+    for name in PROXY_VARIABLES:
+        os.environ[name] = OFFLINE_PROXY
+    os.environ.pop("no_proxy", None)
+    os.environ.pop("NO_PROXY", None)
+    return True
+
+
+def disable_offline_mode():
+    if offline_manifest.saved_env is not None:
+        for name, value in offline_manifest.saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    offline_manifest.__init__()
+
+
+def is_local_url(url):
+    return url.startswith("file://") or url.startswith("/") or os.path.exists(url)
+
+
+# repo is a cfg.repos repo_url, optionally followed by the clone directory
+# Returns repo with the url replaced by its local repo in offline mode
+def resolve_repo_url(repo):
+    if not is_offline():
+        return repo
+    fields = repo.split()
+    url = fields[0]
+    if url in offline_manifest.repo_urls:
+        return " ".join([offline_manifest.repo_urls[url]] + fields[1:])
+    if is_local_url(url):
+        return repo
+    raise NetworkAccessDisabled(url + " is not in the offline manifest " + offline_manifest.path)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Local copy of the third party file name, verified against its sha256
+def get_offline_file(name):
+    if name not in offline_manifest.files:
+        raise NetworkAccessDisabled(name + " is not in the offline manifest " + offline_manifest.path)
+    entry = offline_manifest.files[name]
+    if not os.path.isfile(entry["path"]):
+        raise NetworkAccessDisabled(name + " is not present at " + entry["path"])
+    if file_sha256(entry["path"]) != entry["sha256"]:
+        raise NetworkAccessDisabled(entry["path"] + " does not match the sha256 of " + name + " in " + offline_manifest.path)
+    return entry["path"]
@@ -0,0 +1,165 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.common.hip_shell import execshellcmd
+from hiptestsuite.common.hip_get_packages import read_git_head, get_git_dirs
+from hiptestsuite.common.hip_offline import file_sha256
+
+import json
+import os
+import shutil
+
+# Patch stacks applied to source trees. The stack applied to a tree is
+# recorded together with the commit it was applied to and the sha256 of every
+# patch, a copy of each applied patch is kept next to the record:
+#   <repo>/.git/hiptestsuite_patches/<tree>/ for trees in cloned repos
+#   <tree>/.hiptestsuite_patches/ otherwise
+# A tree whose record matches is left alone. Otherwise the recorded patches
+# are reverted from their copies and the stack is applied again, every step
+# checked beforehand (git apply --check / patch --dry-run), so a changed patch
+# or a half patched tree never needs a re-clone.
+
+PATCH_STATE_DIR = "hiptestsuite_patches"
+PATCH_OK = "HIPTESTSUITE_PATCH_OK"
+
+
+# Repo containing path, None outside of cloned repos
+def get_git_root(path):
+    root = os.getcwd()
+    current = os.path.abspath(path)
+    while current.startswith(root + os.sep):
+        if os.path.exists(os.path.join(current, ".git")):
+            return current
+        current = os.path.dirname(current)
+    return None
+
+
+def get_patch_state_dir(tree):
+    git_root = get_git_root(tree)
+    if git_root is not None:
+        git_dirs = get_git_dirs(git_root)
+        if git_dirs is not None:
+            name = os.path.relpath(os.path.abspath(tree), git_root)
+            name = "_" if name == os.curdir else name.replace(os.sep, "_")
+            return os.path.join(git_dirs[0], PATCH_STATE_DIR, name)
+    return os.path.join(tree, "." + PATCH_STATE_DIR)
+
+
+def is_git_patch(patch):
+    with open(patch, "r", errors="ignore") as f:
+        for line in f:
+            if line.startswith("diff --git "):
+                return True
+    return False
+
+
+# Runs git apply or patch on tree, returns True if it succeeded
+def run_patch(logFile, tree, patch, strip, reverse=False, check=False):
+    cmd = "cd " + tree + ";"
+    if get_git_root(tree) == os.path.abspath(tree) and is_git_patch(patch):
+        cmd += "git apply -p" + str(strip)
+        if reverse:
+            cmd += " -R"
+        if check:
+            cmd += " --check"
+        cmd += " " + patch
+    else:
+        cmd += "patch -f -p" + str(strip)
+        if reverse:
+            cmd += " -R"
+        if check:
+            cmd += " --dry-run"
+        cmd += " < " + patch
+    cmd += " && echo " + PATCH_OK
+    return PATCH_OK in execshellcmd(cmd, logFile, None)
+
+
+def read_patch_state(state_dir):
+    state_file = os.path.join(state_dir, "state.json")
+    if not os.path.isfile(state_file):
+        return None
+    try:
+        with open(state_file, "r") as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+
+def write_patch_state(state_dir, base, strip, applied):
+    # applied: [(patch path, sha256)]
+    if os.path.isdir(state_dir):
+        shutil.rmtree(state_dir)
+    os.makedirs(state_dir)
+    names = []
+    for i, (patch, digest) in enumerate(applied):
+        name = str(i) + "-" + os.path.basename(patch)
+        shutil.copyfile(patch, os.path.join(state_dir, name))
+        names.append(name)
+    state = dict()
+    state["base"] = base
+    state["strip"] = strip
+    state["patches"] = [digest for patch, digest in applied]
+    state["files"] = names
+    with open(os.path.join(state_dir, "state.json"), "w") as f:
+        json.dump(state, f, indent=4)
+
+
+# Revert the recorded stack, a patch which can not be reverted is taken as not applied,
+# e.g. after a git reset of the tree
+def revert_patch_state(logFile, tree, state_dir, state):
+    for name in reversed(state["files"]):
+        patch = os.path.join(state_dir, name)
+        if os.path.isfile(patch) and run_patch(logFile, tree, patch, state["strip"], reverse=True, check=True):
+            print("Reverting " + name[name.index("-") + 1:] + " in " + tree)
+            run_patch(logFile, tree, patch, state["strip"], reverse=True)
+    shutil.rmtree(state_dir)
+
+
+# Apply patches (paths, in order) to tree, strip as in patch -p
+# base identifies the sources of tree, default: HEAD of the repo containing tree
+# Returns True if tree carries exactly the stack afterwards
+def apply_patches(logFile, tree, patches, strip=1, base=None):
+    tree = os.path.abspath(tree)
+    if base is None:
+        git_root = get_git_root(tree)
+        base = read_git_head(git_root) if git_root else None
+    digests = [file_sha256(patch) for patch in patches]
+    state_dir = get_patch_state_dir(tree)
+    state = read_patch_state(state_dir)
+    if state is not None:
+        if state["base"] == base and state["patches"] == digests:
+            return True
+        revert_patch_state(logFile, tree, state_dir, state)
+    applied = []
+    for patch, digest in zip(patches, digests):
+        if run_patch(logFile, tree, patch, strip, check=True):
+            print("Applying " + os.path.basename(patch) + " to " + tree)
+            if not run_patch(logFile, tree, patch, strip):
+                print("Applying " + os.path.basename(patch) + " to " + tree + " failed")
+                break
+        elif run_patch(logFile, tree, patch, strip, reverse=True, check=True):
+            # Patched before its application was recorded
+            print(os.path.basename(patch) + " is already applied to " + tree)
+        else:
+            print(os.path.basename(patch) + " does not apply to " + tree)
+            break
+        applied.append((patch, digest))
+    write_patch_state(state_dir, base, strip, applied)
+    return len(applied) == len(patches)
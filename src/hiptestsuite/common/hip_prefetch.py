@@ -0,0 +1,97 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.common.hip_get_packages import HipPackages
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+# cfg.repos key -> reponame of HipPackages.pull_repo
+PULL_REPO_NAMES = {
+    "hip": "HIP",
+    "hip_examples": "hip_examples",
+    "mixbench": "mixbench",
+    "gpu_stream": "gpu-stream",
+    "mgbench": "mgbench",
+    "cuda_grep": "cudagrep",
+    "cuda_memtest": "cudamemtest",
+    "quicksilver": "quicksilver",
+    "gridtools": "gridtools",
+    "gtbench": "gtbench",
+    "kokkos": "kokkos",
+    "mfem": "mfem",
+    "Laghos": "Laghos",
+}
+
+
+# cfg.repos keys of the testers' required_repos, in the order the tests run
+def get_required_repos(tests):
+    required_repos = []
+    for test in tests:
+        for repo in getattr(test.tester, "required_repos", []):
+            if repo not in required_repos:
+                required_repos.append(repo)
+    return required_repos
+
+
+# Pulls the repos on a bounded thread pool while the tests run.
+# A test pulling a repo which is still being fetched waits for it in pull_repo
+# and then finds it up to date, a failed prefetch is retried by the test itself.
+class RepoPrefetch():
+    def __init__(self, repos, log_location, max_workers=4):
+        self.repos = repos
+        self.log_location = log_location
+        self.max_workers = max_workers
+        self.pool = None
+        self.futures = dict()
+
+    def pull(self, key):
+        repo = self.repos[key]
+        branch = repo["branch"] if repo["branch"] != None else ""
+        commitId = repo["commit_id"] if repo["commit_id"] != None else ""
+        with open(os.path.join(self.log_location, key + ".log"), 'w+') as logFile:
+            return HipPackages().pull_repo(logFile, repo["repo_url"],\
+            branch, commitId, PULL_REPO_NAMES[key])
+
+    # Returns the cfg.repos keys being prefetched
+    def start(self, keys):
+        keys = [key for key in keys if key in PULL_REPO_NAMES and key in self.repos\
+        and self.repos[key]["repo_url"] != None]
+        if not keys:
+            return keys
+        os.makedirs(self.log_location, exist_ok=True)
+        self.pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        for key in keys:
+            self.futures[key] = self.pool.submit(self.pull, key)
+        return keys
+
+    # Waits for the pending pulls, returns cfg.repos key -> True/False
+    def wait(self):
+        results = dict()
+        for key, future in self.futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as error:
+                print("Prefetching " + key + " failed: " + str(error))
+                results[key] = False
+        if self.pool != None:
+            self.pool.shutdown()
+            self.pool = None
+        return results
@@ -0,0 +1,132 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+import glob
+import json
+import os
+import zipfile
+
+# Retention of the report/<timestamp> dirs. The last cfg.report_retention runs
+# are kept as they are, the logs of older runs are packed into one zip per run
+# (report/<timestamp>/logs.zip, the zip central directory indexes the logs).
+# The json files of a run (report.json, build manifest) stay next to the zip,
+# and report.json gets "log_archive" set. Single logs are extracted on demand
+# with --extract-logs.
+
+REPORT_LOG_ARCHIVE = "logs.zip"
+
+
+# Paths of the compacted files relative to run_dir, the top level json files are kept
+# Dirs are included (with a trailing /), tests may leave their log dirs empty
+def get_run_logs(run_dir):
+    logs = []
+    for dirpath, dirnames, filenames in os.walk(run_dir):
+        dirnames.sort()
+        for dirname in dirnames:
+            logs.append(os.path.relpath(os.path.join(dirpath, dirname), run_dir) + "/")
+        for filename in sorted(filenames):
+            path = os.path.relpath(os.path.join(dirpath, filename), run_dir)
+            if path == REPORT_LOG_ARCHIVE or (dirpath == run_dir and filename.endswith(".json")):
+                continue
+            logs.append(path)
+    return logs
+
+
+def remove_empty_dirs(run_dir):
+    for dirpath, dirnames, filenames in os.walk(run_dir, topdown=False):
+        if dirpath != run_dir and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+
+
+def compact_run(run_dir):
+    archive = os.path.join(run_dir, REPORT_LOG_ARCHIVE)
+    logs = get_run_logs(run_dir)
+    if not [log for log in logs if not log.endswith("/")]:
+        # Nothing new to pack, dirs left from an extraction are dropped
+        if os.path.isfile(archive):
+            remove_empty_dirs(run_dir)
+        return False
+    if os.path.isfile(archive):
+        # Logs extracted from the archive are dropped again, new files are added
+        with zipfile.ZipFile(archive, "r") as zf:
+            archived = set(zf.namelist())
+        added = [log for log in logs if log not in archived]
+        if added:
+            with zipfile.ZipFile(archive, "a", zipfile.ZIP_DEFLATED) as zf:
+                for log in added:
+                    zf.write(os.path.join(run_dir, log), log)
+    else:
+        with zipfile.ZipFile(archive + ".tmp", "w", zipfile.ZIP_DEFLATED) as zf:
+            for log in logs:
+                zf.write(os.path.join(run_dir, log), log)
+        os.replace(archive + ".tmp", archive)
+    for log in logs:
+        if not log.endswith("/"):
+            os.remove(os.path.join(run_dir, log))
+    remove_empty_dirs(run_dir)
+    report_json = os.path.join(run_dir, "report.json")
+    with open(report_json, "r", encoding="utf-8") as f:
+        json_root = json.load(f)
+    if json_root.get("log_archive") != REPORT_LOG_ARCHIVE:
+        json_root["log_archive"] = REPORT_LOG_ARCHIVE
+        with open(report_json + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(json_root, f, ensure_ascii=False, indent=4)
+        os.replace(report_json + ".tmp", report_json)
+    return True
+
+
+# Compact all runs in report_root except the last keep ones
+# Runs without report.json are still running (or were killed) and are left alone
+# Returns the compacted run dirs
+def compact_reports(report_root, keep):
+    run_dirs = sorted(run_dir for run_dir in glob.glob(os.path.join(report_root, "*")) if os.path.isdir(run_dir))
+    compacted = []
+    for run_dir in run_dirs[:max(len(run_dirs) - keep, 0)]:
+        if not os.path.isfile(os.path.join(run_dir, "report.json")):
+            continue
+        try:
+            if compact_run(run_dir):
+                compacted.append(run_dir)
+        except (OSError, ValueError, zipfile.BadZipFile) as error:
+            print("Compacting " + run_dir + " failed: " + str(error))
+    return compacted
+
+
+# run: timestamp of a run in report_root or a run dir
+def get_run_dir(report_root, run):
+    if os.path.isdir(run):
+        return run
+    return os.path.join(report_root, run)
+
+
+# Extract the logs of tests (test names, default all) of a compacted run
+# Returns the extracted paths, None if the run has no log archive
+def extract_logs(run_dir, tests=None):
+    archive = os.path.join(run_dir, REPORT_LOG_ARCHIVE)
+    if not os.path.isfile(archive):
+        return None
+    prefixes = None
+    if tests:
+        prefixes = [test.lower() + ".log.d/" for test in tests]
+    extracted = []
+    with zipfile.ZipFile(archive, "r") as zf:
+        for name in zf.namelist():
+            if prefixes is None or any(name.startswith(prefix) for prefix in prefixes):
+                extracted.append(zf.extract(name, run_dir))
+    return extracted
@@ -0,0 +1,304 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from hiptestsuite.common.hip_build_dirs import BUILD_OUT_DIR
+from hiptestsuite.common.hip_get_packages import repo_states
+from hiptestsuite.common.hip_locks import exclusive_lock
+
+import fcntl
+import glob
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+# Disk usage of the trees the testsuite keeps between runs:
+#   repo:         cloned repos (HipPackages.get_repo_paths)
+#   prerequisite: third party installs of the build graph (boost, hypre, ...)
+#   build:        build roots under build/out/<key>
+#   report:       report/<timestamp> dirs
+# Every use of an item touches its stamp in build/usage, the mtime of the
+# stamp is the last use. Above cfg.storage_quota (or below cfg.storage_min_free
+# free space) the least recently used items are removed until the limits are
+# met again. Items used by the current run are never removed, and while
+# another run.py process is active only report dirs are.
+
+USAGE_DIR = "build/usage"
+RUNS_DIR = "build/runs"
+
+SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+# "500M", "200G", "1.5T" or a number of bytes
+def parse_size(size):
+    if size is None or isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)B?\s*", str(size), re.IGNORECASE)
+    if not match:
+        raise ValueError("Invalid size " + str(size))
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size):
+    for unit in ["T", "G", "M", "K"]:
+        if size >= SIZE_UNITS[unit]:
+            return "%.1f%s" % (size / SIZE_UNITS[unit], unit)
+    return str(size)
+
+
+# Allocated bytes of path, symlinks are not followed
+def get_tree_size(path):
+    if not os.path.lexists(path):
+        return 0
+    st = os.lstat(path)
+    if not os.path.isdir(path) or os.path.islink(path):
+        return st.st_blocks * 512
+    size = st.st_blocks * 512
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in dirnames + filenames:
+            try:
+                size += os.lstat(os.path.join(dirpath, name)).st_blocks * 512
+            except OSError:
+                pass
+    return size
+
+
+def get_usage_stamp(kind, name):
+    return os.path.join(os.getcwd(), USAGE_DIR, kind + "-" + name)
+
+
+# Run scoped record of the items used by this run, they are kept from eviction
+# Uses are only recorded while a run with a quota or a free space limit is active
+class StorageUsage():
+    def __init__(self):
+        self.enabled = False
+        self.used = set()
+        self.lock = threading.Lock()
+
+
+storage_usage = StorageUsage()
+
+
+def mark_used(kind, name):
+    if not storage_usage.enabled:
+        return
+    with storage_usage.lock:
+        storage_usage.used.add((kind, name))
+    stamp = get_usage_stamp(kind, name)
+    os.makedirs(os.path.dirname(stamp), exist_ok=True)
+    with open(stamp, "a"):
+        pass
+    os.utime(stamp, None)
+
+
+class StorageItem():
+    def __init__(self, kind, name, paths, last_used):
+        self.kind = kind
+        self.name = name
+        self.paths = paths
+        self.last_used = last_used
+        self.size = 0
+
+    def id(self):
+        return self.kind + "-" + self.name
+
+
+class StorageManager():
+    # repo_paths: reponame -> clone path, graph: BuildGraph of the prerequisites
+    # report_root: parent dir of the report/<timestamp> dirs
+    def __init__(self, quota, min_free, repo_paths, graph, report_root):
+        self.quota = quota
+        self.min_free = min_free
+        self.repo_paths = repo_paths
+        self.graph = graph
+        self.report_root = report_root
+        self.run_file = None
+        self.run_fd = None
+        self.evicted = []
+        self.warned = False
+
+    def root(self):
+        return os.getcwd()
+
+    def is_enabled(self):
+        return bool(self.quota) or bool(self.min_free)
+
+    # Register this process as active run, other runs keep their trees
+    def start_run(self, report_dir):
+        runs_dir = os.path.join(self.root(), RUNS_DIR)
+        os.makedirs(runs_dir, exist_ok=True)
+        self.run_file = os.path.join(runs_dir, str(os.getpid()) + ".run")
+        self.run_fd = os.open(self.run_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o666)
+        fcntl.flock(self.run_fd, fcntl.LOCK_EX)
+        os.write(self.run_fd, os.path.abspath(report_dir).encode())
+        storage_usage.enabled = True
+
+    def finish_run(self):
+        if self.run_fd is None:
+            return
+        storage_usage.enabled = False
+        os.remove(self.run_file)
+        fcntl.flock(self.run_fd, fcntl.LOCK_UN)
+        os.close(self.run_fd)
+        self.run_fd = None
+
+    # Report dirs of the other active runs, None if there are none
+    # Files left by runs which were killed are removed
+    def get_other_runs(self):
+        report_dirs = []
+        for run_file in glob.glob(os.path.join(self.root(), RUNS_DIR, "*.run")):
+            if run_file == self.run_file:
+                continue
+            try:
+                fd = os.open(run_file, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+                os.remove(run_file)
+            except BlockingIOError:
+                report_dirs.append(os.read(fd, 4096).decode())
+            finally:
+                os.close(fd)
+        return report_dirs if report_dirs else None
+
+    def get_last_used(self, kind, name, paths):
+        stamp = get_usage_stamp(kind, name)
+        if os.path.isfile(stamp):
+            return os.stat(stamp).st_mtime
+        # Trees from before usage was tracked
+        return max([os.stat(path).st_mtime for path in paths if os.path.exists(path)] + [0])
+
+    def get_items(self):
+        items = []
+        repo_dirs = []
+        for reponame, path in sorted(self.repo_paths.items()):
+            if os.path.isdir(path):
+                items.append(StorageItem("repo", reponame, [path], self.get_last_used("repo", reponame, [path])))
+                repo_dirs.append(os.path.abspath(path) + os.sep)
+        for name, node in sorted(self.graph.nodes.items()):
+            # Per configuration installs are part of the build roots
+            if self.graph.is_keyed(node):
+                continue
+            paths = [self.graph.abspath(path) for path in node.clean_paths]
+            # Installs inside a repo count as part of the repo
+            paths = [path for path in paths if os.path.lexists(path) and\
+            not any(path.startswith(repo_dir) for repo_dir in repo_dirs)]
+            if paths:
+                items.append(StorageItem("prerequisite", name, paths, self.get_last_used("prerequisite", name, paths)))
+        for path in sorted(glob.glob(os.path.join(self.root(), BUILD_OUT_DIR, "*"))):
+            if os.path.isdir(path):
+                key = os.path.basename(path)
+                items.append(StorageItem("build", key, [path], self.get_last_used("build", key, [path])))
+        for path in sorted(glob.glob(os.path.join(self.report_root, "*"))):
+            if os.path.isdir(path):
+                timestamp = os.path.basename(path)
+                items.append(StorageItem("report", timestamp, [path], self.get_last_used("report", timestamp, [path])))
+        return items
+
+    # Sizes are cached in build/usage/sizes.json, an item is measured again once it was used
+    def measure(self, items, used):
+        sizes_file = os.path.join(self.root(), USAGE_DIR, "sizes.json")
+        sizes = dict()
+        if os.path.isfile(sizes_file):
+            try:
+                with open(sizes_file, "r") as f:
+                    sizes = json.load(f)
+            except ValueError:
+                sizes = dict()
+        measured = dict()
+        for item in items:
+            cached = sizes.get(item.id())
+            if cached is not None and cached[1] > item.last_used and (item.kind, item.name) not in used:
+                item.size = cached[0]
+            else:
+                now = time.time()
+                item.size = sum(get_tree_size(path) for path in item.paths)
+                cached = [item.size, now]
+            measured[item.id()] = cached
+        os.makedirs(os.path.dirname(sizes_file), exist_ok=True)
+        with open(sizes_file + "." + str(os.getpid()), "w") as f:
+            json.dump(measured, f)
+        os.replace(sizes_file + "." + str(os.getpid()), sizes_file)
+
+    def is_over_limit(self, total):
+        if self.quota and total > self.quota:
+            return True
+        if self.min_free and shutil.disk_usage(self.root()).free < self.min_free:
+            return True
+        return False
+
+    def is_protected(self, item, used, other_runs):
+        if (item.kind, item.name) in used:
+            return True
+        if other_runs is not None:
+            if item.kind != "report":
+                return True
+            return os.path.abspath(item.paths[0]) in other_runs
+        if item.kind == "prerequisite":
+            # Cleaning a prerequisite cleans everything built on top of it
+            return any(("prerequisite", name) in used for name in self.graph.dependents([item.name]))
+        return False
+
+    def evict(self, item):
+        print("Evicting " + item.kind + " " + item.name + " (" + format_size(item.size) + ", last used " +\
+        time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(item.last_used)) + ")")
+        if item.kind == "repo":
+            with exclusive_lock(item.paths[0]):
+                shutil.rmtree(item.paths[0], ignore_errors=True)
+            repo_states.invalidate(item.name)
+        elif item.kind == "prerequisite":
+            self.graph.clean([item.name])
+        elif item.kind == "build":
+            shutil.rmtree(item.paths[0], ignore_errors=True)
+            for stamp in glob.glob(os.path.join(self.graph.stamp_dir(), "*." + item.name + ".stamp")):
+                os.remove(stamp)
+        else:
+            shutil.rmtree(item.paths[0], ignore_errors=True)
+        stamp = get_usage_stamp(item.kind, item.name)
+        if os.path.isfile(stamp):
+            os.remove(stamp)
+        self.evicted.append(item.id())
+
+    # Evict least recently used items until the quota and the free space limit are met
+    def enforce(self):
+        if not self.is_enabled():
+            return
+        with storage_usage.lock:
+            used = set(storage_usage.used)
+        items = self.get_items()
+        # Items of this run grow while it builds
+        self.measure(items, used)
+        total = sum(item.size for item in items)
+        if not self.is_over_limit(total):
+            return
+        other_runs = self.get_other_runs()
+        for item in sorted(items, key=lambda item: item.last_used):
+            if not self.is_over_limit(total):
+                break
+            if self.is_protected(item, used, other_runs):
+                continue
+            self.evict(item)
+            total -= item.size
+        if self.is_over_limit(total) and not self.warned:
+            self.warned = True
+            print("Storage is over its limits (" + format_size(total) + " used" +\
+            (", another run is active" if other_runs is not None else "") + "), nothing left to evict")
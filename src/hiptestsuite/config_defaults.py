@@ -0,0 +1,53 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Defaults of the cfg.py options which the cfg.py of other tester packages
+# (examples/cfg.py) may leave out, see ../../cfg.py for what they mean
+CONFIG_DEFAULTS = {
+    "CONFORMANCE_VERBOSE": None,
+    "build_for_gfx_target": None,
+    "build_for_cuda_target": "compute_70",
+    "test_query": None,
+    "run_history": None,
+    "time_budget": None,
+    "import_artifacts": None,
+    "export_artifacts": None,
+    "build_only": None,
+    "run_only": None,
+    "compiler_cache": None,
+    "compiler_cache_compiler": None,
+    "repo_cache": None,
+    "download_cache": None,
+    "prefetch_repos": 0,
+    "offline_manifest": None,
+    "storage_quota": None,
+    "storage_min_free": None,
+    "report_retention": None,
+    "test_catalog": None,
+    "refresh_test_catalog": False,
+}
+
+
+# Sets the options config does not define to their defaults, called by the entry points
+# (executeTests, list_tests) before any option is read
+def set_config_defaults(config):
+    for name, value in CONFIG_DEFAULTS.items():
+        if not hasattr(config, name):
+            setattr(config, name, value)
@@ -25,13 +25,22 @@ from hiptestsuite.conformance.conformance_test_classifier import CONFORMANCE
 from hiptestsuite.test_classifier import TestClassifier
 from hiptestsuite.conformance.hip_dtest_build_amd import BuildRunAmd
 from hiptestsuite.conformance.hip_dtest_build_nvidia import BuildRunNvidia
+from hiptestsuite.conformance.hip_dtest_discovery import discover_catch_tests
+from hiptestsuite.conformance.hip_dtest_build_common import get_ctest_file, read_ctest_file
+from hiptestsuite.test_catalog import TestCatalog
 from hiptestsuite.common.hip_get_packages import HipPackages
+from hiptestsuite.common.hip_execution_mode import is_run_only, stop_if_build_only
+from hiptestsuite.common.hip_locks import shared_lock
+from hiptestsuite.common.hip_build_graph import prerequisites
 from hiptestsuite.common.hip_shell import *
 
 import os
 
 # Common class to clone, set up, build and run test
 class PrepareTest():
+    # cfg.repos keys pulled by this test, prefetched by TestersExecutor
+    required_repos = ["hip"]
+
     def __init__(self):
         self.hiprepo = "" # Default
         self.hipbranch = ""
@@ -71,13 +80,18 @@ class PrepareTest():
             print("Invalid Platform")
             return False
 
+        # Prebuilt Catch2 binaries are only validated in run only mode
+        if is_run_only():
+            return self.buildobj.validate_hipcatch_build()
         return self.buildobj.build_package()
 
     # Run test
     def runtest(self, logFile, verbosity, testcase):
         status = "Failed"
         if self.buildobj != None:
-            status = self.buildobj.runtest(logFile, verbosity, testcase)
+            # Catch2 is rebuilt under the exclusive lock of its build node
+            with shared_lock(prerequisites.stamp_file("hip_catch2")):
+                status = self.buildobj.runtest(logFile, verbosity, testcase)
         return status
 
     # Get ctest info
@@ -90,57 +104,134 @@ class PrepareTest():
 
 # Test HIP Dtest/
 class Hipconformance(Tester, PrepareTest):
+    # The tests may be listed from the test catalog cache without getTests
+    cache_tests = True
+    # Quick listing is empty until HIP is downloaded
+    partial_quick_tests = True
+
     def __init__(self):
         Tester.__init__(self)
         PrepareTest.__init__(self)
+        self.prepared = False
+        # ctest names of the build, None until they are read
+        self.ctestnames = None
+        self.ctest_listed = False
 
-    def getTests(self, get_tests_data: HIPBuildData) -> List[Test]:
-        # Set repo info
-        testlist = []
-        if get_tests_data.quick:
-            return testlist
-        self.logfd = open(get_tests_data.log_location + "/Hipconformance.log", 'w+')
-        status = self.setrepoinfo(get_tests_data)
+    def get_catch_path(self):
+        return os.path.join(os.getcwd(), "src/hiptestsuite/conformance/HIP/tests/catch")
+
+    # Download HIP, data: HIPBuildData/HIPTestData
+    def download(self, data, log_location):
+        if self.logfd is None:
+            self.logfd = open(log_location + "/Hipconformance.log", 'w+')
+        status = self.setrepoinfo(data)
         if not status:
             self.downloadresult = False
-            return testlist
+            return False
 
         # Download repos
-        self.downloadresult = self.downloadTest(self.logfd, get_tests_data.HIP_PLATFORM)
+        self.downloadresult = self.downloadTest(self.logfd, data.HIP_PLATFORM)
         if not self.downloadresult:
             cmd = "echo \"Rocm packages download failed!\";"
             execshellcmd(cmd, self.logfd, None)
-            return testlist
+            return False
+        return True
+
+    # Download and build HIP Catch2, done by the first test to run
+    def prepare(self, data, log_location):
+        self.prepared = True
+        if not self.download(data, log_location):
+            return False
 
         print("Building HIP package ...")
         # Build Rocclr and Hip
-        self.buildresult = self.build_package(self.logfd, get_tests_data.HIP_PLATFORM)
+        self.buildresult = self.build_package(self.logfd, data.HIP_PLATFORM)
         if not self.buildresult:
             cmd = "echo \"Rocm packages build failed!!\";"
             execshellcmd(cmd, self.logfd, None)
             print("Rocm packages build failed!")
-            return testlist
+            return False
 
         print("Building HIP package completed")
-        # Fetch all the ctests
-        dtestnamelist = self.get_ctest_list()
+        # The ctest list is removed by a build of Catch2 and written by its first use
+        if not os.path.isfile(get_ctest_file()):
+            self.check_discovery(data)
+        return True
+
+    # Warn about the tests ctest registers which the sources parser missed. They
+    # are listed from the ctest list of the build from now on, the cached
+    # listing of the test catalog is dropped for that
+    def check_discovery(self, data):
+        platform = data.HIP_PLATFORM.name if data.HIP_PLATFORM else "amd"
+        dtestnamelist = discover_catch_tests(self.get_catch_path(), platform)
+        ctestnames = self.get_ctest_list()
+        if not dtestnamelist or not ctestnames:
+            return
+        dtestnames = set(dtestnamelist)
+        missed = [ctestname for ctestname in ctestnames if ctestname not in dtestnames]
+        if not missed:
+            return
+        print("Warning: " + str(len(missed)) + " HIP Catch2 tests registered with ctest are not found in the sources: " +\
+        ", ".join(missed[:10]) + (", ..." if len(missed) > 10 else "") + ". They are listed from the next test listing on")
+        if data.config.test_catalog is not False:
+            test_catalog = TestCatalog(path=data.config.test_catalog)
+            test_catalog.drop_tests(self)
+            test_catalog.save()
+
+    # The tests are listed from the Catch2 sources, see hip_dtest_discovery.py
+    # Quick listing reads them only from an existing HIP checkout
+    def getTests(self, get_tests_data: HIPBuildData) -> List[Test]:
+        testlist = []
+        if get_tests_data.quick:
+            if not os.path.isdir(self.get_catch_path()):
+                return testlist
+        elif not self.download(get_tests_data, get_tests_data.log_location):
+            return testlist
+
+        platform = get_tests_data.HIP_PLATFORM.name if get_tests_data.HIP_PLATFORM else "amd"
+        dtestnamelist = discover_catch_tests(self.get_catch_path(), platform)
+        if not dtestnamelist:
+            if get_tests_data.quick:
+                return testlist
+            # Sources not understood, build Catch2 and ask ctest
+            if not self.prepare(get_tests_data, get_tests_data.log_location):
+                return testlist
+            dtestnamelist = self.get_ctest_list()
+        else:
+            # Tests the sources parser missed, known once Catch2 was built
+            ctestnames = read_ctest_file(get_ctest_file())
+            if ctestnames:
+                dtestnames = set(dtestnamelist)
+                dtestnamelist += [ctestname for ctestname in ctestnames if ctestname not in dtestnames]
 
         for testname in dtestnamelist:
             test = Test()
             test.test_name = testname
-            category = CONFORMANCE()
-            category.add_matched_with_names()
-            test.classifiers = [category]
+            test.classifiers = self.get_test_classifiers()
             test.tester = self
             testlist.append(test)
         return testlist
 
+    # True if testcase is the name of a test of the built Catch2
+    def is_registered(self, testcase):
+        if self.ctestnames is None:
+            ctestnames = self.get_ctest_list()
+            # ctest is asked once, every test counts as registered if it fails
+            self.ctest_listed = ctestnames is not None
+            self.ctestnames = set(ctestnames) if ctestnames else set()
+        if not self.ctest_listed:
+            return True
+        return testcase in self.ctestnames
+
     def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
         category = CONFORMANCE()
         category.add_matched_with_names()
         return [category]
 
     def test(self, test_data: HIPTestData):
+        if not self.prepared:
+            self.prepare(test_data, test_data.log_location)
+
         if not self.downloadresult:
             test_data.test_result = TestResult.ERROR
             cmd = "echo \"HIP Catch2 Build FAILED!\";"
@@ -152,6 +243,12 @@ class Hipconformance(Tester, PrepareTest):
             cmd = "echo \"HIP Catch2 Build FAILED!\";"
             execshellcmd(cmd, self.logfd, None)
             return
+        stop_if_build_only([os.path.join(self.buildobj.builddir, "hipTestMain")])
+        if not self.is_registered(test_data.test.test_name):
+            # Listed from the sources but not built for this platform
+            print(test_data.test.test_name + " is not registered with ctest, skipping")
+            test_data.test_result = TestResult.SKIP
+            return
         # Build test
         print("Running test: " + test_data.test.test_name + "..........")
         testcase = test_data.test.test_name
@@ -22,6 +22,29 @@ import os
 import tempfile
 import re
 from hiptestsuite.common.hip_shell import execshellcmd_largedump, execshellcmd
+from hiptestsuite.common.hip_build_dirs import get_build_dir
+
+
+def get_ctest_file():
+    hippath = os.path.join(os.getcwd(), "src/hiptestsuite/conformance/HIP")
+    return os.path.join(get_build_dir(hippath), "build", "ctest.txt")
+
+
+# Test names of a ctest -N listing, None if Catch2 was not built
+def read_ctest_file(ctest_file):
+    if not os.path.isfile(ctest_file):
+        return None
+    testlist = []
+    with open(ctest_file, "r") as ctestlog:
+        for test in ctestlog:
+            if re.search(r"Test *#\d*:", test) != None:
+                dtest = re.sub(r"Test *#\d*: ", "", test)
+                dtest = re.sub("/", ".", dtest)
+                dtest = dtest.lstrip()
+                dtest = dtest.rstrip()
+                testlist.append(dtest)
+    return testlist
+
 
 class BuildRunCommon():
     '''
@@ -31,14 +54,15 @@ class BuildRunCommon():
     def __init__(self, logfile):
         self.logfile = logfile
         self.hippath = os.path.join(os.getcwd(), "src/hiptestsuite/conformance/HIP")
-        self.ctest_file = os.path.join(self.hippath, "build/ctest.txt")
-        self.builddir = os.path.join(self.hippath, "build")
+        # Catch2 is built out of tree in the build root of the configuration
+        self.builddir = os.path.join(get_build_dir(self.hippath), "build")
+        self.ctest_file = get_ctest_file()
         self.expected_catch_binaries = ["ABMTests","MultiProcTests","UnitTests"]
 
     # Validate if HIP build is successful
     def validate_hipcatch_build(self):
         status = True
-        catch_binary_path = os.path.join(self.hippath, "build/hipTestMain")
+        catch_binary_path = os.path.join(self.builddir, "hipTestMain")
         for catchbin in self.expected_catch_binaries:
             if not os.path.isfile(\
             os.path.join(catch_binary_path, catchbin)):
@@ -53,17 +77,7 @@ class BuildRunCommon():
             cmdexc += "ctest -N;"
             with open(self.ctest_file, "w+") as ctestlog:
                 execshellcmd_largedump(cmdexc, self.logfile, ctestlog, None)
-
-        testlist = []
-        with open(self.ctest_file, "r") as ctestlog:
-            for test in ctestlog:
-                if re.search("Test *#\d*:", test) != None:
-                    dtest = re.sub("Test *#\d*: ", "", test)
-                    dtest = re.sub("/", ".", dtest)
-                    dtest = dtest.lstrip()
-                    dtest = dtest.rstrip()
-                    testlist.append(dtest)
-        return testlist
+        return read_ctest_file(self.ctest_file)
 
     # Parse the test result
     def parsetest(self, log):
@@ -24,6 +24,7 @@ import json
 import re
 from hiptestsuite.common.hip_shell import execshellcmd_largedump, execshellcmd
 from hiptestsuite.conformance.hip_dtest_build_common import BuildRunCommon
+from hiptestsuite.common.hip_build_graph import prerequisites
 
 class BuildRunNvidia(BuildRunCommon):
     '''
@@ -40,34 +41,33 @@ class BuildRunNvidia(BuildRunCommon):
         env += "export HIP_RUNTIME=cuda;"
         return env
 
-    # Build HIP Catch2 for NVIDIA platform
+    # Build HIP Catch2 through the prerequisites graph
     def build_package(self):
-        buildSuccess = True
         if not os.path.exists("/opt/rocm"):
             print("ROCm not installed. Exiting!")
             return False
+        return prerequisites.build(["hip_catch2"], self)
+
+    # Build HIP Catch2 for NVIDIA platform
+    def build_catch2(self):
+        print("Catch2 test not built. Building Catch2 ..")
+        # The ctest list of an earlier build is stale
+        if os.path.isfile(self.ctest_file):
+            os.remove(self.ctest_file)
+        cmd = self.setenv()
+        cmd += "mkdir -p " + self.builddir + "; cd " + self.builddir + ";"
+        cmd += "cmake -DHIP_COMPILER=nvcc -DHIP_PLATFORM=nvidia -DHIP_RUNTIME=cuda -DHIP_PATH=/opt/rocm/hip " + os.path.join(self.hippath, "tests/catch") + ";"
+        cmd += "make -j build_tests;"
+        cmdexc = cmd
+        runlogdump = tempfile.TemporaryFile("w+")
+        execshellcmd_largedump(cmdexc, self.logfile, runlogdump, self.envtoset)
+        runlogdump.close()
+
+        # Validate if HIP build is successful
         isCatchBuilt = self.validate_hipcatch_build()
         if not isCatchBuilt:
-            # Build HIP
-            print("Catch2 test not built. Building Catch2 ..")
-            cmd = self.setenv()
-            cmd += "cd " + self.hippath + ";"
-            cmd += "mkdir build; cd build;"
-            cmd += "cmake -DHIP_COMPILER=nvcc -DHIP_PLATFORM=nvidia -DHIP_RUNTIME=cuda -DHIP_PATH=/opt/rocm/hip ../tests/catch;"
-            cmd += "make -j build_tests;"
-            cmdexc = cmd
-            runlogdump = tempfile.TemporaryFile("w+")
-            execshellcmd_largedump(cmdexc, self.logfile, runlogdump, self.envtoset)
-            runlogdump.close()
-
-            # Validate if HIP build is successful
-            isCatchBuilt = self.validate_hipcatch_build()
-            if not isCatchBuilt:
-                print("HIP Catch2 Build Failed!")
-                return False
-        else:
-            print("HIP Catch2 already Built")
-        return True
+            print("HIP Catch2 Build Failed!")
+        return isCatchBuilt
 
     # Execute test cases
     def runtest(self, log, verbosity, testcase):
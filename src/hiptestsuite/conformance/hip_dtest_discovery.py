@@ -0,0 +1,242 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+import os
+import re
+
+# Lists the HIP Catch2 tests from the sources of tests/catch instead of
+# building them and asking ctest. Directories are followed from
+# tests/catch/CMakeLists.txt through add_subdirectory, a source counts if it
+# is named in the CMakeLists.txt of its directory or of a parent. The tests
+# are the TEST_CASEs of the sources (TEMPLATE_TEST_CASE once per type, as
+# catch_discover_tests registers them), hidden test cases ([.], [!hide]) are
+# left out. #if/#ifdef blocks on the __HIP_PLATFORM_* macros are evaluated for
+# the platform, any other condition is taken as true, so the list may hold a
+# few tests ctest does not know. Those are reported as SKIP once Catch2 is built,
+# tests ctest knows but the parser missed are reported after the build and
+# listed from its ctest list from then on (Hipconformance.check_discovery).
+
+# HT_AMD/HT_NVIDIA are set to 1/0 by hip_test_common.hh
+PLATFORM_MACROS = {
+    "amd": {"__HIP_PLATFORM_AMD__": True, "__HIP_PLATFORM_HCC__": True,\
+        "__HIP_PLATFORM_NVIDIA__": False, "__HIP_PLATFORM_NVCC__": False,\
+        "HT_AMD": True, "HT_NVIDIA": False},
+    "nvidia": {"__HIP_PLATFORM_AMD__": False, "__HIP_PLATFORM_HCC__": False,\
+        "__HIP_PLATFORM_NVIDIA__": True, "__HIP_PLATFORM_NVCC__": True,\
+        "HT_AMD": False, "HT_NVIDIA": True},
+}
+
+SOURCE_EXTENSIONS = (".cc", ".cpp", ".cxx", ".cu")
+EXCLUDED_DIRS = ["external", "hipTestMain"]
+
+TEST_CASE_RE = re.compile(r'\b(TEST_CASE|TEMPLATE_TEST_CASE|TEMPLATE_TEST_CASE_SIG|SCENARIO)\s*\(')
+CMAKE_SUBDIRECTORY_RE = re.compile(r'add_subdirectory\s*\(\s*"?([^\s")]+)', re.IGNORECASE)
+CMAKE_SOURCE_RE = re.compile(r'[\w./${}-]+\.(?:cc|cpp|cxx|cu)\b')
+
+
+def strip_comments(source):
+    source = re.sub(r'/\*.*?\*/', lambda match: "\n" * match.group(0).count("\n"), source, flags=re.DOTALL)
+    return re.sub(r'//[^\n]*', "", source)
+
+
+# True/False if the condition is decided by the platform macros, None otherwise
+# Other macros are tried as defined and as not defined
+def eval_condition(condition, macros):
+    condition = re.sub(r'defined\s*\(\s*(\w+)\s*\)', r'\1', condition)
+    condition = re.sub(r'defined\s+(\w+)', r'\1', condition)
+    for macro, value in macros.items():
+        condition = re.sub(r'\b' + macro + r'\b', "1" if value else "0", condition)
+    condition = condition.replace("&&", " and ").replace("||", " or ")
+    condition = re.sub(r'!(?!=)', " not ", condition)
+    unknowns = sorted(set(re.findall(r'\b[A-Za-z_]\w*\b', condition)) - set(["and", "or", "not"]))
+    if len(unknowns) > 4 or not re.fullmatch(r'[\w\s()]*', condition):
+        return None
+    values = set()
+    for combination in range(1 << len(unknowns)):
+        expression = condition
+        for i, unknown in enumerate(unknowns):
+            expression = re.sub(r'\b' + unknown + r'\b', "1" if combination & (1 << i) else "0", expression)
+        if re.search(r'\d\d|[2-9]', expression):
+            return None
+        try:
+            values.add(bool(eval(expression, {"__builtins__": {}})))
+        except Exception:
+            return None
+    return values.pop() if len(values) == 1 else None
+
+
+# Source lines outside of the #if blocks excluded for the platform
+def get_active_source(source, macros):
+    lines = []
+    # [active, branch taken (True/False/None unknown)]
+    stack = []
+    active = True
+    for line in source.split("\n"):
+        directive = re.match(r'\s*#\s*(if|ifdef|ifndef|elif|else|endif)\b(.*)', line)
+        if directive is None:
+            if active:
+                lines.append(line)
+            continue
+        keyword, condition = directive.group(1), directive.group(2).strip()
+        if keyword in ["if", "ifdef", "ifndef"]:
+            if keyword == "ifdef":
+                value = eval_condition("defined(" + condition + ")", macros)
+            elif keyword == "ifndef":
+                value = eval_condition("!defined(" + condition + ")", macros)
+            else:
+                value = eval_condition(condition, macros)
+            stack.append([active, value])
+            active = active and value is not False
+        elif keyword == "elif" and stack:
+            parent, taken = stack[-1]
+            value = eval_condition(condition, macros)
+            if taken is True:
+                active = False
+            else:
+                active = parent and value is not False
+                stack[-1][1] = True if value is True else (None if value is None or taken is None else taken)
+        elif keyword == "else" and stack:
+            parent, taken = stack[-1]
+            active = parent and taken is not True
+        elif keyword == "endif" and stack:
+            active = stack.pop()[0]
+    return "\n".join(lines)
+
+
+# Comma separated macro arguments at the top level of the parentheses starting at start
+def split_arguments(source, start):
+    depth = 0
+    arguments = []
+    current = ""
+    in_string = False
+    i = start
+    while i < len(source):
+        c = source[i]
+        if in_string:
+            current += c
+            if c == "\\" and i + 1 < len(source):
+                current += source[i + 1]
+                i += 1
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+            current += c
+        elif c == "(":
+            depth += 1
+            if depth > 1:
+                current += c
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                arguments.append(current.strip())
+                return arguments
+            current += c
+        elif c == "," and depth == 1:
+            arguments.append(current.strip())
+            current = ""
+        else:
+            current += c
+        i += 1
+    return None
+
+
+def unquote(argument):
+    match = re.fullmatch(r'"((?:[^"\\]|\\.)*)"', argument.strip())
+    return match.group(1) if match else None
+
+
+def is_hidden(tags):
+    return tags is not None and ("[." in tags or "[!hide]" in tags)
+
+
+def get_test_cases(source):
+    tests = []
+    for match in TEST_CASE_RE.finditer(source):
+        arguments = split_arguments(source, match.end() - 1)
+        if not arguments:
+            continue
+        name = unquote(arguments[0])
+        if name is None:
+            continue
+        tags = unquote(arguments[1]) if len(arguments) > 1 else None
+        if is_hidden(tags):
+            continue
+        if match.group(1) == "SCENARIO":
+            tests.append("Scenario: " + name)
+        elif match.group(1) == "TEMPLATE_TEST_CASE":
+            for type_name in arguments[2:]:
+                tests.append(name + " - " + type_name)
+        elif match.group(1) == "TEMPLATE_TEST_CASE_SIG":
+            for type_name in arguments[3:]:
+                tests.append(name + " - " + type_name)
+        else:
+            tests.append(name)
+    return tests
+
+
+def read_file(path):
+    with open(path, "r", errors="ignore") as f:
+        return f.read()
+
+
+# Test sources of the directories reached through add_subdirectory
+def get_catch_sources(catch_path):
+    sources = []
+    pending = [(catch_path, [])]
+    visited = set()
+    while pending:
+        directory, parent_listings = pending.pop(0)
+        directory = os.path.normpath(directory)
+        if directory in visited:
+            continue
+        visited.add(directory)
+        cmake_file = os.path.join(directory, "CMakeLists.txt")
+        if not os.path.isfile(cmake_file):
+            continue
+        cmake = re.sub(r'#[^\n]*', "", read_file(cmake_file))
+        listed = set(re.sub(r'^\$\{\w+\}/', "", source) for source in CMAKE_SOURCE_RE.findall(cmake))
+        listings = parent_listings + [(directory, listed)]
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(SOURCE_EXTENSIONS):
+                continue
+            path = os.path.join(directory, filename)
+            for listing_dir, listed in listings:
+                if os.path.relpath(path, listing_dir) in listed or\
+                ("./" + os.path.relpath(path, listing_dir)) in listed:
+                    sources.append(path)
+                    break
+        for subdirectory in CMAKE_SUBDIRECTORY_RE.findall(cmake):
+            if "$" in subdirectory or subdirectory in EXCLUDED_DIRS:
+                continue
+            pending.append((os.path.join(directory, subdirectory), listings))
+    return sources
+
+
+# ctest names of the Catch2 tests under catch_path, in the form of get_all_ctest
+def discover_catch_tests(catch_path, platform):
+    macros = PLATFORM_MACROS.get(platform, PLATFORM_MACROS["amd"])
+    tests = []
+    for source_file in get_catch_sources(catch_path):
+        source = get_active_source(strip_comments(read_file(source_file)), macros)
+        for test in get_test_cases(source):
+            test = re.sub("/", ".", test)
+            if test not in tests:
+                tests.append(test)
+    return tests
@@ -18,16 +18,27 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import contextlib
+import json
+import sys
 import tempfile
 import typing
 from typing import Union, List
 
 from hiptestsuite.TesterRepository import TesterRepository, GetTests
+from hiptestsuite.config_defaults import set_config_defaults
 from hiptestsuite.Test import Test, Quick
 from hiptestsuite.test_classifier import TestClassifier
+from hiptestsuite.tester_index import startup_profile
+from hiptestsuite.run_history import RunHistory
 
 
-def list_tests(quick: bool, cfg, tester_repository=None):
+# output_format: table, json or jsonl, see export_tests
+def list_tests(quick: bool, cfg, tester_repository=None, output_format="table"):
+    set_config_defaults(cfg)
+    if output_format != "table":
+        export_tests(quick=quick, cfg=cfg, tester_repository=tester_repository, output_format=output_format)
+        return
     if not quick:
         print("Generating tests, please wait...")
         print(); print(); print()
@@ -48,6 +59,7 @@ def list_tests(quick: bool, cfg, tester_repository=None):
 
     with tempfile.TemporaryDirectory() as tmpdirname:
         tests = get_tests.get_tests(log_location=tmpdirname, quick=quick)
+    startup_profile.report()
 
     field_names = ["Classifiers", "Test"]
     if pretty_table_installed:
@@ -66,18 +78,7 @@ def list_tests(quick: bool, cfg, tester_repository=None):
             test_info_table.add_row([classifiers_s, test.test_name])
 
     if quick:
-        quick_getTests_testers = list()
-        all_testers = tester_repository.getTesters()
-
-        for tester in all_testers:
-            get_tests_t = typing.get_type_hints(tester.getTests)
-            get_tests_data_t = None
-            if get_tests_t:
-                if "get_tests_data" in get_tests_t:
-                    get_tests_data_t = get_tests_t["get_tests_data"]
-
-            if get_tests_data_t and issubclass(get_tests_data_t, Quick):
-                quick_getTests_testers.append(tester)
+        quick_getTests_testers = get_unlisted_testers(tester_repository, tests)
 
         for tester in quick_getTests_testers:
             if not pretty_table_installed:
@@ -117,6 +118,93 @@ def list_tests(quick: bool, cfg, tester_repository=None):
     """)
 
 
+# Testers whose tests may be left out by a quick listing, shown as *
+def get_unlisted_testers(tester_repository: TesterRepository, tests: List[Test]):
+    quick_getTests_testers = list()
+    # Testers listed from the test catalog have no * entry
+    listed_testers = set(id(test.tester) for test in tests)
+
+    for tester in tester_repository.getTesters():
+        if id(tester) in listed_testers:
+            continue
+        get_tests_t = typing.get_type_hints(tester.getTests)
+        get_tests_data_t = None
+        if get_tests_t:
+            if "get_tests_data" in get_tests_t:
+                get_tests_data_t = get_tests_t["get_tests_data"]
+
+        if get_tests_data_t and issubclass(get_tests_data_t, Quick):
+            quick_getTests_testers.append(tester)
+    return quick_getTests_testers
+
+
+# Tests as json for schedulers, one document (json) or one object per line (jsonl)
+# source is "catalog" for tests taken from the test catalog, "discovery" for tests
+# of getTests and "not_listed" for the testers a quick listing shows as *
+def export_tests(quick: bool, cfg, tester_repository=None, output_format="json"):
+    if tester_repository is None:
+        tester_repository: TesterRepository = TesterRepository()
+        tester_repository.addAllTesters()
+
+    get_tests = GetTests(tester_repository=tester_repository)
+    get_tests.config = cfg
+    get_tests.loadConfig()
+
+    # Messages of the testers go to stderr, stdout is only json
+    with contextlib.redirect_stdout(sys.stderr):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            tests = get_tests.get_tests(log_location=tmpdirname, quick=quick)
+        startup_profile.report()
+
+    history = RunHistory(path=cfg.run_history)
+    entries = list()
+    for test in tests:
+        entry = get_tester_entry(test.tester, test.classifiers, cfg)
+        entry["name"] = test.test_name
+        entry["also_matched_with_test_names"] = test.also_matched_with_test_names
+        entry["source"] = "catalog" if test.tester in get_tests.cached_testers else "discovery"
+        runs = history.get_runs(test.test_name)
+        entry["history"] = {
+            "runs": len(runs),
+            "last_status": runs[-1]["status"] if runs else None,
+            "duration": history.get_duration(test.test_name),
+            "failure_rate": history.get_failure_rate(test.test_name)
+        }
+        entries.append(entry)
+    if quick:
+        for tester in get_unlisted_testers(tester_repository, tests):
+            entry = get_tester_entry(tester, tester.get_test_classifiers(), cfg)
+            entry["name"] = None
+            entry["also_matched_with_test_names"] = None
+            entry["source"] = "not_listed"
+            entry["history"] = None
+            entries.append(entry)
+
+    if output_format == "jsonl":
+        for entry in entries:
+            print(json.dumps(entry, sort_keys=True))
+    else:
+        print(json.dumps({"quick": quick, "platform": cfg.HIP_PLATFORM if cfg.HIP_PLATFORM else "amd", "tests": entries},
+                         indent=1, sort_keys=True))
+
+
+def get_tester_entry(tester, classifiers: List[TestClassifier], cfg):
+    entry = dict()
+    entry["classifiers"] = None
+    if classifiers is not None:
+        entry["classifiers"] = [get_one_sequence(classifier.matched_with_names) for classifier in classifiers
+                                if classifier.matched_with_names]
+    entry["tester"] = tester.__class__.__name__
+    entry["tester_module"] = tester.__class__.__module__
+    required_repos = dict()
+    for repo in getattr(tester, "required_repos", []):
+        repo_detail = cfg.repos.get(repo, dict())
+        required_repos[repo] = {"repo_url": repo_detail.get("repo_url"), "branch": repo_detail.get("branch"),
+                                "commit_id": repo_detail.get("commit_id")}
+    entry["required_repos"] = required_repos
+    return entry
+
+
 def get_classifiers_s_from_classifier(classifiers: List[TestClassifier]):
     classifiers_s = ''
     if classifiers:
@@ -0,0 +1,122 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.common.hip_locks import exclusive_lock
+
+import hashlib
+import json
+import os
+import sys
+
+# Results of the tests over their last runs, kept apart from the report dirs
+# which may be packed or evicted. The executor adds the result and duration of
+# every test at the end of a run (build only runs are not recorded), the
+# history predicates of --query and --time-budget read them. The sha256 of
+# the tester module is kept with every run to tell changed tests. Tests are keyed by lower case name
+# as in report.json, the last RUN_HISTORY_LENGTH runs of a test are kept.
+
+RUN_HISTORY_FILE = "build/run_history.json"
+RUN_HISTORY_VERSION = 1
+RUN_HISTORY_LENGTH = 20
+
+# Runs averaged for the duration of a test
+DURATION_RUNS = 5
+
+
+class RunHistory():
+    # path None: build/run_history.json
+    def __init__(self, path=None):
+        self.path = path if path else os.path.join(os.getcwd(), RUN_HISTORY_FILE)
+        self.tests = None
+
+    def load(self):
+        self.tests = dict()
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                history = json.load(f)
+        except ValueError:
+            return
+        if history.get("version") == RUN_HISTORY_VERSION:
+            self.tests = history["tests"]
+
+    # results: test name -> [status, duration in seconds, tester sha256],
+    # concurrent runs sharing the history are serialized by the lock
+    def add_run(self, run, results):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with exclusive_lock(self.path):
+            self.load()
+            for test_name, (status, duration, tester_sha256) in results.items():
+                runs = self.tests.setdefault(test_name.lower(), list())
+                runs.append({"run": run, "status": status, "duration": round(duration, 2), "tester_sha256": tester_sha256})
+                del runs[:-RUN_HISTORY_LENGTH]
+            with open(self.path + "." + str(os.getpid()), "w") as f:
+                json.dump({"version": RUN_HISTORY_VERSION, "tests": self.tests}, f, indent=1)
+            os.replace(self.path + "." + str(os.getpid()), self.path)
+
+    # Recorded runs of a test, oldest first
+    def get_runs(self, test_name):
+        if self.tests is None:
+            self.load()
+        return self.tests.get(test_name.lower(), [])
+
+    # Average duration of the last runs which were not skipped, None if never run
+    def get_duration(self, test_name):
+        durations = [run["duration"] for run in self.get_runs(test_name) if run["status"] != "SKIP"]
+        durations = durations[-DURATION_RUNS:]
+        if not durations:
+            return None
+        return sum(durations) / len(durations)
+
+    # Share of FAIL/ERROR results of the recorded runs, None if never run
+    def get_failure_rate(self, test_name):
+        runs = self.get_runs(test_name)
+        if not runs:
+            return None
+        return len([run for run in runs if run["status"] in ("FAIL", "ERROR")]) / len(runs)
+
+    def failed_in_last(self, test_name, count):
+        runs = self.get_runs(test_name)[-count:] if count > 0 else []
+        return any(run["status"] in ("FAIL", "ERROR") for run in runs)
+
+    # True if the tester module changed since the last run of the test, runs
+    # recorded without the sha256 tell nothing
+    def is_changed(self, test_name, tester_sha256):
+        runs = self.get_runs(test_name)
+        if not runs or tester_sha256 is None or runs[-1].get("tester_sha256") is None:
+            return False
+        return runs[-1]["tester_sha256"] != tester_sha256
+
+
+tester_sha256s = dict()
+
+
+# sha256 of the module of a tester, None if it has no file
+def get_tester_sha256(tester):
+    module = tester.__class__.__module__
+    if module not in tester_sha256s:
+        module_file = getattr(sys.modules.get(module), "__file__", None)
+        sha256 = None
+        if module_file and os.path.isfile(module_file):
+            with open(module_file, "rb") as f:
+                sha256 = hashlib.sha256(f.read()).hexdigest()
+        tester_sha256s[module] = sha256
+    return tester_sha256s[module]
@@ -0,0 +1,142 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from hiptestsuite.Test import Test
+from hiptestsuite.test_classifier import TestClassifier
+
+import hashlib
+import json
+import os
+import sys
+
+# Persistent catalog of the tests generated by the testers with
+# cache_tests = True, i.e. whose getTests is expensive (Hipconformance builds
+# HIP Catch2 to list its tests). An entry is keyed by the sha256 of the
+# tester module, the url/branch/commit_id of the tester's required_repos and
+# HIP_PLATFORM; listing and selection take the tests from a matching entry
+# without calling getTests. Testers whose repos are not pinned to a commit_id
+# are never cached, a branch may move without the key changing.
+
+TEST_CATALOG_FILE = "build/test_catalog.json"
+TEST_CATALOG_VERSION = 1
+
+
+class TestCatalog():
+    # path None: build/test_catalog.json, refresh: ignore the cached entries
+    def __init__(self, path=None, refresh=False):
+        self.path = path if path else os.path.join(os.getcwd(), TEST_CATALOG_FILE)
+        self.refresh = refresh
+        self.entries = None
+        self.changed = False
+
+    def load(self):
+        self.entries = dict()
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                catalog = json.load(f)
+        except ValueError:
+            return
+        if catalog.get("version") == TEST_CATALOG_VERSION:
+            self.entries = catalog["testers"]
+
+    def save(self):
+        if not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + "." + str(os.getpid()), "w") as f:
+            json.dump({"version": TEST_CATALOG_VERSION, "testers": self.entries}, f, indent=1)
+        os.replace(self.path + "." + str(os.getpid()), self.path)
+        self.changed = False
+
+    def get_tester_name(self, tester):
+        return tester.__class__.__module__ + "." + tester.__class__.__name__
+
+    # None if the tests of tester can not be cached
+    def get_key(self, tester, config):
+        if not getattr(tester, "cache_tests", False):
+            return None
+        module_file = getattr(sys.modules.get(tester.__class__.__module__), "__file__", None)
+        if not module_file or not os.path.isfile(module_file):
+            return None
+        key = dict()
+        with open(module_file, "rb") as f:
+            key["module"] = hashlib.sha256(f.read()).hexdigest()
+        key["platform"] = config.HIP_PLATFORM if config.HIP_PLATFORM else "amd"
+        repos = dict()
+        for repo in getattr(tester, "required_repos", []):
+            repo_detail = config.repos.get(repo)
+            if repo_detail is None or not repo_detail.get("commit_id"):
+                return None
+            repos[repo] = [repo_detail["repo_url"], repo_detail.get("branch"), repo_detail["commit_id"]]
+        key["repos"] = repos
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+    # Cached tests of tester, None on a miss
+    def get_tests(self, tester, key):
+        if key is None or self.refresh:
+            return None
+        if self.entries is None:
+            self.load()
+        entry = self.entries.get(self.get_tester_name(tester))
+        if entry is None or entry["key"] != key:
+            return None
+        tests = []
+        for cached in entry["tests"]:
+            test = Test()
+            test.test_name = cached["test_name"]
+            test.also_matched_with_test_names = cached["also_matched_with_test_names"]
+            if cached["classifiers"] is not None:
+                test.classifiers = []
+                for matched_with_names in cached["classifiers"]:
+                    classifier = TestClassifier()
+                    classifier.matched_with_names = matched_with_names
+                    test.classifiers.append(classifier)
+            test.tester = tester
+            tests.append(test)
+        return tests
+
+    # Drops the cached tests of tester, they are generated again by the next listing
+    def drop_tests(self, tester):
+        if self.entries is None:
+            self.load()
+        if self.entries.pop(self.get_tester_name(tester), None) is not None:
+            self.changed = True
+
+    def put_tests(self, tester, key, tests):
+        if key is None or not tests:
+            return
+        # Targets are not serialized
+        if any(test.applicable_for_target is not None for test in tests):
+            return
+        if self.entries is None:
+            self.load()
+        cached_tests = []
+        for test in tests:
+            cached = dict()
+            cached["test_name"] = test.test_name
+            cached["also_matched_with_test_names"] = test.also_matched_with_test_names
+            if test.classifiers is not None:
+                cached["classifiers"] = [classifier.matched_with_names for classifier in test.classifiers]
+            else:
+                cached["classifiers"] = None
+            cached_tests.append(cached)
+        self.entries[self.get_tester_name(tester)] = {"key": key, "tests": cached_tests}
+        self.changed = True
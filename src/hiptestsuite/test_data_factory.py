@@ -0,0 +1,72 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.config_processor import ConfigProcessor
+
+import copy
+import typing
+
+# Creates the data objects passed to Tester.getTests and Tester.test. The data
+# class of a tester method is resolved from its type hints once per tester
+# class, and every data class is instantiated and loaded from the config once
+# per run. A test gets a shallow copy of that loaded base, on which only its
+# own fields are set (test, test_result, log_location, quick); the loaded
+# fields (repos, compile options, ...) are shared and must not be modified.
+
+
+class TestDataFactory():
+    def __init__(self):
+        self.config = None
+        # (tester class, method name) -> data class or None
+        self.data_types = dict()
+        # data class -> loaded instance
+        self.bases = dict()
+
+    # Drops the loaded data, done when a run starts as the config may have changed
+    def reset(self, config=None):
+        self.config = config
+        self.bases.clear()
+
+    # Data class of the arg_name argument of the tester method, None if it has none
+    def get_data_type(self, tester, method_name: str, arg_name: str):
+        key = (tester.__class__, method_name)
+        if key not in self.data_types:
+            hints = typing.get_type_hints(getattr(tester, method_name))
+            self.data_types[key] = hints.get(arg_name) if hints else None
+        return self.data_types[key]
+
+    # A copy of the loaded data for a call of the tester method, None if it takes no data
+    def create(self, config, tester, method_name: str, arg_name: str):
+        data_type = self.get_data_type(tester, method_name, arg_name)
+        if data_type is None:
+            return None
+        if config is not self.config:
+            self.reset(config)
+        base = self.bases.get(data_type)
+        if base is None:
+            base = data_type()
+            if isinstance(base, ConfigProcessor):
+                base.config = config
+                base.loadConfig()
+            self.bases[data_type] = base
+        return copy.copy(base)
+
+
+test_data_factory = TestDataFactory()
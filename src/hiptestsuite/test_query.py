@@ -0,0 +1,267 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.Test import Test
+from hiptestsuite.run_history import RunHistory
+from hiptestsuite.test_selector import SelectionIndex
+
+from typing import List
+import re
+
+# Selection queries (--query), boolean expressions over -t patterns and
+# predicates on the run history, e.g.
+#   samples and not stress
+#   examples:performance and duration<120s
+#   conformance and (failed_in_last(3) or never_run)
+# A pattern is anything -t accepts (name, regex, classifier:path), quote it if
+# it contains spaces, parentheses or <>=!. Predicates:
+#   duration<op><time>      average duration of the last runs, <time> in s (default), m or h
+#   failure_rate<op><rate>  share of FAIL/ERROR runs, 0.25 or 25%
+#   failed_in_last(<n>)     FAIL/ERROR in one of the last <n> runs
+#   never_run               no run recorded
+# <op> is one of < <= > >= == !=, tests without history never match a
+# comparison. The query is parsed once, every pattern is then looked up once
+# in the SelectionIndex and the operators work on sets of tests, narrowed down
+# from left to right so predicates only look at the tests still selected.
+
+TOKEN_RE = re.compile(r"\s*(?:(\(|\))|(\"[^\"]*\"|'[^']*')|(<=|>=|==|!=|<|>)|([^\s()<>=!]+))")
+TIME_UNITS = {"s": 1, "m": 60, "h": 3600}
+COMPARISONS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+
+def parse_duration(value: str) -> float:
+    match = re.match(r"^([0-9]*\.?[0-9]+)([smh]?)$", value.lower())
+    if not match:
+        raise ValueError("Invalid duration " + value + ", e.g. 90, 90s, 1.5m, 2h")
+    return float(match.group(1)) * TIME_UNITS[match.group(2) if match.group(2) else "s"]
+
+
+def parse_rate(value: str) -> float:
+    match = re.match(r"^([0-9]*\.?[0-9]+)(%?)$", value)
+    if not match:
+        raise ValueError("Invalid failure rate " + value + ", e.g. 0.2 or 20%")
+    return float(match.group(1)) / (100 if match.group(2) else 1)
+
+
+# Tests, index and history a query is evaluated against
+class QueryContext():
+    def __init__(self, tests: List[Test], index, history: RunHistory):
+        self.tests = tests
+        self.index = index
+        self.history = history
+        self.all = set(range(len(tests)))
+
+
+class PatternNode():
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def evaluate(self, context: QueryContext, candidates: set) -> set:
+        return context.index.select_indexes([self.pattern]) & candidates
+
+    def get_patterns(self):
+        return [self.pattern]
+
+
+class HistoryNode():
+    # is_match(history, test_name) -> bool
+    def __init__(self, is_match):
+        self.is_match = is_match
+
+    def evaluate(self, context: QueryContext, candidates: set) -> set:
+        return set(i for i in candidates if self.is_match(context.history, context.tests[i].test_name))
+
+    def get_patterns(self):
+        return None
+
+
+class NotNode():
+    def __init__(self, node):
+        self.node = node
+
+    def evaluate(self, context: QueryContext, candidates: set) -> set:
+        return candidates - self.node.evaluate(context, candidates)
+
+    def get_patterns(self):
+        return None
+
+
+class AndNode():
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def evaluate(self, context: QueryContext, candidates: set) -> set:
+        selected = candidates
+        for node in self.nodes:
+            if not selected:
+                break
+            selected = node.evaluate(context, selected)
+        return selected
+
+    # The tests of any bounded operand cover the result
+    def get_patterns(self):
+        for node in self.nodes:
+            patterns = node.get_patterns()
+            if patterns is not None:
+                return patterns
+        return None
+
+
+class OrNode():
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def evaluate(self, context: QueryContext, candidates: set) -> set:
+        selected = set()
+        for node in self.nodes:
+            selected = selected | node.evaluate(context, candidates - selected)
+        return selected
+
+    def get_patterns(self):
+        patterns = list()
+        for node in self.nodes:
+            node_patterns = node.get_patterns()
+            if node_patterns is None:
+                return None
+            patterns.extend(node_patterns)
+        return patterns
+
+
+class TestQuery():
+    # Raises ValueError for an invalid query
+    def __init__(self, query: str):
+        self.query = query
+        self.tokens = self.tokenize(query)
+        self.position = 0
+        self.root = self.parse_or()
+        if self.position != len(self.tokens):
+            raise ValueError("Unexpected " + self.tokens[self.position][1] + " in query: " + query)
+
+    def tokenize(self, query: str):
+        tokens = list()
+        position = 0
+        query = query.rstrip()
+        while position < len(query):
+            match = TOKEN_RE.match(query, position)
+            if not match:
+                raise ValueError("Invalid query: " + query)
+            position = match.end()
+            if match.group(1):
+                tokens.append(("paren", match.group(1)))
+            elif match.group(2):
+                tokens.append(("pattern", match.group(2)[1:-1]))
+            elif match.group(3):
+                tokens.append(("op", match.group(3)))
+            else:
+                tokens.append(("word", match.group(4)))
+        return tokens
+
+    def peek(self, offset=0):
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset]
+        return (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise ValueError("Unexpected end of query: " + self.query)
+        self.position += 1
+        return token
+
+    def is_keyword(self, keyword):
+        kind, value = self.peek()
+        return kind == "word" and value.lower() == keyword
+
+    def parse_or(self):
+        nodes = [self.parse_and()]
+        while self.is_keyword("or"):
+            self.position += 1
+            nodes.append(self.parse_and())
+        return nodes[0] if len(nodes) == 1 else OrNode(nodes)
+
+    def parse_and(self):
+        nodes = [self.parse_not()]
+        while self.is_keyword("and"):
+            self.position += 1
+            nodes.append(self.parse_not())
+        return nodes[0] if len(nodes) == 1 else AndNode(nodes)
+
+    def parse_not(self):
+        if self.is_keyword("not"):
+            self.position += 1
+            return NotNode(self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        kind, value = self.next()
+        if kind == "paren" and value == "(":
+            node = self.parse_or()
+            if self.next() != ("paren", ")"):
+                raise ValueError("Missing ) in query: " + self.query)
+            return node
+        if kind == "pattern":
+            return PatternNode(value)
+        if kind != "word" or value.lower() in ("and", "or", "not"):
+            raise ValueError("Unexpected " + value + " in query: " + self.query)
+
+        name = value.lower()
+        if name in ("duration", "failure_rate") and self.peek()[0] == "op":
+            op = self.next()[1]
+            operand = self.next()
+            if operand[0] not in ("word", "pattern"):
+                raise ValueError("Missing value after " + name + op + " in query: " + self.query)
+            compare = COMPARISONS[op]
+            if name == "duration":
+                limit = parse_duration(operand[1])
+                return HistoryNode(lambda history, test_name: self.compare(history.get_duration(test_name), compare, limit))
+            limit = parse_rate(operand[1])
+            return HistoryNode(lambda history, test_name: self.compare(history.get_failure_rate(test_name), compare, limit))
+        if name == "failed_in_last" and self.peek() == ("paren", "("):
+            self.position += 1
+            count = self.next()
+            if count[0] != "word" or not count[1].isdigit() or self.next() != ("paren", ")"):
+                raise ValueError("failed_in_last takes a number of runs, e.g. failed_in_last(3): " + self.query)
+            count = int(count[1])
+            return HistoryNode(lambda history, test_name: history.failed_in_last(test_name, count))
+        if name == "never_run":
+            return HistoryNode(lambda history, test_name: not history.get_runs(test_name))
+        if self.peek()[0] == "op":
+            raise ValueError("Unknown predicate " + value + " in query: " + self.query)
+        return PatternNode(value)
+
+    def compare(self, value, compare, limit):
+        return value is not None and compare(value, limit)
+
+    # -t patterns matching every test the query may select, None if unbounded
+    def get_patterns(self):
+        return self.root.get_patterns()
+
+    # The tests selected by the query, in the order of tests
+    def select(self, tests: List[Test], history: RunHistory) -> List[Test]:
+        context = QueryContext(tests=tests, index=SelectionIndex(tests), history=history)
+        selected = self.root.evaluate(context, context.all)
+        return [test for i, test in enumerate(tests) if i in selected]
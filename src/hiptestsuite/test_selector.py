@@ -19,9 +19,10 @@
 # THE SOFTWARE.
 
 from hiptestsuite.AMD import AMDObject
-from hiptestsuite.TesterRepository import TesterRepository, Test, GetTests
+from hiptestsuite.TesterRepository import TesterRepository, Tester, Test, GetTests
 from typing import Union, List, Dict
 
+import inspect
 import re, sys, os
 
 
@@ -111,10 +112,14 @@ class TestSelector(GetTests):
                     self.get_all_classifierkeys(testclassifierdict[key], classifierlist)
 
     def get_all_classifiers(self, testclassifier, classifierlist):
+        if not testclassifier:
+            return
         for myclassifier in testclassifier:
             self.get_all_classifierkeys(myclassifier.matched_with_names, classifierlist)
 
-    def select_tests(self, log_location: str, exclude_module_paths) -> List[Test]:
+    # test_query: TestQuery applied to the selected tests, its patterns select
+    # the tests to query from when there is no -t
+    def select_tests(self, log_location: str, exclude_module_paths, test_query=None, run_history=None) -> List[Test]:
         config = self.config
         tests = list()
         run_tests = config.run_tests
@@ -122,19 +127,19 @@ class TestSelector(GetTests):
             test_name_regexes = [run_tests]
         elif type(run_tests) == list:
             test_name_regexes = run_tests
+        elif test_query is not None:
+            test_name_regexes = test_query.get_patterns()
         else:
             test_name_regexes = None
 
         if test_name_regexes is None:
-            for test_of_tester in self.get_tests(log_location=log_location, quick=False):
-                select_this_test = self.to_select_this_test(test=test_of_tester, test_name_regexes=test_name_regexes, exclude_module_paths=exclude_module_paths)
-                if select_this_test:
-                    tests.append(test_of_tester)
+            index = SelectionIndex(self.get_tests(log_location=log_location, quick=False))
+            tests = index.select_all(exclude_module_paths=exclude_module_paths)
         else:
-            for test_of_tester in self.get_tests(log_location=log_location, quick=True):
-                select_this_test = self.to_select_this_test(test=test_of_tester, test_name_regexes=test_name_regexes)
-                if select_this_test:
-                    tests.append(test_of_tester)
+            testers = [tester for tester in self.tester_repository.getTesters()
+                       if may_select_tester(tester=tester, test_name_regexes=test_name_regexes)]
+            quick_tests = self.get_tests(log_location=log_location, quick=True, testers=testers)
+            tests = SelectionIndex(quick_tests).select(test_name_regexes=test_name_regexes)
 
             classifierlist = list()
             for thistest in tests:
@@ -148,11 +153,184 @@ class TestSelector(GetTests):
             if False == self.check_quicktestlist_sufficient(test_name_regexes, tests, classifierlist):
                 tests.clear()
             if not tests:
-                for test_of_tester in self.get_tests(log_location=log_location, quick=False):
-                    select_this_test = self.to_select_this_test(test=test_of_tester, test_name_regexes=test_name_regexes)
-                    if select_this_test:
-                        tests.append(test_of_tester)
+                # Only the testers with a partial quick list are asked again
+                partial_testers = [tester for tester in testers if has_partial_quick_tests(tester)]
+                all_tests = quick_tests
+                if partial_testers:
+                    full_tests = self.get_tests(log_location=log_location, quick=False, testers=partial_testers)
+                    all_tests = list()
+                    for tester in testers:
+                        from_tests = full_tests if tester in partial_testers else quick_tests
+                        all_tests.extend(test for test in from_tests if test.tester is tester)
+                tests = SelectionIndex(all_tests).select(test_name_regexes=test_name_regexes)
 
+        if test_query is not None:
+            tests = test_query.select(tests=tests, history=run_history)
+        return tests
+
+
+def has_partial_quick_tests(tester: Tester) -> bool:
+    if tester.partial_quick_tests is not None:
+        return tester.partial_quick_tests
+    return len(inspect.signature(tester.getTests).parameters) > 0
+
+
+# False only if none of the tests of tester can be selected by test_name_regexes,
+# judged from the classifiers the tester declares for all its tests
+def may_select_tester(tester: Tester, test_name_regexes) -> bool:
+    classifiers = tester.get_test_classifiers()
+    if not classifiers:
+        return True
+    trie = ClassifierTrie()
+    nodes = [trie.add(get_classifier_keys(classifier.matched_with_names, list())) for classifier in classifiers]
+    for test_name_regex in test_name_regexes:
+        if type(test_name_regex) == str:
+            asked_classifiers: List[str] = test_name_regex.split(':')
+        else:  # type(test_name_regex) == list:
+            asked_classifiers: List[str] = test_name_regex
+        flags = trie.match(asked_classifiers)
+        if any(flags[node][0] for node in nodes):
+            return True
+    return False
+
+
+# Preorder keys of a classifier dict, in the order is_sequence_in_dict visits them
+def get_classifier_keys(in_dict: Dict, keys: List):
+    for k, v in in_dict.items():
+        keys.append(k)
+        if type(v) == dict:
+            get_classifier_keys(v, keys)
+    return keys
+
+
+# Trie of the preorder classifier keys of all tests. is_sequence_in_dict only
+# depends on the keys seen so far, so it is run once per trie node and the
+# classifiers sharing a prefix share its result.
+class ClassifierTrie:
+    def __init__(self):
+        self.children: List[Dict] = [dict()]
+        self.keys: List = [None]
+        self.parents: List[int] = [-1]
+
+    # Returns the node of the last key
+    def add(self, keys: List) -> int:
+        node = 0
+        for key in keys:
+            child = self.children[node].get(key)
+            if child is None:
+                child = len(self.keys)
+                self.children[node][key] = child
+                self.children.append(dict())
+                self.keys.append(key)
+                self.parents.append(node)
+            node = child
+        return node
+
+    # Returns (initial_matching, last_also_matching) per node, nodes are
+    # created after their parent so one pass in node order is enough
+    def match(self, sequence: List) -> List:
+        till_matched = [0] * len(self.keys)
+        flags = [(False, False)] * len(self.keys)
+        for node in range(1, len(self.keys)):
+            parent = self.parents[node]
+            matched = till_matched[parent]
+            initial_matching, last_also_matching = flags[parent]
+            if matched != len(sequence):
+                if sequence[matched] == self.keys[node]:
+                    matched = matched + 1
+                else:
+                    matched = 0
+            if matched == len(sequence) - 1:
+                initial_matching = True
+            if matched == len(sequence):
+                initial_matching = True
+                last_also_matching = True
+            till_matched[node] = matched
+            flags[node] = (initial_matching, last_also_matching)
+        return flags
+
+
+# Index over the tests for to_select_this_test queries: the tests are grouped by
+# their classifier trie nodes and by lower case name, each -t pattern is then
+# compiled once and matched once per group and once per distinct name
+class SelectionIndex:
+    def __init__(self, tests: List[Test]):
+        self.tests = tests
+        self.trie = ClassifierTrie()
+        # classifier nodes of the tests, None for tests without classifiers
+        self.classifier_groups: Dict = dict()
+        self.name_index: Dict[str, List[int]] = dict()
+        for i, test in enumerate(tests):
+            nodes = None
+            if test.classifiers:
+                nodes = tuple(self.trie.add(get_classifier_keys(classifier.matched_with_names, list()))
+                              for classifier in test.classifiers)
+            self.classifier_groups.setdefault(nodes, list()).append(i)
+            names = [test.test_name]
+            if test.also_matched_with_test_names:
+                names.extend(test.also_matched_with_test_names)
+            for name in names:
+                indexes = self.name_index.setdefault(name.lower(), list())
+                if not indexes or indexes[-1] != i:
+                    indexes.append(i)
+
+    # Indexes of the tests with a name matching the last asked classifier
+    def get_name_matches(self, name_regex: str) -> set:
+        name_regex = name_regex.lower()
+        if re.escape(name_regex) == name_regex:
+            is_match = lambda name: name_regex in name
+        else:
+            is_match = re.compile(name_regex).search
+        matches = set()
+        for name, indexes in self.name_index.items():
+            if is_match(name):
+                matches.update(indexes)
+        return matches
+
+    # Same tests as to_select_this_test with test_name_regexes, in test order
+    def select(self, test_name_regexes) -> List[Test]:
+        selected = self.select_indexes(test_name_regexes)
+        return [test for i, test in enumerate(self.tests) if i in selected]
+
+    # Indexes of the tests selected by test_name_regexes
+    def select_indexes(self, test_name_regexes) -> set:
+        selected = set()
+        for test_name_regex in test_name_regexes:
+            if type(test_name_regex) == str:
+                asked_classifiers: List[str] = test_name_regex.split(':')
+            else:  # type(test_name_regex) == list:
+                asked_classifiers: List[str] = test_name_regex
+
+            flags = self.trie.match(asked_classifiers)
+            name_matches = None
+            for nodes, indexes in self.classifier_groups.items():
+                if nodes is not None:
+                    if not any(flags[node][0] for node in nodes):
+                        continue
+                    if any(flags[node][1] for node in nodes):
+                        selected.update(indexes)
+                        continue
+                if name_matches is None:
+                    name_matches = self.get_name_matches(asked_classifiers[-1])
+                selected.update(i for i in indexes if i in name_matches)
+        return selected
+
+    # All tests except those of the modules under exclude_module_paths
+    def select_all(self, exclude_module_paths) -> List[Test]:
+        if exclude_module_paths is None:
+            exclude_module_paths = list()
+        tests = list()
+        excluded_classes = dict()
+        for test in self.tests:
+            tester_class = test.tester.__class__
+            if tester_class not in excluded_classes:
+                class_abs_path = os.path.abspath(sys.modules[tester_class.__module__].__file__)
+                excluded_classes[tester_class] = any(exclude_module_path in class_abs_path
+                                                     for exclude_module_path in exclude_module_paths)
+            if excluded_classes[tester_class]:
+                print("Warning: Test " + test.test_name + " is excluded, please run selectively")
+            else:
+                tests.append(test)
         return tests
 
 
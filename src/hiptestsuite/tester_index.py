@@ -0,0 +1,480 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+import ast
+import hashlib
+import importlib
+import json
+import os
+import re
+import time
+
+# Static index of the Tester classes of the tester packages, so that only the
+# modules owning the selected testers are imported. Every module is scanned
+# with ast for its imports, class bases, the test names created by getTests,
+# the classifiers created by get_test_classifiers (or by getTests for testers
+# without it) and the paths built by TestClassifier subclasses
+# (add_matched_with_names calling its parent with {"name": ...}). The scan
+# results are cached per file in build/tester_index.json and rescanned when
+# the file changed. Anything that can not be resolved statically (computed
+# test names, classifiers with arguments) makes the tester a candidate for
+# every selection, so the index never drops a test a full import would find.
+
+TESTER_INDEX_FILE = "build/tester_index.json"
+TESTER_INDEX_VERSION = 2
+TESTER_CLASS = "hiptestsuite.TesterRepository.Tester"
+TEST_CLASSIFIER_CLASS = "hiptestsuite.test_classifier.TestClassifier"
+
+
+# Timings of the startup phases, printed with --profile-startup
+class StartupProfile():
+    def __init__(self):
+        self.enabled = False
+        self.phases = []
+        self.module_imports = dict()
+
+    def add(self, phase, seconds, detail=None):
+        self.phases.append((phase, seconds, detail))
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("Startup profile:")
+        for phase, seconds, detail in self.phases:
+            print("  {phase:<24} {seconds:8.3f}s{detail}".format(phase=phase, seconds=seconds,\
+            detail=" (" + detail + ")" if detail else ""))
+        slowest = sorted(self.module_imports.items(), key=lambda item: item[1], reverse=True)[:5]
+        if slowest:
+            print("  Slowest tester module imports:")
+            for modname, seconds in slowest:
+                print("    {modname:<60} {seconds:8.3f}s".format(modname=modname, seconds=seconds))
+        self.phases = []
+
+
+startup_profile = StartupProfile()
+
+
+def get_dotted_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value = get_dotted_name(node.value)
+        return value + "." + node.attr if value else None
+    return None
+
+
+def scan_get_tests(function):
+    facts = {"names": [], "self_name": False, "dynamic_names": False, "also": [],
+        "calls": [], "has_classifiers": False, "dynamic_classifiers": False}
+    assigns_name = False
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if not isinstance(target, ast.Attribute):
+                    continue
+                if target.attr == "test_name":
+                    assigns_name = True
+                    if get_dotted_name(node.value) == "self.__class__.__name__":
+                        facts["self_name"] = True
+                    elif isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                        facts["names"].append(node.value.value)
+                    else:
+                        facts["dynamic_names"] = True
+                elif target.attr == "also_matched_with_test_names":
+                    if isinstance(node.value, (ast.List, ast.Tuple)) and\
+                    all(isinstance(elt, ast.Constant) and isinstance(elt.value, str) for elt in node.value.elts):
+                        facts["also"].extend(elt.value for elt in node.value.elts)
+                    else:
+                        facts["dynamic_names"] = True
+                elif target.attr == "classifiers":
+                    facts["has_classifiers"] = True
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Attribute) and node.func.attr == "add_matched_with_names":
+                if node.args or node.keywords:
+                    facts["dynamic_classifiers"] = True
+            else:
+                name = get_dotted_name(node.func)
+                if name:
+                    facts["calls"].append(name)
+    if not assigns_name:
+        facts["dynamic_names"] = True
+    return facts
+
+
+def scan_get_test_classifiers(function):
+    facts = {"calls": [], "dynamic_classifiers": False}
+    for node in ast.walk(function):
+        if isinstance(node, ast.Return) and (node.value is None or\
+        (isinstance(node.value, ast.Constant) and node.value.value is None)):
+            # Classifiers vary between the tests
+            facts["dynamic_classifiers"] = True
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Attribute) and node.func.attr == "add_matched_with_names":
+                if node.args or node.keywords:
+                    facts["dynamic_classifiers"] = True
+            else:
+                name = get_dotted_name(node.func)
+                if name:
+                    facts["calls"].append(name)
+    return facts
+
+
+# {"parent": dotted name, "key": name} of Parent.add_matched_with_names(self, {"key": matched_with_names})
+def scan_add_matched_with_names(function):
+    for node in ast.walk(function):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and\
+        node.func.attr == "add_matched_with_names" and len(node.args) == 2 and\
+        isinstance(node.args[1], ast.Dict) and len(node.args[1].keys) == 1 and\
+        isinstance(node.args[1].keys[0], ast.Constant):
+            parent = get_dotted_name(node.func.value)
+            if parent:
+                return {"parent": parent, "key": node.args[1].keys[0].value}
+    return None
+
+
+def scan_module(path, modname, is_pkg):
+    facts = {"imports": dict(), "star_imports": [], "classes": dict(), "error": None}
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (SyntaxError, ValueError) as error:
+        facts["error"] = str(error)
+        return facts
+    package = modname if is_pkg else modname.rpartition(".")[0]
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    facts["imports"][alias.asname] = alias.name
+                else:
+                    head = alias.name.split(".")[0]
+                    facts["imports"][head] = head
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module if node.module else ""
+            if node.level:
+                base = package.split(".")
+                base = base[:len(base) - node.level + 1]
+                module = ".".join(base + ([module] if module else []))
+            for alias in node.names:
+                if alias.name == "*":
+                    facts["star_imports"].append(module)
+                else:
+                    facts["imports"][alias.asname if alias.asname else alias.name] = module + "." + alias.name
+        elif isinstance(node, ast.ClassDef):
+            class_facts = {"bases": [get_dotted_name(base) for base in node.bases if get_dotted_name(base)],
+                "get_tests": None, "get_test_classifiers": None, "classifier": None, "defines_add_matched": False}
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef):
+                    if item.name == "getTests":
+                        class_facts["get_tests"] = scan_get_tests(item)
+                    elif item.name == "get_test_classifiers":
+                        class_facts["get_test_classifiers"] = scan_get_test_classifiers(item)
+                    elif item.name == "add_matched_with_names":
+                        class_facts["defines_add_matched"] = True
+                        class_facts["classifier"] = scan_add_matched_with_names(item)
+            facts["classes"][node.name] = class_facts
+    return facts
+
+
+def get_file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# modname -> (path, is_pkg) of the modules of pkg, like pkgutil.walk_packages
+def find_modules(pkg_name, pkg_dir):
+    modules = dict()
+    for dirpath, dirnames, filenames in os.walk(pkg_dir):
+        dirnames[:] = sorted(dirname for dirname in dirnames\
+        if os.path.isfile(os.path.join(dirpath, dirname, "__init__.py")))
+        relpath = os.path.relpath(dirpath, pkg_dir)
+        package = pkg_name if relpath == os.curdir else pkg_name + "." + relpath.replace(os.sep, ".")
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            if filename == "__init__.py":
+                modules[package] = (os.path.join(dirpath, filename), True)
+            else:
+                modules[package + "." + filename[:-3]] = (os.path.join(dirpath, filename), False)
+    return modules
+
+
+class TesterEntry():
+    def __init__(self, module, cls):
+        self.module = module
+        self.cls = cls
+        # None: computed by getTests
+        self.names = None
+        self.also = []
+        # None: not known statically, []: getTests sets no classifiers
+        self.classifier_paths = None
+
+
+class TesterIndex():
+    def __init__(self, pkgs):
+        self.pkgs = pkgs
+        self.modules = dict()
+        self.rescanned = 0
+
+    def index_file(self):
+        return os.path.join(os.getcwd(), TESTER_INDEX_FILE)
+
+    def read_cache(self):
+        if not os.path.isfile(self.index_file()):
+            return dict()
+        try:
+            with open(self.index_file(), "r") as f:
+                cache = json.load(f)
+        except ValueError:
+            return dict()
+        if cache.get("version") != TESTER_INDEX_VERSION:
+            return dict()
+        return cache["files"]
+
+    def write_cache(self, files):
+        index_file = self.index_file()
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        with open(index_file + "." + str(os.getpid()), "w") as f:
+            json.dump({"version": TESTER_INDEX_VERSION, "files": files}, f)
+        os.replace(index_file + "." + str(os.getpid()), index_file)
+
+    def load(self):
+        cached_files = self.read_cache()
+        files = dict()
+        changed = False
+        for pkg in self.pkgs:
+            for pkg_dir in pkg.__path__:
+                for modname, (path, is_pkg) in find_modules(pkg.__name__, pkg_dir).items():
+                    path = os.path.abspath(path)
+                    st = os.stat(path)
+                    cached = cached_files.get(path)
+                    if cached is not None and cached["modname"] == modname and\
+                    (cached["mtime_ns"], cached["size"]) != (st.st_mtime_ns, st.st_size):
+                        # Touched but maybe not changed
+                        if cached["sha256"] == get_file_digest(path):
+                            cached["mtime_ns"] = st.st_mtime_ns
+                            cached["size"] = st.st_size
+                            changed = True
+                        else:
+                            cached = None
+                    if cached is None or cached["modname"] != modname:
+                        cached = {"modname": modname, "mtime_ns": st.st_mtime_ns, "size": st.st_size,\
+                        "sha256": get_file_digest(path), "facts": scan_module(path, modname, is_pkg)}
+                        self.rescanned += 1
+                        changed = True
+                    files[path] = cached
+                    self.modules[modname] = cached["facts"]
+        if changed or len(files) != len(cached_files):
+            try:
+                self.write_cache(files)
+            except OSError:
+                pass
+
+    # Qualified name of the dotted name used in modname, None if it is not known
+    def resolve(self, modname, dotted, depth=0):
+        facts = self.modules.get(modname)
+        if facts is None or depth > 8:
+            return None
+        head, _, rest = dotted.partition(".")
+        if head in facts["classes"]:
+            qualified = modname + "." + dotted
+        elif head in facts["imports"]:
+            qualified = facts["imports"][head] + ("." + rest if rest else "")
+        else:
+            for star_import in facts["star_imports"]:
+                qualified = self.resolve(star_import, dotted, depth + 1)
+                if qualified:
+                    return qualified
+            return None
+        return self.canonical(qualified, depth + 1)
+
+    # Follows names imported into a module to the module defining them
+    def canonical(self, qualified, depth=0):
+        modname, _, name = qualified.rpartition(".")
+        facts = self.modules.get(modname)
+        if facts is None or name in facts["classes"] or depth > 8:
+            return qualified
+        resolved = self.resolve(modname, name, depth)
+        return resolved if resolved else qualified
+
+    def get_class(self, qualified):
+        modname, _, name = qualified.rpartition(".")
+        facts = self.modules.get(modname)
+        if facts is None:
+            return None
+        return facts["classes"].get(name)
+
+    def get_bases(self, qualified):
+        class_facts = self.get_class(qualified)
+        if class_facts is None:
+            return []
+        modname = qualified.rpartition(".")[0]
+        bases = [self.resolve(modname, base) for base in class_facts["bases"]]
+        return [base for base in bases if base]
+
+    def is_subclass(self, qualified, root, depth=0):
+        if qualified == root:
+            return True
+        if depth > 32:
+            return False
+        return any(self.is_subclass(base, root, depth + 1) for base in self.get_bases(qualified))
+
+    # Classifier names of a TestClassifier subclass, outermost first, None if not known
+    def get_classifier_path(self, qualified, depth=0):
+        if qualified == TEST_CLASSIFIER_CLASS:
+            return []
+        class_facts = self.get_class(qualified)
+        if class_facts is None or depth > 32:
+            return None
+        if class_facts["defines_add_matched"]:
+            classifier = class_facts["classifier"]
+            if classifier is None:
+                return None
+            parent = self.resolve(qualified.rpartition(".")[0], classifier["parent"])
+            path = self.get_classifier_path(parent, depth + 1) if parent else None
+            return path + [classifier["key"]] if path is not None else None
+        for base in self.get_bases(qualified):
+            if self.is_subclass(base, TEST_CLASSIFIER_CLASS):
+                return self.get_classifier_path(base, depth + 1)
+        return None
+
+    # Class defining the method scanned as method ("get_tests" or
+    # "get_test_classifiers") for the tester and its facts
+    def get_method_facts(self, qualified, method, depth=0):
+        class_facts = self.get_class(qualified)
+        if class_facts is None or depth > 32:
+            return qualified, None
+        if class_facts[method] is not None:
+            return qualified, class_facts[method]
+        for base in self.get_bases(qualified):
+            if base == TESTER_CLASS:
+                return base, None
+            if self.is_subclass(base, TESTER_CLASS):
+                return self.get_method_facts(base, method, depth + 1)
+        return qualified, None
+
+    # Classifier paths of the classifiers created in the method of owner, None if not known
+    def get_classifier_paths(self, owner, facts):
+        if facts["dynamic_classifiers"]:
+            return None
+        owner_module = owner.rpartition(".")[0]
+        paths = []
+        for call in facts["calls"]:
+            called = self.resolve(owner_module, call)
+            if called and self.is_subclass(called, TEST_CLASSIFIER_CLASS):
+                path = self.get_classifier_path(called)
+                if path is None:
+                    return None
+                paths.append(path)
+        return paths
+
+    def get_entry(self, modname, name):
+        entry = TesterEntry(modname, name)
+        owner, facts = self.get_method_facts(modname + "." + name, "get_tests")
+        if owner == TESTER_CLASS:
+            # Tester.getTests: one test named after the class
+            entry.names = [name]
+            entry.classifier_paths = []
+            return entry
+        if facts is None:
+            return entry
+        if not facts["dynamic_names"]:
+            entry.names = facts["names"] + ([name] if facts["self_name"] else [])
+            entry.also = facts["also"]
+        # The classifiers of get_test_classifiers, getTests builds its tests with them
+        classifiers_owner, classifiers_facts = self.get_method_facts(modname + "." + name, "get_test_classifiers")
+        if classifiers_facts is not None:
+            paths = self.get_classifier_paths(classifiers_owner, classifiers_facts)
+            if paths:
+                entry.classifier_paths = paths
+            return entry
+        paths = self.get_classifier_paths(owner, facts)
+        if paths is None or (facts["has_classifiers"] and not paths):
+            return entry
+        entry.classifier_paths = paths
+        return entry
+
+    # Entries of all Tester subclasses, modules which can not be parsed get
+    # an entry without class, all their testers are taken at import
+    def get_testers(self):
+        entries = []
+        for modname, facts in self.modules.items():
+            if facts["error"] is not None:
+                entries.append(TesterEntry(modname, None))
+                continue
+            for name in facts["classes"]:
+                qualified = modname + "." + name
+                if qualified != TESTER_CLASS and self.is_subclass(qualified, TESTER_CLASS):
+                    entries.append(self.get_entry(modname, name))
+        return entries
+
+
+def contains_sequence(path, sequence):
+    if not sequence:
+        return True
+    for start in range(len(path) - len(sequence) + 1):
+        if path[start:start + len(sequence)] == sequence:
+            return True
+    return False
+
+
+# False only if none of the tests of entry can be selected by test_name_regexes,
+# mirrors TestSelector.to_select_this_test
+def may_select(entry: TesterEntry, test_name_regexes):
+    if entry.cls is None or entry.classifier_paths is None:
+        return True
+    for test_name_regex in test_name_regexes:
+        if type(test_name_regex) == str:
+            asked_classifiers = test_name_regex.split(':')
+        else:
+            asked_classifiers = test_name_regex
+        if entry.classifier_paths:
+            if not any(contains_sequence(path, asked_classifiers[:-1]) for path in entry.classifier_paths):
+                continue
+            if any(contains_sequence(path, asked_classifiers) for path in entry.classifier_paths):
+                return True
+        if entry.names is None:
+            return True
+        try:
+            for name in entry.names + entry.also:
+                if re.findall(asked_classifiers[-1].lower(), name.lower()):
+                    return True
+        except re.error:
+            return True
+    return False
+
+
+# Imports the modules of entries, returns the Tester classes in index order
+def import_testers(entries, tester_cls):
+    classes = []
+    for entry in entries:
+        start = time.time()
+        module = importlib.import_module(entry.module)
+        if entry.module not in startup_profile.module_imports:
+            startup_profile.module_imports[entry.module] = time.time() - start
+        if entry.cls is None:
+            for value in vars(module).values():
+                if isinstance(value, type) and issubclass(value, tester_cls) and\
+                value is not tester_cls and value.__module__ == entry.module and value not in classes:
+                    classes.append(value)
+            continue
+        cls = getattr(module, entry.cls, None)
+        if isinstance(cls, type) and issubclass(cls, tester_cls) and cls not in classes:
+            classes.append(cls)
+    return classes
@@ -2,6 +2,7 @@ from hiptestsuite.TesterRepository import Tester, Test, TestData
 from hiptestsuite.Test import HIPTestData, TestResult, HIP_PLATFORM
 from typing import Union, List
 from hiptestsuite.thirdparty.thirdparty_classifier import THIRDPARTY_CLASSIFIER
+from hiptestsuite.test_classifier import TestClassifier
 
 class SAMPLEAPP(THIRDPARTY_CLASSIFIER):
     def __init__(self):
@@ -18,12 +19,15 @@ class sampleapp_test(Tester):
     def getTests(self) -> List[Test]:
         test = Test()
         test.test_name = self.__class__.__name__
-        classifier = SAMPLEAPP()
-        classifier.add_matched_with_names()
-        test.classifiers = [classifier]
+        test.classifiers = self.get_test_classifiers()
         test.tester = self
         return [test]
 
+    def get_test_classifiers(self) -> Union[None, List[TestClassifier]]:
+        classifier = SAMPLEAPP()
+        classifier.add_matched_with_names()
+        return [classifier]
+
     def clean(self):
         pass
 
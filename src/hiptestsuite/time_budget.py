@@ -0,0 +1,109 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from hiptestsuite.Test import Test
+from hiptestsuite.run_history import RunHistory, get_tester_sha256
+
+from typing import List
+
+# Selection of the tests to run within a wall clock budget (--time-budget).
+# Every selected test gets an estimated duration, the average of its last
+# runs from the run history, or the median of the known durations for tests
+# never run, and a value:
+#   1 for the coverage of any test
+#   +4 if it failed in one of the last RECENT_RUNS runs
+#   +3 if it was never run
+#   +3 if its tester module changed since its last run
+#   +2 * its failure rate over the recorded runs
+# The tests are then taken by value per second of estimated duration as long
+# as they fit in the budget (greedy knapsack), the others are dropped with the
+# reason. The budget is not enforced while the tests run.
+
+RECENT_RUNS = 3
+
+# Estimated duration of a test when no selected test has a history
+DEFAULT_DURATION = 60
+
+
+def format_duration(seconds) -> str:
+    if seconds >= 3600:
+        return "{:.1f}h".format(seconds / 3600)
+    if seconds >= 60:
+        return "{:.1f}m".format(seconds / 60)
+    return "{:.0f}s".format(seconds)
+
+
+class TimeBudget():
+    # budget in seconds
+    def __init__(self, budget, history: RunHistory):
+        self.budget = budget
+        self.history = history
+        # test name -> {"estimate", "value", "priority"} of the chosen tests
+        self.selected = dict()
+        # test name -> reason of the dropped tests
+        self.dropped = dict()
+        self.estimated_duration = 0
+
+    # Estimated duration, value and the reasons for the value of the tests
+    def rate(self, tests: List[Test]):
+        known = sorted(duration for duration in (self.history.get_duration(test.test_name) for test in tests) if duration is not None)
+        default_duration = known[len(known) // 2] if known else DEFAULT_DURATION
+        ratings = list()
+        for test in tests:
+            estimate = self.history.get_duration(test.test_name)
+            value = 1
+            priority = list()
+            if self.history.failed_in_last(test.test_name, RECENT_RUNS):
+                value += 4
+                priority.append("failed in the last " + str(RECENT_RUNS) + " runs")
+            if not self.history.get_runs(test.test_name):
+                value += 3
+                priority.append("never run")
+            elif self.history.is_changed(test.test_name, get_tester_sha256(test.tester)):
+                value += 3
+                priority.append("tester changed")
+            failure_rate = self.history.get_failure_rate(test.test_name)
+            if failure_rate:
+                value += 2 * failure_rate
+                priority.append("failure rate " + str(round(failure_rate * 100)) + "%")
+            if estimate is None:
+                estimate = default_duration
+                priority.append("estimated " + format_duration(estimate))
+            ratings.append((test, estimate, value, priority))
+        return ratings
+
+    # The tests which fit in the budget, in the order of tests
+    def select(self, tests: List[Test]) -> List[Test]:
+        ratings = self.rate(tests)
+        chosen = set()
+        left = self.budget
+        for test, estimate, value, priority in sorted(ratings, key=lambda rating: (-rating[2] / max(rating[1], 1), rating[0].test_name)):
+            name = test.test_name.lower()
+            if estimate > self.budget:
+                self.dropped[name] = "takes " + format_duration(estimate) + ", longer than the budget"
+            elif estimate > left:
+                self.dropped[name] = "takes " + format_duration(estimate) + " for value " + str(round(value, 2)) +\
+                ", " + format_duration(left) + " of the budget left"
+            else:
+                left -= estimate
+                chosen.add(test)
+                self.selected[name] = {"estimate": round(estimate, 2), "value": round(value, 2), "priority": priority}
+        self.estimated_duration = self.budget - left
+        return [test for test in tests if test in chosen]
@@ -18,15 +18,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-import typing
-from typing import Callable
+import os
+import sys
 
-
-def match_fun_args_call(fun: Callable, args: dict):
-    fun_args = typing.get_type_hints(fun)
-    call_args = dict()
-    for fun_arg_name, fun_arg_t in fun_args.items():
-        if fun_arg_name != 'return':
-            call_args[fun_arg_name] = args[fun_arg_name]
-
-    return fun(**call_args)
+# The tests import hiptestsuite from the tree, as run.py does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,129 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from hiptestsuite.common import hip_compiler_cache
+from hiptestsuite.common.hip_compiler_cache import read_compiler_cache_stats
+
+# Stands in for hipcc: -E prints the source, a compile or link writes the -o file
+# from its inputs and logs the invocation
+FAKE_COMPILER = """#!{python}
+import sys
+args = sys.argv[1:]
+if args == ["--version"]:
+    print("fake hipcc 1.0")
+    sys.exit(0)
+if "-E" in args:
+    sys.stdout.write(open(args[-1]).read())
+    sys.exit(0)
+with open({log!r}, "a") as f:
+    f.write(" ".join(args) + "\\n")
+output = args[args.index("-o") + 1]
+inputs = [arg for arg in args if arg.endswith((".cpp", ".cu", ".o"))]
+with open(output, "w") as f:
+    f.write("".join(open(path).read() for path in inputs))
+"""
+
+
+@pytest.fixture
+def hipcc(tmp_path, monkeypatch):
+    log = tmp_path / "invocations.log"
+    compiler = tmp_path / "hipcc"
+    compiler.write_text(FAKE_COMPILER.format(python=sys.executable, log=str(log)))
+    compiler.chmod(0o755)
+    stats = tmp_path / "stats"
+    env = dict(os.environ)
+    env[hip_compiler_cache.CACHE_DIR_ENV] = str(tmp_path / "cache")
+    env[hip_compiler_cache.COMPILER_ENV] = str(compiler)
+    env[hip_compiler_cache.STATS_ENV] = str(stats)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.cpp").write_text("int a;\n")
+
+    def hipcc(*args):
+        subprocess.run([sys.executable, hip_compiler_cache.__file__] + list(args), env=env, check=True)
+        invocations = log.read_text().splitlines() if log.exists() else []
+        return len(invocations), read_compiler_cache_stats(str(stats))
+    return hipcc
+
+
+def test_identical_compile_is_a_hit(hipcc, tmp_path):
+    assert hipcc("-c", "a.cpp", "-o", "a.o")[0] == 1
+    os.remove("a.o")
+    invocations, stats = hipcc("-c", "a.cpp", "-o", "a.o")
+    assert invocations == 1
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert (tmp_path / "a.o").read_text() == "int a;\n"
+
+
+def test_changed_source_is_a_miss(hipcc, tmp_path):
+    hipcc("-c", "a.cpp", "-o", "a.o")
+    (tmp_path / "a.cpp").write_text("int b;\n")
+    invocations, stats = hipcc("-c", "a.cpp", "-o", "a.o")
+    assert invocations == 2
+    assert (stats["hits"], stats["misses"]) == (0, 2)
+    assert (tmp_path / "a.o").read_text() == "int b;\n"
+
+
+def test_compile_and_link_caches_the_sources(hipcc, tmp_path):
+    (tmp_path / "b.cu").write_text("int b;\n")
+    invocations, stats = hipcc("a.cpp", "b.cu", "-O3", "-o", "app", "-lm")
+    # A compile per source and the link
+    assert invocations == 3
+    assert (stats["hits"], stats["misses"]) == (0, 2)
+    os.remove("app")
+    invocations, stats = hipcc("a.cpp", "b.cu", "-O3", "-o", "app", "-lm")
+    assert invocations == 4
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert (tmp_path / "app").read_text() == "int a;\nint b;\n"
+    assert not [path for path in os.listdir(tmp_path / "cache") if path.startswith("link")]
+
+
+def test_compile_and_link_recompiles_changed_sources(hipcc, tmp_path):
+    (tmp_path / "b.cu").write_text("int b;\n")
+    hipcc("a.cpp", "b.cu", "-o", "app")
+    (tmp_path / "b.cu").write_text("int c;\n")
+    invocations, stats = hipcc("a.cpp", "b.cu", "-o", "app")
+    assert invocations == 5
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+    assert (tmp_path / "app").read_text() == "int a;\nint c;\n"
+
+
+def test_compile_and_link_keeps_link_options_out_of_the_compiles(hipcc, tmp_path):
+    hipcc("a.cpp", "-o", "app", "-L/opt/lib", "-Wl,--as-needed", "-lm")
+    log = (tmp_path / "invocations.log").read_text().splitlines()
+    assert "-L/opt/lib" not in log[0] and "-c a.cpp" in log[0]
+    assert log[1].endswith("-o app -L/opt/lib -Wl,--as-needed -lm")
+
+
+@pytest.mark.parametrize("args", [
+    ["a.o", "-o", "app"],
+    ["a.o", "-o", "app", "-lm"],
+])
+def test_links_run_the_real_compiler(hipcc, args):
+    hipcc("-c", "a.cpp", "-o", "a.o")
+    hipcc(*args)
+    invocations, stats = hipcc(*args)
+    assert invocations == 3
+    assert stats["uncacheable"] == 2
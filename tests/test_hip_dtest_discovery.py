@@ -0,0 +1,146 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import textwrap
+import types
+
+from hiptestsuite.conformance import hip_dtest
+from hiptestsuite.conformance.hip_dtest import Hipconformance
+from hiptestsuite.conformance.hip_dtest_discovery import discover_catch_tests
+
+# Fixture of HIP tests/catch: the sources reached through add_subdirectory and
+# listed in a CMakeLists.txt count, external/ and unlisted sources do not
+CATCH_TREE = {
+    "CMakeLists.txt": """
+        add_subdirectory(unit)
+        add_subdirectory(external)
+        # add_subdirectory(commented)
+    """,
+    "unit/CMakeLists.txt": """
+        add_subdirectory(memory)
+        set(TEST_SRC stream/hipStreamCreate.cc)
+        add_subdirectory(stream)
+    """,
+    "unit/memory/CMakeLists.txt": """
+        set(TEST_SRC
+            hipMemcpy.cc
+            hipMalloc.cc
+        )
+        hip_add_exe_to_target(NAME MemoryTest TEST_SRC ${TEST_SRC})
+    """,
+    "unit/memory/hipMemcpy.cc": """
+        #include <hip_test_common.hh>
+        TEST_CASE("Unit_hipMemcpy_Basic") {}
+        TEMPLATE_TEST_CASE("Unit_hipMemcpy_Types", "", int, float) {}
+        TEST_CASE("Unit_hipMemcpy_Hidden", "[.]") {}
+        /* TEST_CASE("Unit_hipMemcpy_Commented") {} */
+        // TEST_CASE("Unit_hipMemcpy_LineComment") {}
+        #if __HIP_PLATFORM_AMD__
+        TEST_CASE("Unit_hipMemcpy_AmdOnly") {}
+        #else
+        TEST_CASE("Unit_hipMemcpy_NvidiaOnly") {}
+        #endif
+        #ifdef SOME_FEATURE
+        TEST_CASE("Unit_hipMemcpy_Feature") {}
+        #endif
+    """,
+    "unit/memory/hipMalloc.cc": """
+        TEST_CASE("Unit_hipMalloc/Negative", "[memory]") {}
+    """,
+    "unit/memory/hipUnlisted.cc": """
+        TEST_CASE("Unit_hipUnlisted") {}
+    """,
+    "unit/stream/CMakeLists.txt": "",
+    "unit/stream/hipStreamCreate.cc": """
+        TEST_CASE("Unit_hipStreamCreate") {}
+    """,
+    "external/CMakeLists.txt": "set(TEST_SRC catch.cc)",
+    "external/catch.cc": """
+        TEST_CASE("External") {}
+    """,
+}
+
+
+def write_catch_tree(catch_path):
+    for path, content in CATCH_TREE.items():
+        path = catch_path / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(content))
+
+
+def test_discover_catch_tests_amd(tmp_path):
+    write_catch_tree(tmp_path)
+    assert discover_catch_tests(str(tmp_path), "amd") == [
+        "Unit_hipMalloc.Negative",
+        "Unit_hipMemcpy_Basic",
+        "Unit_hipMemcpy_Types - int",
+        "Unit_hipMemcpy_Types - float",
+        "Unit_hipMemcpy_AmdOnly",
+        "Unit_hipMemcpy_Feature",
+        "Unit_hipStreamCreate",
+    ]
+
+
+def test_discover_catch_tests_nvidia(tmp_path):
+    write_catch_tree(tmp_path)
+    tests = discover_catch_tests(str(tmp_path), "nvidia")
+    assert "Unit_hipMemcpy_NvidiaOnly" in tests
+    assert "Unit_hipMemcpy_AmdOnly" not in tests
+
+
+def test_discover_catch_tests_without_sources(tmp_path):
+    assert discover_catch_tests(str(tmp_path), "amd") == []
+
+
+def test_is_registered_matches_whole_names():
+    tester = Hipconformance()
+    tester.get_ctest_list = lambda: ["Unit_hipMemcpy_Types - int", "Unit_hipMalloc.Negative", "Unit_hipMemcpy_Basic"]
+    assert tester.is_registered("Unit_hipMemcpy_Types - int")
+    assert tester.is_registered("Unit_hipMalloc.Negative")
+    assert not tester.is_registered("Unit_hipMemcpy")
+    assert not tester.is_registered("Unit_hipMalloc_Negative")
+    assert not tester.is_registered("Unit_hipMemcpy_Types - int(")
+
+
+def test_is_registered_asks_ctest_once():
+    tester = Hipconformance()
+    calls = list()
+    tester.get_ctest_list = lambda: calls.append(1)
+    assert tester.is_registered("Unit_hipMemcpy_Basic")
+    assert tester.is_registered("Unit_hipMalloc_Negative")
+    assert len(calls) == 1
+
+
+def test_get_tests_adds_the_tests_ctest_registered(tmp_path, monkeypatch):
+    write_catch_tree(tmp_path / "catch")
+    ctest_file = tmp_path / "ctest.txt"
+    ctest_file.write_text(textwrap.dedent("""
+        Test project /build
+          Test  #1: Unit_hipMemcpy_Basic
+          Test  #2: Unit_hipMemcpy_Generated/1
+        Total Tests: 2
+    """))
+    monkeypatch.setattr(hip_dtest, "get_ctest_file", lambda: str(ctest_file))
+    tester = Hipconformance()
+    monkeypatch.setattr(tester, "get_catch_path", lambda: str(tmp_path / "catch"))
+    get_tests_data = types.SimpleNamespace(quick=True, HIP_PLATFORM=None, log_location=str(tmp_path))
+    test_names = [test.test_name for test in tester.getTests(get_tests_data)]
+    assert test_names[-1] == "Unit_hipMemcpy_Generated.1"
+    assert test_names.count("Unit_hipMemcpy_Basic") == 1
@@ -0,0 +1,131 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import contextlib
+import os
+import subprocess
+
+import pytest
+
+from hiptestsuite.common import hip_get_packages
+from hiptestsuite.common.hip_get_packages import HipPackages, get_mirror_path, repo_cache
+from hiptestsuite.common.hip_locks import get_lock_file
+
+
+def git(path, *args):
+    return subprocess.run(["git", "-C", str(path)] + list(args), check=True,
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True).stdout.strip()
+
+
+def commit(path, name):
+    (path / name).write_text(name + "\n")
+    git(path, "add", name)
+    git(path, "commit", "-q", "-m", name)
+    return git(path, "rev-parse", "HEAD")
+
+
+# Drops every object of the mirror no ref keeps alive
+def gc_mirror(mirror):
+    git(mirror, "reflog", "expire", "--expire=now", "--all")
+    git(mirror, "gc", "-q", "--prune=now")
+
+
+@pytest.fixture
+def packages(tmp_path, monkeypatch):
+    for name, value in [("GIT_AUTHOR_NAME", "test"), ("GIT_AUTHOR_EMAIL", "test@localhost"),
+                        ("GIT_COMMITTER_NAME", "test"), ("GIT_COMMITTER_EMAIL", "test@localhost")]:
+        monkeypatch.setenv(name, value)
+    source = tmp_path / "source"
+    source.mkdir()
+    git(source, "init", "-q", "-b", "master")
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    monkeypatch.setattr(repo_cache, "cache_dir", str(tmp_path / "mirrors"))
+    monkeypatch.setattr(hip_get_packages, "repo_states", hip_get_packages.RepoStates())
+    packages = HipPackages()
+    os.makedirs(packages.repo_locations["mixbench"][0])
+    return packages, source, "file://" + str(source)
+
+
+def test_pinned_checkout_survives_mirror_gc(packages):
+    packages, source, url = packages
+    pinned = commit(source, "a")
+    commit(source, "b")
+    assert packages.pull_repo(None, url, "", pinned, "mixbench")
+    checkout = packages.get_repo_paths()["mixbench"]
+    assert git(checkout, "rev-parse", "HEAD") == pinned
+
+    mirror = get_mirror_path(url)
+    assert git(checkout, "cat-file", "-t", pinned) == "commit"
+    gc_mirror(mirror)
+    git(checkout, "fsck", "--no-dangling")
+    assert git(checkout, "show", "HEAD:a") == "a"
+
+
+def test_branch_checkout_survives_force_push_and_mirror_gc(packages):
+    packages, source, url = packages
+    old_head = commit(source, "a")
+    assert packages.pull_repo(None, url, "master", "", "mixbench")
+    checkout = packages.get_repo_paths()["mixbench"]
+    assert git(checkout, "rev-parse", "HEAD") == old_head
+
+    # Rewrite the branch, the next fetch of the mirror drops the old head
+    git(source, "checkout", "-q", "--orphan", "rewritten")
+    commit(source, "c")
+    git(source, "branch", "-q", "-M", "master")
+    mirror = packages.update_mirror(None, url, "master", "")
+    assert git(mirror, "rev-parse", "refs/heads/master") != old_head
+    gc_mirror(mirror)
+    git(checkout, "fsck", "--no-dangling")
+    assert git(checkout, "show", "HEAD:a") == "a"
+
+
+def test_repo_replaced_while_waiting_for_the_lock_is_kept(packages, monkeypatch):
+    packages, source, url = packages
+    old_head = commit(source, "a")
+    assert packages.pull_repo(None, url, "", old_head, "mixbench")
+    new_head = commit(source, "b")
+    clone_repo = HipPackages.clone_repo
+    real_exclusive_lock = hip_get_packages.exclusive_lock
+
+    # Another run.py process replaces the stale checkout first
+    @contextlib.contextmanager
+    def exclusive_lock(path):
+        clone_repo(HipPackages(), None, url, "", new_head, "mixbench")
+        with real_exclusive_lock(path):
+            yield
+
+    clones = list()
+    monkeypatch.setattr(hip_get_packages, "exclusive_lock", exclusive_lock)
+    monkeypatch.setattr(HipPackages, "clone_repo", lambda self, *args: clones.append(args) or clone_repo(self, *args))
+    assert packages.pull_repo(None, url, "", new_head, "mixbench")
+    assert clones == []
+    assert git(packages.get_repo_paths()["mixbench"], "rev-parse", "HEAD") == new_head
+
+
+def test_repo_lock_does_not_depend_on_the_clone(packages):
+    packages, source, url = packages
+    commit(source, "a")
+    checkout = packages.get_repo_paths()["mixbench"]
+    before = [get_lock_file(checkout), get_lock_file(os.path.join(checkout, "src"))]
+    assert packages.pull_repo(None, url, "master", "", "mixbench")
+    after = [get_lock_file(checkout), get_lock_file(os.path.join(checkout, "src"))]
+    assert before == after == [before[0]] * 2
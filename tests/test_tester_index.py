@@ -0,0 +1,68 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import importlib
+
+import pytest
+
+import hiptestsuite
+from hiptestsuite import TesterRepository, tester_index
+
+
+# Classifier names of a classifier, outermost first
+def get_path(classifier):
+    path = []
+    matched_with_names = classifier.matched_with_names
+    while matched_with_names:
+        assert len(matched_with_names) == 1
+        name, matched_with_names = next(iter(matched_with_names.items()))
+        path.append(name)
+    return path
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    # build/tester_index.json is written below the current directory
+    monkeypatch.chdir(tmp_path)
+    index = tester_index.TesterIndex([hiptestsuite])
+    index.load()
+    return index
+
+
+def test_index_matches_get_test_classifiers(index):
+    checked = 0
+    for entry in index.get_testers():
+        if entry.cls is None:
+            continue
+        cls = getattr(importlib.import_module(entry.module), entry.cls)
+        if cls.get_test_classifiers is TesterRepository.Tester.get_test_classifiers:
+            continue
+        classifiers = cls.get_test_classifiers(cls.__new__(cls))
+        assert entry.classifier_paths == [get_path(classifier) for classifier in classifiers], entry.module + "." + entry.cls
+        checked += 1
+    # The applications, the Catch2 tests and the third party sample
+    assert checked >= 90
+
+
+def test_index_paths(index):
+    entries = {(entry.module, entry.cls): entry for entry in index.get_testers()}
+    assert entries[("hiptestsuite.conformance.hip_dtest", "Hipconformance")].classifier_paths == [["conformance"]]
+    assert entries[("hiptestsuite.applications.mgbench.mgbench", "mgbench_fullduplex")].classifier_paths ==\
+        [["mgbench", "performance"]]
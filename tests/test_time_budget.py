@@ -0,0 +1,101 @@
+# Copyright (c) 2021 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from hiptestsuite.Test import Test as HipTest
+from hiptestsuite import run_history
+from hiptestsuite.run_history import RunHistory
+from hiptestsuite.time_budget import TimeBudget
+
+
+class FakeTester():
+    pass
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    monkeypatch.setitem(run_history.tester_sha256s, FakeTester.__module__, "current")
+    history = RunHistory(str(tmp_path / "run_history.json"))
+    history.add_run("1", {
+        "pass_short": ["PASS", 60, "current"],
+        "pass_medium": ["PASS", 600, "current"],
+        "failing": ["FAIL", 900, "current"],
+        "changed": ["PASS", 300, "old"],
+        "too_long": ["PASS", 4000, "current"],
+    })
+    return history
+
+
+def make_tests(*names):
+    tests = list()
+    for name in names:
+        test = HipTest()
+        test.test_name = name
+        test.tester = FakeTester()
+        tests.append(test)
+    return tests
+
+
+def test_history_is_persisted(history):
+    reloaded = RunHistory(history.path)
+    assert reloaded.get_duration("failing") == 900
+    assert reloaded.get_failure_rate("failing") == 1
+    assert reloaded.get_duration("never_run") is None
+
+
+def test_rate(history):
+    ratings = {test.test_name: (estimate, value, priority) for test, estimate, value, priority in
+               TimeBudget(3600, history).rate(make_tests("pass_short", "failing", "changed", "never_run"))}
+    assert ratings["pass_short"] == (60, 1, [])
+    assert ratings["failing"] == (900, 7, ["failed in the last 3 runs", "failure rate 100%"])
+    assert ratings["changed"] == (300, 4, ["tester changed"])
+    # Median of the known durations of the rated tests
+    assert ratings["never_run"] == (300, 4, ["never run", "estimated 5.0m"])
+
+
+def test_select_within_budget(history):
+    tests = make_tests("pass_short", "pass_medium", "failing", "changed", "too_long", "never_run")
+    budget = TimeBudget(40 * 60, history)
+    selected = budget.select(tests)
+    # Taken by value per second: pass_short, changed, failing, never_run (10m,
+    # the median of the known durations), then pass_medium no longer fits
+    assert [test.test_name for test in selected] == ["pass_short", "failing", "changed", "never_run"]
+    assert budget.estimated_duration == 60 + 900 + 300 + 600
+    assert budget.estimated_duration <= budget.budget
+    assert set(budget.selected) == {"pass_short", "failing", "changed", "never_run"}
+    assert budget.dropped["too_long"] == "takes 1.1h, longer than the budget"
+    assert budget.dropped["pass_medium"].startswith("takes 10.0m for value 1,")
+
+
+def test_everything_fits(history):
+    tests = make_tests("pass_short", "pass_medium", "failing")
+    budget = TimeBudget(24 * 3600, history)
+    assert budget.select(tests) == tests
+    assert budget.dropped == {}
+    assert budget.estimated_duration == 1560
+
+
+def test_no_history(tmp_path):
+    budget = TimeBudget(150, RunHistory(str(tmp_path / "missing.json")))
+    selected = budget.select(make_tests("b", "a", "c"))
+    # DEFAULT_DURATION each, ties are broken by name
+    assert [test.test_name for test in selected] == ["b", "a"]
+    assert list(budget.dropped) == ["c"]